@@ -0,0 +1,79 @@
+"""
+Account number allocation shared by every process of the bank.
+
+Numbers come from a named sequence in a small SQLite file. Each process
+reserves a block of ``bloco`` numbers in one ``BEGIN IMMEDIATE`` transaction
+and hands them out from memory, so creating an account touches storage once
+per block instead of once per account, and two processes (e.g. Streamlit
+workers) can never receive the same number. Numbers left in a block when a
+process exits are skipped, like the cache of a database sequence.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Union
+
+SEQUENCIA_FILE = "sequencias.db"
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS sequencias (nome TEXT PRIMARY KEY, valor INTEGER NOT NULL)"
+SQL_CRIAR_SEQUENCIA = "INSERT OR IGNORE INTO sequencias (nome, valor) VALUES (?, 0)"
+SQL_RESERVAR = "UPDATE sequencias SET valor = MAX(valor, ?) + ? WHERE nome = ?"
+SQL_VALOR = "SELECT valor FROM sequencias WHERE nome = ?"
+
+
+class AlocadorNumeros:
+    """Hands out unique account numbers from a sequence shared between processes."""
+
+    def __init__(self, caminho: Union[str, Path], bloco: int = 20, minimo: int = 0,
+                 sequencia: str = "contas", timeout: float = 30.0) -> None:
+        """
+        Initialize the allocator (the sequence file is opened on first use).
+
+        Args:
+            caminho: SQLite file holding the sequences
+            bloco: How many numbers are reserved per storage round trip
+            minimo: Highest number already in use; allocation starts after it
+            sequencia: Name of the sequence
+            timeout: Seconds to wait for another process holding the file lock
+
+        Raises:
+            ValueError: If ``bloco`` is less than 1
+        """
+        if bloco < 1:
+            raise ValueError("O bloco deve reservar pelo menos um número")
+        self.caminho = Path(caminho)
+        self.bloco = bloco
+        self.minimo = minimo
+        self.sequencia = sequencia
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._proximo = 0
+        self._limite = 0
+
+    def proximo(self) -> int:
+        """
+        Return the next account number.
+
+        Returns:
+            int: A number no other call, in this or any other process, returns
+        """
+        with self._lock:
+            if self._proximo >= self._limite:
+                self._reservar()
+            numero = self._proximo
+            self._proximo += 1
+            return numero
+
+    def _reservar(self) -> None:
+        conexao = sqlite3.connect(self.caminho, timeout=self.timeout, isolation_level=None)
+        try:
+            conexao.execute(SCHEMA)
+            conexao.execute("BEGIN IMMEDIATE")
+            conexao.execute(SQL_CRIAR_SEQUENCIA, (self.sequencia,))
+            conexao.execute(SQL_RESERVAR, (self.minimo, self.bloco, self.sequencia))
+            fim, = conexao.execute(SQL_VALOR, (self.sequencia,)).fetchone()
+            conexao.execute("COMMIT")
+        finally:
+            conexao.close()
+        self._proximo, self._limite = fim - self.bloco + 1, fim + 1
@@ -2,36 +2,48 @@
 Web interface for the Bank Account Management System using Streamlit
 """
 
+import os
 import streamlit as st
-import pickle
-from datetime import datetime
+from datetime import datetime, time, timedelta
 from pathlib import Path
 from bank_account import (
-    PessoaFisica, Conta, Deposito, Saque,
-    buscar_cliente_por_cpf
+    CENTAVOS_MAXIMO, PessoaFisica, Conta, Deposito, Saque, TipoTransacao, agora, configurar_relogio, eventos,
+    registrar_em_log,
 )
+from account_numbers import SEQUENCIA_FILE, AlocadorNumeros
+from bank_logging import configurar_logging
+from ledger import abrir_ledger
+
+DATA_DIR = Path("bank_ledger")
+LEGACY_DATA_FILE = Path("bank_data.pkl")
+ITENS_POR_PAGINA = 20
+# Whole reais, exact as a float, whose cents still fit Dinheiro's int64 range
+VALOR_MAXIMO = float(CENTAVOS_MAXIMO // 10_000)
+FILTROS_TIPO = {"Todos": None, "Depósitos": TipoTransacao.DEPOSITO, "Saques": TipoTransacao.SAQUE}
 
 # Initialize persistent storage
+@st.cache_resource
 def load_data():
-    """Load data from pickle file or initialize if not exists"""
-    data_file = Path("bank_data.pkl")
-    if data_file.exists():
-        with open(data_file, "rb") as f:
-            data = pickle.load(f)
-            return data["clientes"], data["contas"]
-    return [], []
+    """Open the append-only ledger once per process; every session and rerun shares it"""
+    return abrir_ledger(DATA_DIR, legado=LEGACY_DATA_FILE)
 
-def save_data(clientes, contas):
-    """Save data to pickle file"""
-    with open("bank_data.pkl", "wb") as f:
-        pickle.dump({"clientes": clientes, "contas": contas}, f)
+@st.cache_resource
+def load_alocador():
+    """Account number allocator of this process (numbers are unique across workers)"""
+    store = load_data()
+    return AlocadorNumeros(DATA_DIR / SEQUENCIA_FILE, minimo=max((c.numero for c in store.contas), default=0))
 
-# Initialize global variables
-if "clientes" not in st.session_state:
-    st.session_state.clientes, st.session_state.contas = load_data()
+# Logs are written by a background thread (a no-op after the first run)
+configurar_logging()
+# Transaction dates and the daily withdrawal limit follow BANK_TIMEZONE (local time by default)
+configurar_relogio(os.environ.get("BANK_TIMEZONE"))
 
-clientes = st.session_state.clientes
-contas = st.session_state.contas
+# Initialize global variables
+store = load_data()
+clientes = store.clientes
+contas = store.contas
+# Transaction results go to the server log; the page shows them itself
+eventos.inscrever(registrar_em_log)
 
 def init_session_state():
     """Initialize session state variables"""
@@ -52,7 +64,7 @@ def login_page():
         
         if submitted:
             if cpf.isdigit() and len(cpf) == 11:
-                cliente = buscar_cliente_por_cpf(cpf)
+                cliente = clientes.buscar_por_cpf(cpf)
                 if cliente:
                     st.session_state.authenticated = True
                     st.session_state.current_client = cliente
@@ -79,7 +91,7 @@ def create_account_page():
                 st.error("CPF inválido!")
                 return
                 
-            if buscar_cliente_por_cpf(cpf):
+            if cpf in clientes:
                 st.error("CPF já cadastrado!")
                 return
                 
@@ -94,14 +106,17 @@ def create_account_page():
             # Create new client
             data_nasc = datetime.combine(data_nascimento, datetime.min.time())
             cliente = PessoaFisica(cpf, nome, data_nasc, endereco)
-            clientes.append(cliente)
             
             # Create account
-            numero = len(contas) + 1
+            numero = load_alocador().proximo()
             conta = Conta.nova_conta(cliente, numero)
             cliente.adicionar_conta(conta)
-            contas.append(conta)
-            save_data(clientes, contas)
+            try:
+                store.registrar_conta(cliente, conta)
+            except ValueError:
+                # Another session registered the same CPF after the check above
+                st.error("CPF já cadastrado!")
+                return
             
             st.success("Conta criada com sucesso!")
             st.write(f"Agência: {conta.agencia} | Conta: {conta.numero}")
@@ -116,17 +131,17 @@ def account_operations():
         return
         
     # Account selection
-    account_options = {f"Conta {c.numero}": c for c in client.contas}
-    selected_account = st.selectbox(
+    indice = st.selectbox(
         "Selecione uma conta:",
-        options=list(account_options.keys())
+        options=range(len(client.contas)),
+        format_func=lambda i: f"Conta {client.contas[i].numero}"
     )
-    
-    conta = account_options[selected_account]
+    conta = client.contas[indice]
     st.session_state.current_account = conta
     
     # Display balance
     st.header(f"💰 Saldo: R$ {conta.saldo:.2f}")
+    st.caption(f"Saques restantes hoje: {conta.saques_restantes()} de {conta.limite_saques}")
     
     # Operations
     col1, col2 = st.columns(2)
@@ -134,30 +149,67 @@ def account_operations():
     with col1:
         with st.form("deposit_form"):
             st.subheader("📥 Depósito")
-            valor_dep = st.number_input("Valor:", min_value=0.01, step=0.01, key="dep")
+            valor_dep = st.number_input("Valor:", min_value=0.01, max_value=VALOR_MAXIMO, step=0.01, key="dep")
             if st.form_submit_button("Depositar"):
-                transacao = Deposito(valor_dep)
-                if client.realizar_transacao(conta, transacao):
-                    st.success("Depósito realizado com sucesso!")
+                # Applied and logged atomically with respect to snapshots
+                resultado = store.realizar_transacao(conta, Deposito(valor_dep))
+                if resultado:
+                    st.success(resultado.mensagem)
                     st.rerun()
+                else:
+                    st.error(resultado.mensagem)
     
     with col2:
         with st.form("withdraw_form"):
             st.subheader("📤 Saque")
-            valor_saq = st.number_input("Valor:", min_value=0.01, step=0.01, key="saq")
+            valor_saq = st.number_input("Valor:", min_value=0.01, max_value=VALOR_MAXIMO, step=0.01, key="saq")
             if st.form_submit_button("Sacar"):
-                transacao = Saque(valor_saq)
-                if client.realizar_transacao(conta, transacao):
-                    st.success("Saque realizado com sucesso!")
+                # Applied and logged atomically with respect to snapshots
+                resultado = store.realizar_transacao(conta, Saque(valor_saq))
+                if resultado:
+                    st.success(resultado.mensagem)
                     st.rerun()
+                else:
+                    st.error(resultado.mensagem)
     
     # Transaction history
     st.header("📋 Extrato")
-    if conta.historico.transacoes:
-        for transacao in conta.historico.transacoes:
-            st.text(transacao)
-    else:
+    historico = conta.historico
+    if not historico:
         st.info("Não há transações registradas.")
+        return
+
+    # Totals are kept up to date by every transaction: reading them is O(1)
+    agregados, hoje = historico.agregados, agora()
+    total, mes, dia = agregados.total(), agregados.do_mes(hoje.year, hoje.month), agregados.do_dia(hoje)
+    met1, met2, met3 = st.columns(3)
+    met1.metric("Transações", total.transacoes)
+    met2.metric("Total depositado", f"R$ {total.total_depositado:.2f}")
+    met3.metric("Total sacado", f"R$ {total.total_sacado:.2f}")
+    met4, met5, met6 = st.columns(3)
+    met4.metric("Depósitos no mês", f"R$ {mes.total_depositado:.2f}", f"{mes.depositos} depósitos", delta_color="off")
+    met5.metric("Saques hoje", f"R$ {dia.total_sacado:.2f}", f"{dia.saques} saques", delta_color="off")
+    met6.metric("Ticket médio", f"R$ {total.ticket_medio:.2f}")
+
+    # Filters go to the indexed statement query; only the selected page is rendered
+    filtro1, filtro2 = st.columns(2)
+    periodo = filtro1.date_input("Período:", value=(), format="DD/MM/YYYY", key=f"periodo_{conta.numero}")
+    tipo = FILTROS_TIPO[filtro2.selectbox("Tipo:", list(FILTROS_TIPO), key=f"tipo_{conta.numero}")]
+    inicio = datetime.combine(periodo[0], time.min) if periodo else None
+    fim = datetime.combine(periodo[-1], time.min) + timedelta(days=1) if periodo else None
+    total = historico.contar(inicio, fim, tipo)
+    if not total:
+        st.info("Nenhuma transação com esses filtros.")
+        return
+
+    paginas = (total - 1) // ITENS_POR_PAGINA + 1
+    pagina = st.number_input(
+        f"Página (de {paginas}):", min_value=1, max_value=paginas, value=1, step=1, key=f"pagina_{conta.numero}"
+    )
+    extrato = historico.extrato(inicio, fim, tipo, limite=ITENS_POR_PAGINA,
+                                deslocamento=(pagina - 1) * ITENS_POR_PAGINA)
+    for linha in reversed(extrato.linhas):
+        st.text(linha.descricao())
 
 def main():
     """Main application"""
@@ -6,20 +6,37 @@ clients, and transactions. It demonstrates OOP principles and clean architecture
 """
 
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import List, Optional
-import logging
-import sys
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bank.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime, timedelta, tzinfo
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from enum import IntEnum
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+import itertools
+import operator
+import threading
+import unicodedata
+
+
+class _LoggerSobDemanda:
+    """
+    Stand-in for this module's logger until the first log call.
+
+    Importing ``logging`` costs about half of this module's import time and
+    most library users (workers, tests, the ledger replay) never log through
+    it. The first attribute access imports it and rebinds ``logger`` to the
+    real ``logging.Logger``, so later calls go straight to it. Records
+    propagate to whatever the entry point configured (see ``bank_logging``);
+    nothing is installed on the root logger here.
+    """
+
+    def __getattr__(self, nome: str):
+        import logging
+        globals()["logger"] = logging.getLogger(__name__)
+        return getattr(logger, nome)
+
+
+logger = _LoggerSobDemanda()
 
 DIAS_SEMANA_PT: List[str] = [
     "segunda-feira", "terça-feira", "quarta-feira",
@@ -39,51 +56,994 @@ def formatar_data_pt(dt: datetime) -> str:
     dia_semana = DIAS_SEMANA_PT[dt.weekday()]
     return f"{dia_semana.capitalize()}, {dt.strftime('%d/%m/%Y %H:%M')}"
 
+_EPOCA = datetime(1970, 1, 1)
+_MICROSSEGUNDO = timedelta(microseconds=1)
+
+def para_timestamp(dt: datetime) -> int:
+    """Convert a naive datetime to integer microseconds since 1970-01-01."""
+    return (dt - _EPOCA) // _MICROSSEGUNDO
+
+def de_timestamp(timestamp: int) -> datetime:
+    """Convert integer microseconds since 1970-01-01 back to a naive datetime."""
+    return _EPOCA + timedelta(microseconds=timestamp)
+
+_DIA_EPOCA = _EPOCA.toordinal()
+_MICROSSEGUNDOS_DIA = 86_400_000_000
+
+def dia_do_timestamp(timestamp: int) -> int:
+    """Calendar day (``date.toordinal()``) of a timestamp, without building a datetime."""
+    return _DIA_EPOCA + timestamp // _MICROSSEGUNDOS_DIA
+
+class Relogio:
+    """
+    Source of the current time for transactions and the daily withdrawal limit.
+
+    Times are naive wall-clock times in ``fuso``, the bank's timezone (the
+    machine's local time when not set): transaction dates are stored that
+    way, and the withdrawal "day" is a calendar date there. Tests pass
+    ``agora`` to control the time.
+    """
+
+    __slots__ = ("fuso", "_agora")
+
+    def __init__(self, fuso: Optional[tzinfo] = None, agora: Optional[Callable[[], datetime]] = None) -> None:
+        """
+        Initialize the clock.
+
+        Args:
+            fuso: Timezone of the bank, or None for the local time
+            agora: Function returning the current naive time, replacing the system clock
+        """
+        self.fuso = fuso
+        self._agora = agora
+
+    def agora(self) -> datetime:
+        """Return the current naive wall-clock time in the bank's timezone."""
+        if self._agora is not None:
+            return self._agora()
+        if self.fuso is None:
+            return datetime.now()
+        return datetime.now(self.fuso).replace(tzinfo=None)
+
+relogio = Relogio()
+
+def configurar_relogio(fuso: Union[str, tzinfo, None] = None) -> Relogio:
+    """
+    Set the timezone of the bank (the entry points pass ``BANK_TIMEZONE``).
+
+    Args:
+        fuso: IANA name (e.g. "America/Sao_Paulo"), a tzinfo, or None for local time
+
+    Returns:
+        Relogio: The new module clock
+    """
+    global relogio
+    if isinstance(fuso, str):
+        from zoneinfo import ZoneInfo
+        fuso = ZoneInfo(fuso)
+    relogio = Relogio(fuso)
+    return relogio
+
+def agora() -> datetime:
+    """Return ``relogio.agora()``, looked up at call time so the clock can be swapped."""
+    return relogio.agora()
+
+def formatar_centavos(centavos: int) -> str:
+    """Format integer cents as reais with two decimals (e.g. 1050 -> "10.50")."""
+    sinal = "-" if centavos < 0 else ""
+    reais, resto = divmod(abs(centavos), 100)
+    return f"{sinal}{reais}.{resto:02d}"
+
+_CENTAVO = Decimal("0.01")
+
+# Largest amount, in cents, a single transaction may carry: the history
+# stores amounts in int64 columns (``array("q")``)
+CENTAVOS_MAXIMO: int = 2 ** 63 - 1
+
+class Dinheiro:
+    """Exact amount of money, stored as integer cents.
+
+    Values are immutable: arithmetic returns a new ``Dinheiro`` and only
+    combines with other ``Dinheiro`` values (or multiplies by an int), so
+    floats never leak into balances. Amounts typed by users or read from
+    floats go through ``de_reais``, which rounds half up to the cent.
+    """
+
+    __slots__ = ("centavos",)
+
+    def __init__(self, centavos: int = 0) -> None:
+        """
+        Initialize an amount.
+
+        Args:
+            centavos: The amount in cents
+        """
+        self.centavos = centavos
+
+    @classmethod
+    def de_reais(cls, valor: Union['Dinheiro', int, float, str, Decimal]) -> 'Dinheiro':
+        """
+        Convert an amount in reais to ``Dinheiro``.
+
+        Floats are converted through their shortest repr, so ``0.1`` is ten
+        cents and not 0.1000000000000000055...; strings may use a decimal comma.
+
+        Args:
+            valor: Amount in reais
+
+        Returns:
+            Dinheiro: The amount rounded half up to the cent
+
+        Raises:
+            ValueError: If ``valor`` is not a finite number, or its cents fall
+                outside ``±CENTAVOS_MAXIMO``
+        """
+        if isinstance(valor, Dinheiro):
+            return valor
+        try:
+            if isinstance(valor, int):
+                centavos = valor * 100
+            else:
+                if isinstance(valor, float):
+                    valor = repr(valor)
+                if isinstance(valor, str):
+                    valor = Decimal(valor.strip().replace(",", "."))
+                centavos = int(valor.quantize(_CENTAVO, rounding=ROUND_HALF_UP).scaleb(2))
+        except (InvalidOperation, AttributeError) as e:
+            raise ValueError(f"Valor monetário inválido: {valor!r}") from e
+        if abs(centavos) > CENTAVOS_MAXIMO:
+            raise ValueError(f"Valor monetário fora do limite: {valor!r}")
+        return cls(centavos)
+
+    def __add__(self, outro: 'Dinheiro') -> 'Dinheiro':
+        if type(outro) is not Dinheiro:
+            return NotImplemented
+        return Dinheiro(self.centavos + outro.centavos)
+
+    def __sub__(self, outro: 'Dinheiro') -> 'Dinheiro':
+        if type(outro) is not Dinheiro:
+            return NotImplemented
+        return Dinheiro(self.centavos - outro.centavos)
+
+    def __mul__(self, fator: int) -> 'Dinheiro':
+        if type(fator) is not int:
+            return NotImplemented
+        return Dinheiro(self.centavos * fator)
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> 'Dinheiro':
+        return Dinheiro(-self.centavos)
+
+    def __eq__(self, outro: object) -> bool:
+        if type(outro) is not Dinheiro:
+            return NotImplemented
+        return self.centavos == outro.centavos
+
+    def __lt__(self, outro: 'Dinheiro') -> bool:
+        if type(outro) is not Dinheiro:
+            return NotImplemented
+        return self.centavos < outro.centavos
+
+    def __le__(self, outro: 'Dinheiro') -> bool:
+        if type(outro) is not Dinheiro:
+            return NotImplemented
+        return self.centavos <= outro.centavos
+
+    def __gt__(self, outro: 'Dinheiro') -> bool:
+        if type(outro) is not Dinheiro:
+            return NotImplemented
+        return self.centavos > outro.centavos
+
+    def __ge__(self, outro: 'Dinheiro') -> bool:
+        if type(outro) is not Dinheiro:
+            return NotImplemented
+        return self.centavos >= outro.centavos
+
+    def __hash__(self) -> int:
+        return hash(self.centavos)
+
+    def __bool__(self) -> bool:
+        return self.centavos != 0
+
+    def __float__(self) -> float:
+        return self.centavos / 100
+
+    def __str__(self) -> str:
+        return formatar_centavos(self.centavos)
+
+    def __repr__(self) -> str:
+        return f"Dinheiro.de_reais('{self}')"
+
+    def __format__(self, spec: str) -> str:
+        # formata o valor decimal exato, ex.: f"{saldo:.2f}" ou f"{saldo:,.2f}"
+        return format(Decimal(self.centavos).scaleb(-2), spec) if spec else str(self)
+
+    def __reduce__(self):
+        return Dinheiro, (self.centavos,)
+
+class TipoTransacao(IntEnum):
+    """Kind of a transaction, stored as one byte in the history."""
+
+    DEPOSITO = 0
+    SAQUE = 1
+
+    @property
+    def rotulo(self) -> str:
+        """Label shown in the statement."""
+        return _ROTULOS[self]
+
+_ROTULOS: Dict[TipoTransacao, str] = {
+    TipoTransacao.DEPOSITO: "Depósito",
+    TipoTransacao.SAQUE: "Saque",
+}
+
+class CodigoOperacao(IntEnum):
+    """Outcome of a transaction (see ``ResultadoTransacao`` and ``processar_lote``)."""
+
+    OK = 0
+    VALOR_INVALIDO = 1
+    SALDO_INSUFICIENTE = 2
+    LIMITE_EXCEDIDO = 3
+    LIMITE_SAQUES = 4
+    CONTA_DESTINO_INVALIDA = 5
+    DATA_FUTURA = 6
+
+    @property
+    def mensagem(self) -> str:
+        """Message shown to the user."""
+        return _MENSAGENS[self]
+
+_MENSAGENS: Dict[CodigoOperacao, str] = {
+    CodigoOperacao.OK: "Operação realizada com sucesso!",
+    CodigoOperacao.VALOR_INVALIDO: "Valor inválido.",
+    CodigoOperacao.SALDO_INSUFICIENTE: "Saldo insuficiente.",
+    CodigoOperacao.LIMITE_EXCEDIDO: "Valor excede o limite.",
+    CodigoOperacao.LIMITE_SAQUES: "Limite de saques atingido.",
+    CodigoOperacao.CONTA_DESTINO_INVALIDA: "Conta de destino igual à de origem.",
+    CodigoOperacao.DATA_FUTURA: "Data da transação no futuro.",
+}
+
+def formatar_transacao(tipo: TipoTransacao, centavos: int, data: datetime) -> str:
+    """
+    Render a statement line.
+
+    Args:
+        tipo: Kind of the transaction
+        centavos: Amount in cents
+        data: When the transaction happened
+
+    Returns:
+        str: e.g. "Segunda-feira, 01/01/2024 10:00 - Depósito: R$ 10.00"
+    """
+    return f"{formatar_data_pt(data)} - {tipo.rotulo}: R$ {formatar_centavos(centavos)}"
+
+def aplicar_evento(estado: Tuple[int, int, int], tipo: int, centavos: int, dia: int) -> Tuple[int, int, int]:
+    """
+    Fold one event into an account state.
+
+    The history is the source of truth of an account: its state is this
+    function folded over the history, starting from the opening state
+    ``(0, 0, 0)`` or a snapshot. Live transactions, batches and the ledger
+    replay all go through it. The withdrawal count is a day bucket: a
+    withdrawal on a later day than the bucket starts a new one, so the daily
+    limit resets on the first touch after midnight without any sweep. The
+    bucket only moves forward: a back-dated withdrawal (an explicit earlier
+    date, or events replayed out of order) is counted in the current bucket
+    instead of resetting it.
+
+    Args:
+        estado: Balance in cents, day of the withdrawal bucket and withdrawals in it
+        tipo: TipoTransacao of the event
+        centavos: Amount of the event in cents
+        dia: Calendar day of the event (``date.toordinal()``)
+
+    Returns:
+        Tuple[int, int, int]: The state after the event
+    """
+    saldo, dia_saques, saques = estado
+    if tipo == TipoTransacao.DEPOSITO:
+        return saldo + centavos, dia_saques, saques
+    if dia <= dia_saques:
+        return saldo - centavos, dia_saques, saques + 1
+    return saldo - centavos, dia, 1
+
+# Per-account snapshots: rebuilding an account folds at most this many events
+SNAPSHOT_A_CADA: int = 1024
+
+# Withdrawals allowed to a new checking account
+LIMITE_SAQUES_PADRAO: int = 3
+
+# Statement index: the running balance is checkpointed every this many
+# entries, so the balance before any entry costs at most this many additions.
+BLOCO_SALDO: int = 64
+
+# Lock striping: every account maps to one lock of a fixed pool, so accounts
+# never serialize on a global lock and no lock lives inside (pickled) accounts.
+N_TRAVAS: int = 256
+_TRAVAS: List[threading.Lock] = [threading.Lock() for _ in range(N_TRAVAS)]
+
+def _indice_trava(conta: 'Conta') -> int:
+    return hash((conta.agencia, conta.numero)) % N_TRAVAS
+
+def trava_da_conta(conta: 'Conta') -> threading.Lock:
+    """
+    Get the lock that guards the balance and limits of an account.
+
+    Args:
+        conta: The account
+
+    Returns:
+        threading.Lock: The account's lock (shared with other accounts of its stripe)
+    """
+    return _TRAVAS[_indice_trava(conta)]
+
 #CLASSES UML
 
+class RegistroTransacao:
+    """One entry of a history, built on demand when the history is read."""
+
+    __slots__ = ("timestamp", "tipo", "centavos")
+
+    def __init__(self, timestamp: int, tipo: TipoTransacao, centavos: int) -> None:
+        """
+        Initialize a history entry.
+
+        Args:
+            timestamp: Microseconds since 1970-01-01 (see ``para_timestamp``)
+            tipo: Kind of the transaction
+            centavos: Amount in cents
+        """
+        self.timestamp = timestamp
+        self.tipo = tipo
+        self.centavos = centavos
+
+    @property
+    def data(self) -> datetime:
+        """When the transaction happened."""
+        return de_timestamp(self.timestamp)
+
+    @property
+    def valor(self) -> Dinheiro:
+        """Amount of the transaction."""
+        return Dinheiro(self.centavos)
+
+    def descricao(self) -> str:
+        """Render the PT-BR statement line of this entry."""
+        return formatar_transacao(self.tipo, self.centavos, self.data)
+
+    __str__ = descricao
+
+    def __repr__(self) -> str:
+        return f"RegistroTransacao({self.timestamp}, {self.tipo!r}, {self.centavos})"
+
+    def __eq__(self, outro: object) -> bool:
+        if not isinstance(outro, RegistroTransacao):
+            return NotImplemented
+        return (self.timestamp, self.tipo, self.centavos) == (outro.timestamp, outro.tipo, outro.centavos)
+
+class LinhaExtrato(NamedTuple):
+    """One entry of a statement page, with the balance right after it."""
+
+    indice: int
+    registro: RegistroTransacao
+    saldo: Dinheiro
+
+    def descricao(self) -> str:
+        """Render the PT-BR statement line followed by the running balance."""
+        return f"{self.registro.descricao()} | Saldo: R$ {formatar_centavos(self.saldo.centavos)}"
+
+
+class PaginaExtrato(NamedTuple):
+    """A page of ``Historico.extrato``.
+
+    ``anterior`` is the cursor of the next (older) page: pass it as
+    ``antes_de`` to keep paging; it is None on the oldest page.
+    """
+
+    linhas: List[LinhaExtrato]
+    total: int
+    anterior: Optional[int]
+
+
+class Totais(NamedTuple):
+    """Deposits and withdrawals of a period, as kept by ``Agregados``."""
+
+    depositos: int
+    total_depositado: Dinheiro
+    saques: int
+    total_sacado: Dinheiro
+
+    @property
+    def transacoes(self) -> int:
+        """Number of transactions of the period."""
+        return self.depositos + self.saques
+
+    @property
+    def ticket_medio(self) -> Dinheiro:
+        """Average amount moved per transaction (zero without transactions)."""
+        if not self.transacoes:
+            return Dinheiro()
+        movimentado = self.total_depositado.centavos + self.total_sacado.centavos
+        return Dinheiro((2 * movimentado + self.transacoes) // (2 * self.transacoes))
+
+
+def _totais(contadores: Optional[List[int]]) -> Totais:
+    if contadores is None:
+        return Totais(0, Dinheiro(), 0, Dinheiro())
+    depositos, depositado, saques, sacado = contadores
+    return Totais(depositos, Dinheiro(depositado), saques, Dinheiro(sacado))
+
+
+class Agregados:
+    """Totals of a history, overall, per day and per month, kept up to date on every append.
+
+    Each period holds four counters (deposits, cents deposited, withdrawals,
+    cents withdrawn), so dashboard reads are O(1) dictionary lookups instead
+    of a scan of the history. ``recalcular`` rebuilds them from the raw
+    columns (legacy pickles, consistency checks).
+    """
+
+    __slots__ = ("_total", "_por_dia", "_por_mes", "_dia", "_do_dia", "_do_mes")
+
+    def __init__(self) -> None:
+        self._total = [0, 0, 0, 0]
+        self._por_dia: Dict[int, List[int]] = {}
+        self._por_mes: Dict[int, List[int]] = {}
+        self._dia = 0
+
+    @classmethod
+    def recalcular(cls, historico: 'Historico') -> 'Agregados':
+        """
+        Compute the aggregates of a history from its entries.
+
+        Args:
+            historico: The history to scan
+
+        Returns:
+            Agregados: Totals equal to the ones kept while appending
+        """
+        agregados = cls()
+        for tipo, centavos, timestamp in historico.eventos():
+            agregados.registrar(tipo, centavos, timestamp)
+        return agregados
+
+    def registrar(self, tipo: int, centavos: int, timestamp: int) -> None:
+        """
+        Count one transaction in its day, its month and the overall totals.
+
+        Args:
+            tipo: TipoTransacao value
+            centavos: Amount in cents
+            timestamp: When it happened (see ``para_timestamp``)
+        """
+        dia = _DIA_EPOCA + timestamp // _MICROSSEGUNDOS_DIA
+        if dia != self._dia:
+            self._trocar_dia(dia)
+        do_dia, do_mes = self._do_dia, self._do_mes
+        coluna = 2 * tipo
+        total = self._total
+        total[coluna] += 1
+        total[coluna + 1] += centavos
+        do_dia[coluna] += 1
+        do_dia[coluna + 1] += centavos
+        do_mes[coluna] += 1
+        do_mes[coluna + 1] += centavos
+
+    def estender(self, tipos: array, centavos: array, timestamps: array) -> None:
+        """
+        Count many transactions at once (columns as given to ``Historico.estender``).
+
+        A batch stamped with a single moment, the case of ``processar_lote``,
+        is summed with array operations instead of one update per transaction.
+
+        Args:
+            tipos: ``array("b")`` of TipoTransacao values
+            centavos: ``array("q")`` of amounts in cents
+            timestamps: ``array("q")`` of timestamps
+        """
+        if not timestamps:
+            return
+        if timestamps.count(timestamps[0]) != len(timestamps):
+            for tipo, valor, timestamp in zip(tipos, centavos, timestamps):
+                self.registrar(tipo, valor, timestamp)
+            return
+        dia = _DIA_EPOCA + timestamps[0] // _MICROSSEGUNDOS_DIA
+        if dia != self._dia:
+            self._trocar_dia(dia)
+        saques = tipos.count(TipoTransacao.SAQUE)
+        sacado = sum(itertools.compress(centavos, tipos))  # SAQUE é o único tipo diferente de zero
+        depositado = sum(centavos) - sacado
+        for contadores in (self._total, self._do_dia, self._do_mes):
+            contadores[0] += len(tipos) - saques
+            contadores[1] += depositado
+            contadores[2] += saques
+            contadores[3] += sacado
+
+    def _trocar_dia(self, dia: int) -> None:
+        # Guarda os contadores do último dia tocado: transações seguidas
+        # costumam cair no mesmo dia e dispensam as buscas nos dicionários
+        data = date.fromordinal(dia)
+        mes = data.year * 12 + data.month - 1
+        self._dia = dia
+        self._do_dia = self._por_dia.setdefault(dia, [0, 0, 0, 0])
+        self._do_mes = self._por_mes.setdefault(mes, [0, 0, 0, 0])
+
+    def total(self) -> Totais:
+        """Totals of the whole history."""
+        return _totais(self._total)
+
+    def do_dia(self, dia: date) -> Totais:
+        """
+        Totals of one calendar day.
+
+        Args:
+            dia: The day (a ``datetime`` counts for its date)
+
+        Returns:
+            Totais: Deposits and withdrawals of the day
+        """
+        return _totais(self._por_dia.get(dia.toordinal()))
+
+    def do_mes(self, ano: int, mes: int) -> Totais:
+        """
+        Totals of one calendar month.
+
+        Args:
+            ano: Year
+            mes: Month (1-12)
+
+        Returns:
+            Totais: Deposits and withdrawals of the month
+        """
+        return _totais(self._por_mes.get(ano * 12 + mes - 1))
+
+    def __eq__(self, outro: object) -> bool:
+        if not isinstance(outro, Agregados):
+            return NotImplemented
+        return (self._total, self._por_dia, self._por_mes) == (outro._total, outro._por_dia, outro._por_mes)
+
+    def __getstate__(self) -> Tuple[List[int], Dict[int, List[int]], Dict[int, List[int]]]:
+        return self._total, self._por_dia, self._por_mes
+
+    def __setstate__(self, estado) -> None:
+        self._total, self._por_dia, self._por_mes = estado
+        self._dia = 0
+
+
 class Historico:
-    """Class for managing transaction history."""
-    
+    """Class for managing transaction history.
+
+    Transactions are stored column-wise in three arrays (timestamp, kind and
+    amount in cents), 17 bytes each; ``RegistroTransacao`` objects and the
+    PT-BR display strings are only built when the history is read.
+
+    Statement queries (``extrato``, ``contar``) bisect the timestamp column
+    and keep a small index, built lazily from the entries appended since the
+    last query: the positions of each kind and a running balance checkpoint
+    every ``BLOCO_SALDO`` entries. Totals per day and month (``agregados``)
+    are updated on every append instead, so dashboards read them in O(1).
+    Each history has its own lock for that lazy update, so queries on
+    different accounts never wait on each other; it is not pickled.
+    """
+
+    __slots__ = ("_timestamps", "_tipos", "_centavos", "agregados", "_trava_indice",
+                 "_indexados", "_saldo_indexado", "_parciais", "_por_tipo", "_ordenado")
+
     def __init__(self) -> None:
-        self.transacoes: List[str] = []
+        self._timestamps = array("q")
+        self._tipos = array("b")
+        self._centavos = array("q")
+        self.agregados = Agregados()
+        self._trava_indice = threading.Lock()
+        self._limpar_indice()
+
+    def _limpar_indice(self) -> None:
+        self._indexados = 0
+        self._saldo_indexado = 0
+        self._parciais = array("q")
+        self._por_tipo = {tipo: array("q") for tipo in TipoTransacao}
+        self._ordenado = True
+
+    def __len__(self) -> int:
+        return len(self._tipos)
+
+    def __iter__(self) -> Iterator[RegistroTransacao]:
+        for timestamp, tipo, centavos in zip(self._timestamps, self._tipos, self._centavos):
+            yield RegistroTransacao(timestamp, TipoTransacao(tipo), centavos)
+
+    def __getitem__(self, indice: int) -> RegistroTransacao:
+        return RegistroTransacao(self._timestamps[indice], TipoTransacao(self._tipos[indice]), self._centavos[indice])
+
+    def adicionar(self, tipo: TipoTransacao, centavos: int, data: datetime) -> None:
+        """
+        Append a transaction to the history.
+
+        Args:
+            tipo: Kind of the transaction
+            centavos: Amount in cents
+            data: When the transaction happened
+
+        Raises:
+            OverflowError: If a value does not fit its column; the history is
+                left unchanged
+        """
+        timestamp = para_timestamp(data)
+        n = len(self._centavos)
+        try:
+            self._timestamps.append(timestamp)
+            self._tipos.append(tipo)
+            self._centavos.append(centavos)  # por último: len(_centavos) delimita o que está completo
+        except (OverflowError, TypeError):
+            del self._timestamps[n:]
+            del self._tipos[n:]
+            raise
+        self.agregados.registrar(tipo, centavos, timestamp)
+
+    def estender(self, timestamps: array, tipos: array, centavos: array) -> None:
+        """
+        Append many transactions at once (columns as built by ``processar_lote``).
+
+        Args:
+            timestamps: ``array("q")`` of timestamps (see ``para_timestamp``)
+            tipos: ``array("b")`` of TipoTransacao values
+            centavos: ``array("q")`` of amounts in cents
+
+        Raises:
+            OverflowError: If a value does not fit its column; the history is
+                left unchanged
+        """
+        n = len(self._centavos)
+        try:
+            self._timestamps.extend(timestamps)
+            self._tipos.extend(tipos)
+            self._centavos.extend(centavos)  # por último, como em adicionar
+        except (OverflowError, TypeError):
+            del self._timestamps[n:]
+            del self._tipos[n:]
+            del self._centavos[n:]
+            raise
+        self.agregados.estender(tipos, centavos, timestamps)
+
+    def truncar(self, tamanho: int) -> None:
+        """
+        Drop the transactions from position ``tamanho`` on.
 
-    def adicionar_transacao(self, transacao: str) -> None:
-        """Add a new transaction to the history.
+        Undoes appends that could not be persisted; the statement index is
+        rebuilt on the next query and the aggregates are recalculated.
+
+        Args:
+            tamanho: Number of transactions to keep
+        """
+        with self._trava_indice:
+            del self._timestamps[tamanho:]
+            del self._tipos[tamanho:]
+            del self._centavos[tamanho:]
+            self._limpar_indice()
+        self.agregados = Agregados.recalcular(self)
+
+    def eventos(self, inicio: int = 0) -> Iterator[Tuple[int, int, int]]:
+        """
+        Iterate ``(tipo, centavos, timestamp)`` of the events from ``inicio`` on.
+
+        Args:
+            inicio: Index of the first event
+
+        Returns:
+            Iterator[Tuple[int, int, int]]: Raw kind, amount and timestamp of each event
+        """
+        return zip(self._tipos[inicio:], self._centavos[inicio:], self._timestamps[inicio:])
+
+    def adicionar_transacao(self, transacao: 'Transacao') -> None:
+        """Add a registered transaction to the history.
         
         Args:
-            transacao: The transaction description to add
+            transacao: The Deposito or Saque to add (with its ``data`` set)
+        """
+        self.adicionar(transacao.TIPO, transacao.valor.centavos, transacao.data)
+
+    @property
+    def transacoes(self) -> List[str]:
+        """Every statement line, rendered now; prefer ``extrato`` for large histories."""
+        return [registro.descricao() for registro in self]
+
+    def _indexar(self) -> int:
+        # Os centavos são a última coluna gravada: até ela a entrada está completa
+        fim = len(self._centavos)
+        with self._trava_indice:
+            inicio = self._indexados
+            if inicio < fim:
+                tipos, centavos, parciais, por_tipo = self._tipos, self._centavos, self._parciais, self._por_tipo
+                saldo = self._saldo_indexado
+                for indice in range(inicio, fim):
+                    if indice % BLOCO_SALDO == 0:
+                        parciais.append(saldo)
+                    tipo = tipos[indice]
+                    por_tipo[tipo].append(indice)
+                    saldo += centavos[indice] if tipo == TipoTransacao.DEPOSITO else -centavos[indice]
+                if self._ordenado:
+                    trecho = self._timestamps[max(inicio - 1, 0):fim]
+                    self._ordenado = all(map(operator.le, trecho, trecho[1:]))
+                self._saldo_indexado, self._indexados = saldo, fim
+        return fim
+
+    def _saldo_antes(self, indice: int) -> int:
+        saldo = self._parciais[indice // BLOCO_SALDO]
+        for i in range(indice - indice % BLOCO_SALDO, indice):
+            saldo += self._centavos[i] if self._tipos[i] == TipoTransacao.DEPOSITO else -self._centavos[i]
+        return saldo
+
+    def _selecao(self, inicio: Optional[datetime], fim: Optional[datetime],
+                 tipo: Optional[TipoTransacao]) -> Tuple[Sequence[int], int, int]:
+        """Ascending indices of the matching entries, as ``(sequencia, de, ate)``."""
+        n = self._indexar()
+        timestamps = self._timestamps
+        de = para_timestamp(inicio) if inicio is not None else None
+        ate = para_timestamp(fim) if fim is not None else None
+        if not self._ordenado and (de is not None or ate is not None):
+            # Relógio voltou no meio do histórico: sem bisect, filtra linha a linha
+            selecao = [i for i in range(n)
+                       if (de is None or timestamps[i] >= de) and (ate is None or timestamps[i] < ate)
+                       and (tipo is None or self._tipos[i] == tipo)]
+            return selecao, 0, len(selecao)
+        primeiro = bisect_left(timestamps, de, 0, n) if de is not None else 0
+        ultimo = bisect_left(timestamps, ate, primeiro, n) if ate is not None else n
+        if tipo is None:
+            return range(n), primeiro, ultimo
+        posicoes = self._por_tipo[tipo]
+        return posicoes, bisect_left(posicoes, primeiro), bisect_left(posicoes, ultimo)
+
+    def contar(self, inicio: Optional[datetime] = None, fim: Optional[datetime] = None,
+               tipo: Optional[TipoTransacao] = None) -> int:
+        """
+        Count the entries matching the statement filters (see ``extrato``).
+
+        Args:
+            inicio: Only entries at or after this moment
+            fim: Only entries before this moment
+            tipo: Only entries of this kind
+
+        Returns:
+            int: How many entries match
         """
-        self.transacoes.append(transacao)
-        logging.info(f"Nova transação registrada: {transacao}")
+        _, de, ate = self._selecao(inicio, fim, tipo)
+        return ate - de
+
+    def extrato(self, inicio: Optional[datetime] = None, fim: Optional[datetime] = None,
+                tipo: Optional[TipoTransacao] = None, limite: int = 50, deslocamento: int = 0,
+                antes_de: Optional[int] = None) -> PaginaExtrato:
+        """
+        One page of the statement, with the running balance after each entry.
+
+        Pages are counted from the most recent entry backwards and list their
+        entries oldest first. Page either by ``deslocamento`` (entries to skip
+        from the most recent one) or, stable while new transactions arrive,
+        by passing the ``anterior`` cursor of a page as ``antes_de``. A page
+        costs O(log n + limite) once the index caught up with the history.
+
+        Args:
+            inicio: Only entries at or after this moment
+            fim: Only entries before this moment
+            tipo: Only entries of this kind
+            limite: Maximum number of entries in the page
+            deslocamento: Matching entries to skip, counted from the most recent
+            antes_de: Cursor: only entries older than this history index
+
+        Returns:
+            PaginaExtrato: The entries, how many match the filters and the
+            cursor of the older page
+
+        Raises:
+            ValueError: If ``limite`` or ``deslocamento`` is negative
+        """
+        if limite < 0 or deslocamento < 0:
+            raise ValueError("Limite e deslocamento não podem ser negativos")
+        selecao, de, ate = self._selecao(inicio, fim, tipo)
+        total = ate - de
+        if antes_de is not None:
+            ate = bisect_left(selecao, antes_de, de, ate)
+        ultimo = max(ate - deslocamento, de)
+        primeiro = max(ultimo - limite, de)
+
+        linhas = []
+        saldo, anterior = 0, None
+        for posicao in range(primeiro, ultimo):
+            indice = selecao[posicao]
+            if anterior is None or indice != anterior + 1:
+                saldo = self._saldo_antes(indice)
+            registro = self[indice]
+            saldo += registro.centavos if registro.tipo is TipoTransacao.DEPOSITO else -registro.centavos
+            linhas.append(LinhaExtrato(indice, registro, Dinheiro(saldo)))
+            anterior = indice
+        return PaginaExtrato(linhas, total, selecao[primeiro] if primeiro > de else None)
+
+    def __getstate__(self) -> Tuple[array, array, array, Agregados]:
+        return self._timestamps, self._tipos, self._centavos, self.agregados
+
+    def __setstate__(self, estado) -> None:
+        if isinstance(estado, dict):  # pickles antigos: lista de strings formatadas
+            self.__init__()
+            for linha in estado.get("transacoes", []):
+                self.adicionar(*_interpretar_linha(linha))
+            return
+        if len(estado) == 3:  # pickles sem agregados: recalcula a partir das colunas
+            self._timestamps, self._tipos, self._centavos = estado
+            self.agregados = Agregados.recalcular(self)
+        else:
+            self._timestamps, self._tipos, self._centavos, self.agregados = estado
+        self._trava_indice = threading.Lock()
+        self._limpar_indice()
+
+def _interpretar_linha(linha: str) -> Tuple[TipoTransacao, int, datetime]:
+    """Parse a legacy "Dia, dd/mm/aaaa HH:MM - Rótulo: R$ 0.00" history line."""
+    quando, _, resto = linha.partition(" - ")
+    rotulo, _, valor = resto.partition(": R$ ")
+    tipo = next(t for t, r in _ROTULOS.items() if r == rotulo.strip())
+    data = datetime.strptime(quando.split(", ", 1)[1].strip(), "%d/%m/%Y %H:%M")
+    return tipo, Dinheiro.de_reais(valor).centavos, data
+
+class ResultadoTransacao:
+    """Outcome of ``registrar``: truthy when the transaction succeeded."""
+
+    __slots__ = ("codigo", "transacao", "conta")
+
+    def __init__(self, codigo: CodigoOperacao, transacao: 'Transacao', conta: 'Conta') -> None:
+        """
+        Initialize a result.
+
+        Args:
+            codigo: Outcome code
+            transacao: The transaction that was registered
+            conta: The account it was registered on
+        """
+        self.codigo = codigo
+        self.transacao = transacao
+        self.conta = conta
+
+    def __bool__(self) -> bool:
+        return self.codigo is CodigoOperacao.OK
+
+    @property
+    def ok(self) -> bool:
+        """Whether the transaction succeeded."""
+        return self.codigo is CodigoOperacao.OK
+
+    @property
+    def mensagem(self) -> str:
+        """Message for the user, e.g. "Saldo insuficiente."."""
+        if self.ok:
+            return f"{self.transacao.TIPO.rotulo} realizado com sucesso!"
+        return self.codigo.mensagem
+
+    def __repr__(self) -> str:
+        return f"ResultadoTransacao({self.codigo!r}, {type(self.transacao).__name__}, conta={self.conta.numero})"
+
+class BarramentoEventos:
+    """Publish/subscribe hook for transaction results.
+
+    The domain only publishes ``ResultadoTransacao`` objects; presentation
+    layers subscribe to print, log or render them. With no subscribers,
+    publishing costs a single truthiness check.
+    """
+
+    def __init__(self) -> None:
+        self._inscritos: Tuple[Callable[[ResultadoTransacao], None], ...] = ()
+        self._lock = threading.Lock()
+
+    def inscrever(self, callback: Callable[[ResultadoTransacao], None]) -> None:
+        """
+        Subscribe ``callback`` to every result (subscribing twice is a no-op).
+
+        Args:
+            callback: Function called with each ResultadoTransacao
+        """
+        with self._lock:
+            if callback not in self._inscritos:
+                self._inscritos += (callback,)
+
+    def cancelar(self, callback: Callable[[ResultadoTransacao], None]) -> None:
+        """
+        Unsubscribe ``callback`` (no-op if it isn't subscribed).
+
+        Args:
+            callback: A previously subscribed function
+        """
+        with self._lock:
+            self._inscritos = tuple(c for c in self._inscritos if c != callback)
+
+    def publicar(self, resultado: ResultadoTransacao) -> None:
+        """
+        Deliver a result to every subscriber, in subscription order.
+
+        Args:
+            resultado: The result to publish
+        """
+        for callback in self._inscritos:
+            callback(resultado)
+
+# Barramento usado por Transacao.registrar e Transferencia.registrar.
+eventos = BarramentoEventos()
+
+_AVISOS: Dict[CodigoOperacao, str] = {
+    CodigoOperacao.VALOR_INVALIDO: "Tentativa de %(operacao)s com valor inválido: %(valor)s",
+    CodigoOperacao.SALDO_INSUFICIENTE: "Tentativa de %(operacao)s com saldo insuficiente na conta %(numero)s",
+    CodigoOperacao.LIMITE_EXCEDIDO: "Tentativa de %(operacao)s acima do limite na conta %(numero)s",
+    CodigoOperacao.LIMITE_SAQUES: "Tentativa de %(operacao)s com limite diário atingido na conta %(numero)s",
+    CodigoOperacao.CONTA_DESTINO_INVALIDA: "Tentativa de transferência para a própria conta %(numero)s",
+    CodigoOperacao.DATA_FUTURA: "Tentativa de %(operacao)s com data futura na conta %(numero)s",
+}
+
+def registrar_em_log(resultado: ResultadoTransacao) -> None:
+    """Subscriber that logs each transaction result (see ``eventos``)."""
+    transacao, conta = resultado.transacao, resultado.conta
+    if resultado.ok:
+        logger.info("%s realizado com sucesso na conta %s: %s", transacao.TIPO.rotulo, conta.numero, transacao)
+    else:
+        logger.warning(_AVISOS[resultado.codigo], {
+            "operacao": transacao.TIPO.rotulo.lower(), "valor": transacao.valor, "numero": conta.numero})
 
 class Transacao(ABC):
     """Abstract base class for all transaction types."""
+
+    TIPO: TipoTransacao
+
+    def descricao(self) -> str:
+        """
+        Describe the transaction as shown in the statement.
+
+        A transaction not registered yet has no date, so only the kind and
+        the amount are shown.
+
+        Returns:
+            str: e.g. "Segunda-feira, 01/01/2024 10:00 - Depósito: R$ 10.00"
+        """
+        if self.data is None:
+            return f"{self.TIPO.rotulo}: R$ {formatar_centavos(self.valor.centavos)}"
+        return formatar_transacao(self.TIPO, self.valor.centavos, self.data)
+
+    __str__ = descricao
     
-    @abstractmethod
-    def registrar(self, conta: 'Conta') -> bool:
+    def registrar(self, conta: 'Conta') -> ResultadoTransacao:
         """Register a transaction on an account.
+
+        The checks and updates run while holding the account's lock, so
+        concurrent transactions on the same account can't overdraw it. The
+        result is published on ``eventos`` after the lock is released; the
+        domain itself never prints or logs it.
         
         Args:
             conta: The account to perform the transaction on
             
         Returns:
-            bool: True if transaction was successful, False otherwise
+            ResultadoTransacao: The outcome, truthy if the transaction succeeded
         """
-        pass
+        with trava_da_conta(conta):
+            resultado = ResultadoTransacao(self._aplicar(conta), self, conta)
+        if eventos._inscritos:
+            eventos.publicar(resultado)
+        return resultado
+
+    @abstractmethod
+    def _aplicar(self, conta: 'Conta') -> CodigoOperacao:
+        """Apply the transaction to ``conta``; the caller holds its lock."""
 
 class Deposito(Transacao):
     """Class representing a deposit transaction."""
+
+    TIPO = TipoTransacao.DEPOSITO
     
-    def __init__(self, valor: float) -> None:
+    def __init__(self, valor: Union[Dinheiro, float, str], data: Optional[datetime] = None) -> None:
         """
         Initialize a new deposit transaction.
         
         Args:
-            valor: The amount to deposit
+            valor: The amount to deposit (reais are converted to Dinheiro)
+            data: When the deposit happened (defaults to when it is registered)
         """
-        self.valor = valor
+        self.valor = Dinheiro.de_reais(valor)
+        self.data = data
 
-    def registrar(self, conta: 'Conta') -> bool:
+    def _aplicar(self, conta: 'Conta') -> CodigoOperacao:
         """
         Register a deposit transaction on an account.
         
@@ -91,68 +1051,120 @@ class Deposito(Transacao):
             conta: The account to deposit into
             
         Returns:
-            bool: True if deposit was successful, False otherwise
-        """
-        if self.valor > 0:
-            conta.saldo += self.valor
-            transacao = f"{formatar_data_pt(datetime.now())} - Depósito: R$ {self.valor:.2f}"
-            conta.historico.adicionar_transacao(transacao)
-            logging.info(f"Depósito realizado com sucesso na conta {conta.numero}")
-            print("\n Depósito realizado com sucesso! ")
-            return True
-        logging.warning(f"Tentativa de depósito com valor inválido: {self.valor}")
-        print("\n Operação falhou! Valor inválido. ")
-        return False
+            CodigoOperacao: OK, or VALOR_INVALIDO for non-positive or too large amounts
+        """
+        centavos = self.valor.centavos
+        if not 0 < centavos <= CENTAVOS_MAXIMO:
+            return CodigoOperacao.VALOR_INVALIDO
+        self.data = self.data or agora()
+        conta.registrar_evento(self.TIPO, centavos, self.data)
+        return CodigoOperacao.OK
 
 class Saque(Transacao):
     """Class representing a withdrawal transaction."""
+
+    TIPO = TipoTransacao.SAQUE
     
-    def __init__(self, valor: float) -> None:
+    def __init__(self, valor: Union[Dinheiro, float, str], data: Optional[datetime] = None) -> None:
         """
         Initialize a new withdrawal transaction.
         
         Args:
-            valor: The amount to withdraw
+            valor: The amount to withdraw (reais are converted to Dinheiro)
+            data: When the withdrawal happened (defaults to when it is registered)
         """
-        self.valor = valor
+        self.valor = Dinheiro.de_reais(valor)
+        self.data = data
 
-    def registrar(self, conta: 'ContaCorrente') -> bool:
+    def _aplicar(self, conta: 'ContaCorrente') -> CodigoOperacao:
         """
         Register a withdrawal transaction on an account.
+
+        A ``data`` later than now is refused: it would move the daily
+        withdrawal bucket to a future day and free today's limit.
         
         Args:
             conta: The account to withdraw from
             
         Returns:
-            bool: True if withdrawal was successful, False otherwise
+            CodigoOperacao: OK, or why the withdrawal was refused
         """
-        if self.valor <= 0:
-            logging.warning(f"Tentativa de saque com valor inválido: {self.valor}")
-            print("\n Operação falhou! Valor inválido. ")
-            return False
-            
-        if self.valor > conta.saldo:
-            logging.warning(f"Tentativa de saque com saldo insuficiente na conta {conta.numero}")
-            print("\n Operação falhou! Saldo insuficiente. ")
-            return False
-            
-        if self.valor > conta.limite:
-            logging.warning(f"Tentativa de saque acima do limite na conta {conta.numero}")
-            print("\n Operação falhou! Valor excede o limite. ")
-            return False
-            
-        if conta.limite_saques <= 0:
-            logging.warning(f"Tentativa de saque com limite diário atingido na conta {conta.numero}")
-            print("\n Operação falhou! Limite de saques atingido. ")
-            return False
+        centavos = self.valor.centavos
+        momento = agora()
+        data = self.data or momento
+        if data > momento:
+            return CodigoOperacao.DATA_FUTURA
+        codigo = verificar_saque(centavos, conta.saldo.centavos, conta.limite.centavos,
+                                  conta.saques_restantes(data.toordinal()))
+        if codigo is not CodigoOperacao.OK:
+            return codigo
             
-        conta.saldo -= self.valor
-        conta.limite_saques -= 1
-        transacao = f"{formatar_data_pt(datetime.now())} - Saque: R$ {self.valor:.2f}"
-        conta.historico.adicionar_transacao(transacao)
-        logging.info(f"Saque realizado com sucesso na conta {conta.numero}")
-        print("\n Saque realizado com sucesso! ")
-        return True
+        self.data = data
+        conta.registrar_evento(self.TIPO, centavos, data)
+        return CodigoOperacao.OK
+
+def verificar_saque(centavos: int, saldo: int, limite: int, saques_restantes: int) -> CodigoOperacao:
+    """Withdrawal rules, shared by ``Saque``, ``processar_lote`` and the SQLite repository."""
+    if not 0 < centavos <= CENTAVOS_MAXIMO:
+        return CodigoOperacao.VALOR_INVALIDO
+    if centavos > saldo:
+        return CodigoOperacao.SALDO_INSUFICIENTE
+    if centavos > limite:
+        return CodigoOperacao.LIMITE_EXCEDIDO
+    if saques_restantes <= 0:
+        return CodigoOperacao.LIMITE_SAQUES
+    return CodigoOperacao.OK
+
+class Transferencia:
+    """Atomic transfer between two accounts: a Saque on one, a Deposito on the other."""
+
+    def __init__(self, valor: Union[Dinheiro, float, str], data: Optional[datetime] = None) -> None:
+        """
+        Initialize a new transfer.
+
+        Args:
+            valor: The amount to transfer
+            data: When the transfer happened (defaults to when it is registered)
+        """
+        self.saque = Saque(valor, data)
+        self.deposito = Deposito(self.saque.valor, data)
+
+    def registrar(self, origem: 'Conta', destino: 'Conta') -> ResultadoTransacao:
+        """
+        Move the amount from ``origem`` to ``destino`` atomically.
+
+        Both account locks are taken in a global order (by stripe), so two
+        opposite transfers can't deadlock. The withdrawal rules of ``origem``
+        apply; if it fails neither account changes. On success ``saque`` and
+        ``deposito`` hold the two transactions to be persisted, and both legs
+        are published on ``eventos``.
+
+        Args:
+            origem: The account to debit
+            destino: The account to credit
+
+        Returns:
+            ResultadoTransacao: The outcome of the withdrawal leg, truthy on success
+        """
+        if origem is destino:
+            resultado = ResultadoTransacao(CodigoOperacao.CONTA_DESTINO_INVALIDA, self.saque, origem)
+            eventos.publicar(resultado)
+            return resultado
+        travas = [_TRAVAS[i] for i in sorted({_indice_trava(origem), _indice_trava(destino)})]
+        for trava in travas:
+            trava.acquire()
+        try:
+            resultado = ResultadoTransacao(self.saque._aplicar(origem), self.saque, origem)
+            if resultado:
+                self.deposito.data = self.saque.data
+                credito = ResultadoTransacao(self.deposito._aplicar(destino), self.deposito, destino)
+        finally:
+            for trava in reversed(travas):
+                trava.release()
+        eventos.publicar(resultado)
+        if resultado:
+            eventos.publicar(credito)
+        return resultado
 
 class Conta(ABC):
     """Abstract base class for all account types."""
@@ -165,13 +1177,115 @@ class Conta(ABC):
             numero: Account number
             cliente: Account holder
         """
-        self.saldo: float = 0.0
+        self.saldo: Dinheiro = Dinheiro(0)
         self.numero: int = numero
         self.agencia: str = "0001"
         self.cliente: 'Cliente' = cliente
         self.historico: Historico = Historico()
-        self.limite: float = 0.0
+        self.limite: Dinheiro = Dinheiro(0)
         self.limite_saques: int = 0
+        # day bucket of the withdrawal count (see aplicar_evento)
+        self.dia_saques: int = 0
+        self.saques_no_dia: int = 0
+        self._snapshot: Tuple[int, int, int, int] = (0, 0, 0, 0)
+
+    def __setstate__(self, estado: dict) -> None:
+        # pickles gravados antes de Dinheiro guardam saldo e limite como float
+        for campo in ("saldo", "limite"):
+            if not isinstance(estado.get(campo), Dinheiro):
+                estado[campo] = Dinheiro.de_reais(estado.get(campo, 0))
+        self.__dict__.update(estado)
+        if "dia_saques" not in estado:
+            # antes da janela diária limite_saques guardava os saques restantes
+            # (sem nunca zerar); a contagem do dia sai do histórico
+            self.limite_saques = LIMITE_SAQUES_PADRAO
+            dobra = (0, 0, 0)
+            for tipo, centavos, timestamp in self.historico.eventos():
+                dobra = aplicar_evento(dobra, tipo, centavos, dia_do_timestamp(timestamp))
+            _, self.dia_saques, self.saques_no_dia = dobra
+            self.snapshot()
+
+    def saques_restantes(self, dia: Optional[int] = None) -> int:
+        """
+        Withdrawals still allowed on a day.
+
+        The count belongs to the day in ``dia_saques``; on a later day the
+        whole ``limite_saques`` is available, so nothing has to be reset at
+        midnight. An earlier day shares the current count (see
+        ``aplicar_evento``). O(1).
+
+        Args:
+            dia: Calendar day (``date.toordinal()``), today by default
+
+        Returns:
+            int: How many more withdrawals the daily limit allows on ``dia``
+        """
+        if dia is None:
+            dia = agora().toordinal()
+        if dia > self.dia_saques:
+            return self.limite_saques
+        return self.limite_saques - self.saques_no_dia
+
+    def registrar_evento(self, tipo: TipoTransacao, centavos: int, data: datetime) -> None:
+        """
+        Append an event to the history and fold it into the account state.
+
+        No business rule is checked: callers validate first (``Transacao``)
+        or replay events that were already accepted (the ledger). Live
+        callers hold ``trava_da_conta``.
+
+        Args:
+            tipo: Kind of the event
+            centavos: Amount in cents
+            data: When it happened
+        """
+        self.historico.adicionar(tipo, centavos, data)
+        saldo, self.dia_saques, self.saques_no_dia = aplicar_evento(
+            (self.saldo.centavos, self.dia_saques, self.saques_no_dia), tipo, centavos, data.toordinal())
+        self.saldo = Dinheiro(saldo)
+        if len(self.historico) - self._snapshot[0] >= SNAPSHOT_A_CADA:
+            self.snapshot()
+
+    def snapshot(self) -> None:
+        """Record the current state as the starting point of ``reconstruir``."""
+        self._snapshot = (len(self.historico), self.saldo.centavos, self.dia_saques, self.saques_no_dia)
+
+    def desfazer(self, tamanho: int) -> None:
+        """
+        Drop the events from position ``tamanho`` on and restore the state before them.
+
+        Used when events applied in memory could not be persisted. The state
+        is rebuilt from the last snapshot, which must not be newer than
+        ``tamanho``: take one (``snapshot``) before applying. Callers hold
+        ``trava_da_conta``.
+
+        Args:
+            tamanho: Length of the history to go back to
+
+        Raises:
+            ValueError: If the last snapshot is newer than ``tamanho``
+        """
+        if self._snapshot[0] > tamanho:
+            raise ValueError(f"Snapshot da conta {self.numero} é mais novo que o ponto a desfazer")
+        self.historico.truncar(tamanho)
+        self.saldo, self.dia_saques, self.saques_no_dia = self.reconstruir()
+
+    def reconstruir(self) -> Tuple[Dinheiro, int, int]:
+        """
+        Rebuild the account state from the history.
+
+        Folds the events after the last snapshot over the snapshot state, so
+        the cost is bounded by SNAPSHOT_A_CADA, not by the size of the history.
+
+        Returns:
+            Tuple[Dinheiro, int, int]: The balance, ``dia_saques`` and ``saques_no_dia`` the history implies
+        """
+        indice, *dobra = self._snapshot
+        dobra = tuple(dobra)
+        for tipo, centavos, timestamp in self.historico.eventos(indice):
+            dobra = aplicar_evento(dobra, tipo, centavos, dia_do_timestamp(timestamp))
+        saldo, dia, saques = dobra
+        return Dinheiro(saldo), dia, saques
 
     @classmethod
     def nova_conta(cls, cliente: 'Cliente', numero: int) -> 'ContaCorrente':
@@ -190,7 +1304,8 @@ class Conta(ABC):
 class ContaCorrente(Conta):
     """Class representing a checking account."""
     
-    def __init__(self, numero: int, cliente: 'Cliente', limite: float = 500.0, limite_saques: int = 3) -> None:
+    def __init__(self, numero: int, cliente: 'Cliente', limite: Union[Dinheiro, float] = 500.0,
+                 limite_saques: int = LIMITE_SAQUES_PADRAO) -> None:
         """
         Initialize a new checking account.
         
@@ -198,12 +1313,13 @@ class ContaCorrente(Conta):
             numero: Account number
             cliente: Account holder
             limite: Maximum withdrawal limit
-            limite_saques: Daily withdrawal limit
+            limite_saques: Withdrawals allowed per day (in the timezone of ``relogio``)
         """
         super().__init__(numero, cliente)
-        self.limite = limite
+        self.limite = Dinheiro.de_reais(limite)
         self.limite_saques = limite_saques
-        logging.info(f"Nova conta corrente criada: {numero} para cliente {cliente.nome}")
+        self.snapshot()
+        logger.info("Nova conta corrente criada: %s para cliente %s", numero, cliente.nome)
 
 class Cliente(ABC):
     """Abstract base class for all client types."""
@@ -219,7 +1335,7 @@ class Cliente(ABC):
         self.contas: List[Conta] = []
         self.nome: str = ""  # Will be set by child classes
 
-    def realizar_transacao(self, conta: Conta, transacao: Transacao) -> bool:
+    def realizar_transacao(self, conta: Conta, transacao: Transacao) -> ResultadoTransacao:
         """
         Perform a transaction on an account.
         
@@ -228,7 +1344,7 @@ class Cliente(ABC):
             transacao: The transaction to perform
             
         Returns:
-            bool: True if transaction was successful, False otherwise
+            ResultadoTransacao: The outcome, truthy if the transaction succeeded
         """
         return transacao.registrar(conta)
 
@@ -240,7 +1356,7 @@ class Cliente(ABC):
             conta: The account to add
         """
         self.contas.append(conta)
-        logging.info(f"Nova conta {conta.numero} adicionada ao cliente {self.nome}")
+        logger.info("Nova conta %s adicionada ao cliente %s", conta.numero, self.nome)
 
 class PessoaFisica(Cliente):
     """Class representing an individual client."""
@@ -259,18 +1375,179 @@ class PessoaFisica(Cliente):
         self.cpf: str = cpf
         self.nome: str = nome
         self.data_nascimento: datetime = data_nascimento
-        logging.info(f"Novo cliente PF criado: {nome} (CPF: {cpf})")
+        logger.info("Novo cliente PF criado: %s (CPF: %s)", nome, cpf)
+
+class ClienteRegistry:
+    """Registry of clients with hash indexes kept in sync on insert.
+
+    Clients are indexed by CPF (O(1) lookups) and by the first letters of
+    their normalized name (case and accent insensitive), so prefix searches
+    only scan a small bucket.
+    """
+
+    PREFIXO_NOME: int = 3
+
+    def __init__(self, clientes: Iterable[Cliente] = ()) -> None:
+        """
+        Initialize the registry, optionally with existing clients.
+
+        Args:
+            clientes: Clients to index (e.g. loaded from storage)
+        """
+        self._clientes: List[Cliente] = []
+        self._por_cpf: Dict[str, PessoaFisica] = {}
+        self._por_prefixo_nome: Dict[str, List[Cliente]] = {}
+        for cliente in clientes:
+            self.adicionar(cliente)
+
+    def __len__(self) -> int:
+        return len(self._clientes)
+
+    def __iter__(self) -> Iterator[Cliente]:
+        return iter(self._clientes)
+
+    def __contains__(self, cpf: object) -> bool:
+        return cpf in self._por_cpf
+
+    @staticmethod
+    def _normalizar_nome(nome: str) -> str:
+        """Casefold, strip accents and collapse whitespace."""
+        decomposto = unicodedata.normalize("NFKD", nome.casefold())
+        sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+        return " ".join(sem_acentos.split())
+
+    def adicionar(self, cliente: Cliente) -> None:
+        """
+        Add a client and update every index.
+
+        Args:
+            cliente: The client to add
+
+        Raises:
+            ValueError: If a client with the same CPF is already registered
+        """
+        cpf = getattr(cliente, "cpf", None)
+        if cpf is not None:
+            if cpf in self._por_cpf:
+                raise ValueError(f"CPF já cadastrado: {cpf}")
+            self._por_cpf[cpf] = cliente
+        self._clientes.append(cliente)
+        nome = self._normalizar_nome(cliente.nome)
+        for tamanho in range(1, min(len(nome), self.PREFIXO_NOME) + 1):
+            self._por_prefixo_nome.setdefault(nome[:tamanho], []).append(cliente)
+
+    def buscar_por_cpf(self, cpf: str) -> Optional[PessoaFisica]:
+        """
+        Find an individual client by CPF in O(1).
+
+        Args:
+            cpf: The client's CPF (digits only)
+
+        Returns:
+            Optional[PessoaFisica]: The client or None if not found
+        """
+        return self._por_cpf.get(cpf)
+
+    def buscar_por_prefixo_nome(self, prefixo: str) -> List[Cliente]:
+        """
+        Find clients whose name starts with ``prefixo`` (case-insensitive).
+
+        Args:
+            prefixo: Beginning of the client's name
+
+        Returns:
+            List[Cliente]: Matching clients in insertion order
+        """
+        prefixo = self._normalizar_nome(prefixo)
+        if not prefixo:
+            return list(self._clientes)
+        candidatos = self._por_prefixo_nome.get(prefixo[:self.PREFIXO_NOME], [])
+        if len(prefixo) <= self.PREFIXO_NOME:
+            return list(candidatos)
+        return [c for c in candidatos if self._normalizar_nome(c.nome).startswith(prefixo)]
+
+def processar_lote(operacoes: Iterable[Tuple['Conta', Transacao]]) -> List[CodigoOperacao]:
+    """
+    Validate and apply a batch of deposits and withdrawals.
+
+    Operations are grouped by account and each account is processed once,
+    under its lock, in batch order: balances are kept as plain cents while
+    the group runs, the history gets one bulk append and the log one line
+    per account. Nothing is printed; the caller gets a code per operation.
+
+    Args:
+        operacoes: ``(conta, transacao)`` pairs, where transacao is a Deposito or Saque
+
+    Returns:
+        List[CodigoOperacao]: The outcome of each operation, in input order
+
+    Raises:
+        TypeError: If an operation is neither a Deposito nor a Saque
+    """
+    operacoes = list(operacoes)
+    codigos = [CodigoOperacao.OK] * len(operacoes)
+    por_conta: Dict[int, List[int]] = {}
+    for indice, (conta, transacao) in enumerate(operacoes):
+        if not isinstance(transacao, (Deposito, Saque)):
+            raise TypeError(f"Operação não suportada em lote: {type(transacao).__name__}")
+        por_conta.setdefault(id(conta), []).append(indice)
+
+    momento = agora()
+    timestamp_momento, dia_momento = para_timestamp(momento), momento.toordinal()
+    saque = TipoTransacao.SAQUE
+    for indices in por_conta.values():
+        conta = operacoes[indices[0]][0]
+        timestamps, tipos, valores = array("q"), array("b"), array("q")
+        recusadas = 0
+        with trava_da_conta(conta):
+            limite, limite_saques = conta.limite.centavos, conta.limite_saques
+            estado = (conta.saldo.centavos, conta.dia_saques, conta.saques_no_dia)
+            for indice in indices:
+                transacao = operacoes[indice][1]
+                centavos = transacao.valor.centavos
+                if transacao.data is None:
+                    timestamp, dia = timestamp_momento, dia_momento
+                else:
+                    timestamp, dia = para_timestamp(transacao.data), transacao.data.toordinal()
+                if transacao.TIPO is saque and timestamp > timestamp_momento:
+                    codigo = CodigoOperacao.DATA_FUTURA
+                elif transacao.TIPO is saque:
+                    saldo, dia_saques, saques = estado
+                    restantes = limite_saques - saques if dia <= dia_saques else limite_saques
+                    codigo = verificar_saque(centavos, saldo, limite, restantes)
+                elif 0 < centavos <= CENTAVOS_MAXIMO:
+                    codigo = CodigoOperacao.OK
+                else:
+                    codigo = CodigoOperacao.VALOR_INVALIDO
+                if codigo is not CodigoOperacao.OK:
+                    codigos[indice] = codigo
+                    recusadas += 1
+                    continue
+                estado = aplicar_evento(estado, transacao.TIPO, centavos, dia)
+                if transacao.data is None:
+                    transacao.data = momento
+                timestamps.append(timestamp)
+                tipos.append(transacao.TIPO)
+                valores.append(centavos)
+            saldo, conta.dia_saques, conta.saques_no_dia = estado
+            conta.saldo = Dinheiro(saldo)
+            conta.historico.estender(timestamps, tipos, valores)
+            if len(conta.historico) - conta._snapshot[0] >= SNAPSHOT_A_CADA:
+                conta.snapshot()
+        logger.info("Lote processado na conta %s: %d operações, %d recusadas",
+                     conta.numero, len(indices), recusadas)
+    return codigos
 
 #SISTEMA 
 
-clientes = []
+clientes = ClienteRegistry()
 contas = []
+# Account numbers of the CLI session (the web app uses account_numbers)
+numeros_conta = itertools.count(1)
 
-def buscar_cliente_por_cpf(cpf):
-    for cliente in clientes:
-        if isinstance(cliente, PessoaFisica) and cliente.cpf == cpf:
-            return cliente
-    return None
+def buscar_cliente_por_cpf(cpf: str) -> Optional[PessoaFisica]:
+    """Find a client by CPF in the module registry (O(1))."""
+    return clientes.buscar_por_cpf(cpf)
 
 def criar_cliente() -> Optional[PessoaFisica]:
     """
@@ -283,19 +1560,19 @@ def criar_cliente() -> Optional[PessoaFisica]:
         # Validate CPF
         cpf = input("CPF (somente números): ").strip()
         if not cpf.isdigit() or len(cpf) != 11:
-            logging.warning(f"Tentativa de criação de cliente com CPF inválido: {cpf}")
+            logger.warning("Tentativa de criação de cliente com CPF inválido: %s", cpf)
             print("\n CPF inválido! Digite apenas números (11 dígitos).")
             return None
             
         if buscar_cliente_por_cpf(cpf):
-            logging.warning(f"Tentativa de criação de cliente com CPF duplicado: {cpf}")
+            logger.warning("Tentativa de criação de cliente com CPF duplicado: %s", cpf)
             print("\n Já existe cliente com esse CPF!")
             return None
             
         # Validate name
         nome = input("Nome completo: ").strip()
         if len(nome) < 3:
-            logging.warning("Tentativa de criação de cliente com nome muito curto")
+            logger.warning("Tentativa de criação de cliente com nome muito curto")
             print("\n Nome deve ter pelo menos 3 caracteres!")
             return None
             
@@ -304,26 +1581,26 @@ def criar_cliente() -> Optional[PessoaFisica]:
         try:
             data_nasc = datetime.strptime(data_nascimento + " 00:00:00", "%d/%m/%Y %H:%M:%S")
         except ValueError:
-            logging.warning(f"Tentativa de criação de cliente com data inválida: {data_nascimento}")
+            logger.warning("Tentativa de criação de cliente com data inválida: %s", data_nascimento)
             print("\n Data de nascimento inválida!")
             return None
             
         # Validate address
         endereco = input("Endereço (logradouro, nro - bairro - cidade/sigla estado): ").strip()
         if len(endereco) < 10:
-            logging.warning("Tentativa de criação de cliente com endereço muito curto")
+            logger.warning("Tentativa de criação de cliente com endereço muito curto")
             print("\n Endereço muito curto!")
             return None
             
         # Create client
         cliente = PessoaFisica(cpf, nome, data_nasc, endereco)
-        clientes.append(cliente)
-        logging.info(f"Cliente criado com sucesso: {nome} (CPF: {cpf})")
+        clientes.adicionar(cliente)
+        logger.info("Cliente criado com sucesso: %s (CPF: %s)", nome, cpf)
         print("\n Cliente criado com sucesso!")
         return cliente
         
     except Exception as e:
-        logging.error(f"Erro ao criar cliente: {str(e)}")
+        logger.error("Erro ao criar cliente: %s", e)
         print("\n Ocorreu um erro ao criar o cliente. Tente novamente.")
 
 def criar_conta(cliente: Optional[PessoaFisica] = None) -> Optional[Conta]:
@@ -341,32 +1618,32 @@ def criar_conta(cliente: Optional[PessoaFisica] = None) -> Optional[Conta]:
         if not cliente:
             cpf = input("Informe o CPF do cliente: ").strip()
             if not cpf.isdigit() or len(cpf) != 11:
-                logging.warning(f"Tentativa de criação de conta com CPF inválido: {cpf}")
+                logger.warning("Tentativa de criação de conta com CPF inválido: %s", cpf)
                 print("\nCPF inválido! Digite apenas números (11 dígitos).")
                 return None
                 
             cliente = buscar_cliente_por_cpf(cpf)
             if not cliente:
-                logging.warning(f"Tentativa de criação de conta para cliente inexistente: {cpf}")
+                logger.warning("Tentativa de criação de conta para cliente inexistente: %s", cpf)
                 print("\nCliente não encontrado!")
                 return None
                 
         # Create unique account number
-        numero = len(contas) + 1
+        numero = next(numeros_conta)
         
         # Create account
         conta = Conta.nova_conta(cliente, numero)
         cliente.adicionar_conta(conta)
         contas.append(conta)
         
-        logging.info(f"Conta {numero} criada com sucesso para cliente {cliente.nome}")
+        logger.info("Conta %s criada com sucesso para cliente %s", numero, cliente.nome)
         print("\nConta criada com sucesso!")
         print(f"Agência: {conta.agencia} | Número da conta: {conta.numero}")
         
         return conta
         
     except Exception as e:
-        logging.error(f"Erro ao criar conta: {str(e)}")
+        logger.error("Erro ao criar conta: %s", e)
         print("\nOcorreu um erro ao criar a conta. Tente novamente.")
         return None
 
@@ -393,20 +1670,20 @@ def acessar_conta() -> None:
         # Validate CPF
         cpf = input("Informe o CPF do titular: ").strip()
         if not cpf.isdigit() or len(cpf) != 11:
-            logging.warning(f"Tentativa de acesso com CPF inválido: {cpf}")
+            logger.warning("Tentativa de acesso com CPF inválido: %s", cpf)
             print("\nCPF inválido! Digite apenas números (11 dígitos).")
             return
             
         # Get client
         cliente = buscar_cliente_por_cpf(cpf)
         if not cliente:
-            logging.warning(f"Tentativa de acesso com CPF inexistente: {cpf}")
+            logger.warning("Tentativa de acesso com CPF inexistente: %s", cpf)
             print("\nCliente não encontrado!")
             return
             
         # Check if client has accounts
         if not cliente.contas:
-            logging.warning(f"Tentativa de acesso a cliente sem contas: {cpf}")
+            logger.warning("Tentativa de acesso a cliente sem contas: %s", cpf)
             print("\nCliente não possui contas cadastradas!")
             return
             
@@ -423,21 +1700,21 @@ def acessar_conta() -> None:
         try:
             escolha = int(input("Escolha o número da conta: "))
             if escolha < 1 or escolha > len(cliente.contas):
-                logging.warning(f"Tentativa de acesso com número de conta inválido: {escolha}")
+                logger.warning("Tentativa de acesso com número de conta inválido: %s", escolha)
                 print("\nNúmero de conta inválido!")
                 return
                 
             conta = cliente.contas[escolha-1]
-            logging.info(f"Acesso bem-sucedido à conta {conta.numero} do cliente {cliente.nome}")
+            logger.info("Acesso bem-sucedido à conta %s do cliente %s", conta.numero, cliente.nome)
             menu2(conta, cliente)
             
         except ValueError:
-            logging.warning("Tentativa de acesso com entrada não numérica")
+            logger.warning("Tentativa de acesso com entrada não numérica")
             print("\nPor favor, digite apenas números!")
             return
             
     except Exception as e:
-        logging.error(f"Erro ao acessar conta: {str(e)}")
+        logger.error("Erro ao acessar conta: %s", e)
         print("\nOcorreu um erro ao acessar a conta. Tente novamente.")
 
 def exibir_menu_principal() -> str:
@@ -461,7 +1738,7 @@ def exibir_menu_principal() -> str:
 def menu1() -> None:
     """Main application loop."""
     
-    logging.info("Iniciando aplicação Fesisbank")
+    logger.info("Iniciando aplicação Fesisbank")
     
     while True:
         try:
@@ -481,15 +1758,15 @@ def menu1() -> None:
                 
             elif opcao == "5":
                 print("\nObrigado por usar o Fesisbank!")
-                logging.info("Encerrando aplicação Fesisbank")
+                logger.info("Encerrando aplicação Fesisbank")
                 break
                 
             else:
                 print("\nOpção inválida! Por favor, escolha uma opção de 1 a 5.")
-                logging.warning(f"Tentativa de acesso com opção inválida: {opcao}")
+                logger.warning("Tentativa de acesso com opção inválida: %s", opcao)
                 
         except Exception as e:
-            logging.error(f"Erro no menu principal: {str(e)}")
+            logger.error("Erro no menu principal: %s", e)
             print("\nOcorreu um erro inesperado. Por favor, tente novamente.")
 
 def exibir_menu_conta(conta: Conta) -> str:
@@ -518,32 +1795,45 @@ def processar_deposito(conta: Conta, cliente: Cliente) -> None:
     """Process a deposit transaction with input validation."""
     valor_str = input("Valor do depósito: R$ ").strip()
     try:
-        valor = float(valor_str)
-        transacao = Deposito(valor)
+        transacao = Deposito(valor_str)
         cliente.realizar_transacao(conta, transacao)
     except ValueError:
-        logging.warning(f"Tentativa de depósito com valor inválido: {valor_str}")
+        logger.warning("Tentativa de depósito com valor inválido: %s", valor_str)
         print("\nValor inválido! Digite apenas números.")
 
 def processar_saque(conta: Conta, cliente: Cliente) -> None:
     """Process a withdrawal transaction with input validation."""
     valor_str = input("Valor do saque: R$ ").strip()
     try:
-        valor = float(valor_str)
-        transacao = Saque(valor)
+        transacao = Saque(valor_str)
         cliente.realizar_transacao(conta, transacao)
     except ValueError:
-        logging.warning(f"Tentativa de saque com valor inválido: {valor_str}")
+        logger.warning("Tentativa de saque com valor inválido: %s", valor_str)
         print("\nValor inválido! Digite apenas números.")
 
+def exibir_resultado(resultado: ResultadoTransacao) -> None:
+    """Subscriber that prints each transaction result on the console."""
+    if resultado.ok:
+        print(f"\n {resultado.mensagem} ")
+    else:
+        print(f"\n Operação falhou! {resultado.mensagem} ")
+
+# Statement lines shown per page in the CLI
+ITENS_EXTRATO: int = 10
+
 def exibir_extrato(conta: Conta) -> None:
-    """Display account statement."""
+    """Display the account statement a page at a time, most recent page first."""
     print("\n======= EXTRATO =======")
-    if not conta.historico.transacoes:
+    pagina = conta.historico.extrato(limite=ITENS_EXTRATO)
+    if not pagina.total:
         print("Não foram realizadas movimentações.")
-    else:
-        for transacao in conta.historico.transacoes:
-            print(transacao)
+    while True:
+        for linha in pagina.linhas:
+            print(linha.descricao())
+        if pagina.anterior is None or input("\n[m] Mais antigas  [Enter] Continuar: ").strip().lower() != "m":
+            break
+        print("------ mais antigas ------")
+        pagina = conta.historico.extrato(limite=ITENS_EXTRATO, antes_de=pagina.anterior)
     print("----------------------")
     print(f"Saldo atual: R$ {conta.saldo:.2f}")
     print("======================")
@@ -556,7 +1846,9 @@ def menu2(conta: Conta, cliente: PessoaFisica) -> None:
         conta: The account to operate on
         cliente: The account owner
     """
-    logging.info(f"Iniciando operações na conta {conta.numero} do cliente {cliente.nome}")
+    logger.info("Iniciando operações na conta %s do cliente %s", conta.numero, cliente.nome)
+    eventos.inscrever(exibir_resultado)
+    eventos.inscrever(registrar_em_log)
     
     while True:
         try:
@@ -572,7 +1864,7 @@ def menu2(conta: Conta, cliente: PessoaFisica) -> None:
                 exibir_extrato(conta)
                 
             elif opcao == "4":
-                logging.info(f"Encerrando operações na conta {conta.numero}")
+                logger.info("Encerrando operações na conta %s", conta.numero)
                 break
                 
             elif opcao == "5":
@@ -580,10 +1872,10 @@ def menu2(conta: Conta, cliente: PessoaFisica) -> None:
                 
             else:
                 print("\nOpção inválida! Por favor, escolha uma opção de 1 a 5.")
-                logging.warning(f"Tentativa de operação com opção inválida: {opcao}")
+                logger.warning("Tentativa de operação com opção inválida: %s", opcao)
                 
         except Exception as e:
-            logging.error(f"Erro no menu de conta: {str(e)}")
+            logger.error("Erro no menu de conta: %s", e)
             print("\nOcorreu um erro inesperado. Por favor, tente novamente.")
 
 def exibir_menu_adicional() -> str:
@@ -610,7 +1902,7 @@ def menu3(cliente: PessoaFisica) -> None:
     Args:
         cliente: The current client
     """
-    logging.info(f"Acessando menu adicional para cliente {cliente.nome}")
+    logger.info("Acessando menu adicional para cliente %s", cliente.nome)
     
     while True:
         try:
@@ -623,20 +1915,26 @@ def menu3(cliente: PessoaFisica) -> None:
                 listar_contas(cliente)
                 
             elif opcao == "3":
-                logging.info("Tentativa de alteração de senha - funcionalidade não implementada")
+                logger.info("Tentativa de alteração de senha - funcionalidade não implementada")
                 print("\nFuncionalidade de alteração de senha será implementada em breve!")
                 
             elif opcao == "4":
-                logging.info(f"Saindo do menu adicional para cliente {cliente.nome}")
+                logger.info("Saindo do menu adicional para cliente %s", cliente.nome)
                 break
                 
             else:
                 print("\nOpção inválida! Por favor, escolha uma opção de 1 a 4.")
-                logging.warning(f"Tentativa de acesso com opção inválida no menu adicional: {opcao}")
+                logger.warning("Tentativa de acesso com opção inválida no menu adicional: %s", opcao)
                 
         except Exception as e:
-            logging.error(f"Erro no menu adicional: {str(e)}")
+            logger.error("Erro no menu adicional: %s", e)
             print("\nOcorreu um erro inesperado. Por favor, tente novamente.")
 
 if __name__ == "__main__":
+    import os
+
+    from bank_logging import configurar_logging
+
+    configurar_logging()
+    configurar_relogio(os.environ.get("BANK_TIMEZONE"))
     menu1()
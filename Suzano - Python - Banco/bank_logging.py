@@ -0,0 +1,148 @@
+"""
+Logging setup for the bank.
+
+Log calls only put records on an in-memory queue (``QueueHandler``); a
+background ``QueueListener`` thread writes them to a size-rotated file and,
+optionally, to stdout, so no disk or console write happens on the caller's
+thread. Nothing is configured on import: the entry points (the CLI in
+``bank_account`` and ``app_web``) call ``configurar_logging`` once.
+
+Environment variables (used when the matching argument is not given):
+
+    BANK_LOG_FILE     log file (default: bank.log)
+    BANK_LOG_FORMAT   "texto" (default) or "json" (one JSON object per line)
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from datetime import datetime
+from typing import List, Optional
+
+FORMATO_TEXTO = "%(asctime)s - %(levelname)s - %(message)s"
+FORMATOS = ("texto", "json")
+
+_FORMATADOR_EXCECAO = logging.Formatter()
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[logging.handlers.QueueHandler] = None
+_lock = threading.Lock()
+_atexit_registrado = False
+
+
+class FormatadorJSON(logging.Formatter):
+    """Format records as JSON lines: time, level, logger and message."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        dados = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            dados["exc"] = record.exc_text
+        return json.dumps(dados, ensure_ascii=False)
+
+
+class _HandlerFila(logging.handlers.QueueHandler):
+    """Queue handler that keeps the traceback apart from the message.
+
+    ``QueueHandler.prepare`` formats the record, so the traceback is merged
+    into ``msg`` and ``exc_info`` is cleared before the listener sees it.
+    Here only the arguments are merged; the traceback is rendered to
+    ``exc_text`` (the frames are not sent across threads), which the text
+    formatter appends as usual and ``FormatadorJSON`` writes as "exc".
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _FORMATADOR_EXCECAO.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configurar_logging(
+    arquivo: Optional[str] = None,
+    nivel: int = logging.INFO,
+    formato: Optional[str] = None,
+    max_bytes: int = 5 * 1024 * 1024,
+    backups: int = 3,
+    console: bool = True,
+) -> logging.handlers.QueueListener:
+    """
+    Route the root logger through a queue to a background writer thread.
+
+    Calling it again while configured returns the running listener, so it is
+    safe to call on every Streamlit rerun.
+
+    Args:
+        arquivo: Log file, rotated when it reaches ``max_bytes``
+        nivel: Minimum level of the root logger
+        formato: "texto" or "json" for the log file
+        max_bytes: Size at which the log file is rotated
+        backups: Number of rotated files kept (bank.log.1, bank.log.2, ...)
+        console: Whether records are also written to stdout (as text)
+
+    Returns:
+        logging.handlers.QueueListener: The running listener
+
+    Raises:
+        ValueError: If ``formato`` is not one of FORMATOS
+    """
+    global _listener, _handler, _atexit_registrado
+    with _lock:
+        if _listener is not None:
+            return _listener
+        arquivo = arquivo or os.environ.get("BANK_LOG_FILE", "bank.log")
+        formato = formato or os.environ.get("BANK_LOG_FORMAT", "texto")
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato de log inválido: {formato!r} (use {' ou '.join(FORMATOS)})")
+
+        destinos: List[logging.Handler] = []
+        rotativo = logging.handlers.RotatingFileHandler(
+            arquivo, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True)
+        rotativo.setFormatter(FormatadorJSON() if formato == "json" else logging.Formatter(FORMATO_TEXTO))
+        destinos.append(rotativo)
+        if console:
+            saida = logging.StreamHandler(sys.stdout)
+            saida.setFormatter(logging.Formatter(FORMATO_TEXTO))
+            destinos.append(saida)
+
+        fila: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _handler = _HandlerFila(fila)
+        _listener = logging.handlers.QueueListener(fila, *destinos)
+        raiz = logging.getLogger()
+        raiz.addHandler(_handler)
+        raiz.setLevel(nivel)
+        _listener.start()
+        if not _atexit_registrado:
+            atexit.register(encerrar_logging)
+            _atexit_registrado = True
+        return _listener
+
+
+def encerrar_logging() -> None:
+    """Write out every queued record, stop the writer thread and close the files."""
+    global _listener, _handler
+    with _lock:
+        if _listener is None:
+            return
+        logging.getLogger().removeHandler(_handler)
+        _listener.stop()
+        for destino in _listener.handlers:
+            destino.close()
+        _listener = _handler = None
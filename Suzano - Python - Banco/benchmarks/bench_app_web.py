@@ -0,0 +1,79 @@
+"""Benchmark: tempo de renderização da página da conta no app_web.
+
+Para cada tamanho de histórico em ``--tamanhos`` grava um ledger com um
+cliente e uma conta com esse número de transações, abre o ``app_web.py`` com
+``streamlit.testing.v1.AppTest``, faz login e mede ``--n`` reruns da página
+da conta (o que acontece a cada interação com um widget). Com o extrato
+paginado e os totais agregados a cada transação, o tempo deve ficar estável
+com o histórico.
+
+Uso:
+  python benchmarks/bench_app_web.py --tamanhos 100 10000 100000
+"""
+import argparse
+import contextlib
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, RAIZ)
+
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from bank_account import ContaCorrente, Deposito, Dinheiro, PessoaFisica, processar_lote  # noqa: E402
+from ledger import LedgerStore  # noqa: E402
+
+CPF = "12345678901"
+
+
+def _gravar_ledger(diretorio, tamanho):
+    cliente = PessoaFisica(CPF, "Cliente", datetime(1990, 1, 1), "Endereço de teste")
+    conta = ContaCorrente(1, cliente)
+    cliente.adicionar_conta(conta)
+    processar_lote([(conta, Deposito(Dinheiro(100 + i % 1000))) for i in range(tamanho)])
+    store = LedgerStore(diretorio, fsync=False)
+    store.carregar()
+    store.importar([cliente], [conta])
+    store.fechar()
+
+
+def _medir(tamanho, n):
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        _gravar_ledger(os.path.join(tmp, "bank_ledger"), tamanho)
+        st.cache_resource.clear()
+        at = AppTest.from_file(os.path.join(RAIZ, "app_web.py"), default_timeout=600).run()
+        at.text_input[0].input(CPF)
+        at.button[0].click().run()
+        tempos = []
+        for _ in range(n):
+            t0 = time.perf_counter()
+            at.run()
+            tempos.append(time.perf_counter() - t0)
+        os.chdir(RAIZ)
+    return statistics.median(tempos) * 1000
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--tamanhos", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000],
+                   help="transações no histórico da conta")
+    p.add_argument("--n", type=int, default=10, help="reruns medidos por tamanho")
+    args = p.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'transações':>11} {'ms/rerun':>9}")
+    for tamanho in args.tamanhos:
+        with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+            ms = _medir(tamanho, args.n)
+        print(f"{tamanho:>11,} {ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark: busca de cliente por CPF (varredura linear x ClienteRegistry).
+
+Mede o tempo médio de ``buscar_por_cpf`` para registries de tamanhos
+crescentes (até 1 milhão de clientes) e compara com a varredura linear
+que ``buscar_cliente_por_cpf`` fazia antes.
+
+Uso:
+  python benchmarks/bench_cliente_registry.py --max 1000000
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bank_account import ClienteRegistry, PessoaFisica  # noqa: E402
+
+
+def _varredura(lista, cpf):
+    for cliente in lista:
+        if isinstance(cliente, PessoaFisica) and cliente.cpf == cpf:
+            return cliente
+    return None
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--max", type=int, default=1_000_000, help="maior quantidade de clientes")
+    p.add_argument("--buscas", type=int, default=1000, help="buscas por tamanho")
+    args = p.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    rng = random.Random(42)
+    nascimento = datetime(1990, 1, 1)
+    registry = ClienteRegistry()
+    lista = []
+    tamanho = 1000
+    print(f"{'clientes':>10} {'registry (us)':>14} {'varredura (us)':>15}")
+    while tamanho <= args.max:
+        while len(lista) < tamanho:
+            cliente = PessoaFisica(f"{len(lista):011d}", f"Cliente {len(lista)}", nascimento, "Endereço de teste")
+            registry.adicionar(cliente)
+            lista.append(cliente)
+        cpfs = [f"{rng.randrange(tamanho):011d}" for _ in range(args.buscas)]
+
+        t0 = time.perf_counter()
+        for cpf in cpfs:
+            registry.buscar_por_cpf(cpf)
+        t_registry = (time.perf_counter() - t0) / len(cpfs) * 1e6
+
+        # a varredura fica inviável em 1M: mede só algumas buscas
+        amostra = cpfs[: max(1, 100_000 // tamanho)]
+        t0 = time.perf_counter()
+        for cpf in amostra:
+            _varredura(lista, cpf)
+        t_varredura = (time.perf_counter() - t0) / len(amostra) * 1e6
+
+        print(f"{tamanho:>10} {t_registry:>14.3f} {t_varredura:>15.1f}")
+        tamanho *= 10
+
+
+if __name__ == "__main__":
+    main()
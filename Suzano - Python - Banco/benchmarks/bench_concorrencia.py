@@ -0,0 +1,83 @@
+"""Benchmark: operações concorrentes com travas por conta (lock striping).
+
+Executa ``--ops`` operações mistas (40% depósitos, 30% saques, 30%
+transferências) divididas entre 1, 2, 4, 8 e 32 threads sobre ``--contas``
+contas, confere que nenhum saldo ficou negativo e que a soma dos saldos bate
+com os depósitos e saques confirmados, e mostra a vazão de cada execução.
+
+Em CPython com GIL as threads não executam bytecode em paralelo; o que a
+medição mostra é que a vazão se mantém com mais threads (não há uma trava
+global serializando as contas), e o ganho real aparece em builds sem GIL.
+
+Uso:
+  python benchmarks/bench_concorrencia.py --ops 1000000
+"""
+import argparse
+import contextlib
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bank_account import ContaCorrente, Deposito, Dinheiro, PessoaFisica, Saque, Transferencia  # noqa: E402
+
+
+def _rodar(n_threads, ops, n_contas):
+    cliente = PessoaFisica("12345678901", "Cliente", datetime(1990, 1, 1), "Endereço de teste")
+    contas = [ContaCorrente(numero, cliente, limite_saques=10**9) for numero in range(1, n_contas + 1)]
+    for conta in contas:
+        Deposito(Dinheiro(100_000)).registrar(conta)
+    inicial = sum(c.saldo.centavos for c in contas)
+    movimento = [0] * n_threads
+    barreira = threading.Barrier(n_threads + 1)
+
+    def operar(indice):
+        rng = random.Random(indice)
+        sorteios = [(rng.random(), rng.choice(contas), rng.choice(contas), Dinheiro(rng.randrange(1, 5000)))
+                    for _ in range(ops // n_threads)]
+        barreira.wait()
+        for op, conta, outra, valor in sorteios:
+            if op < 0.4:
+                Deposito(valor).registrar(conta)
+                movimento[indice] += valor.centavos
+            elif op < 0.7:
+                if Saque(valor).registrar(conta):
+                    movimento[indice] -= valor.centavos
+            else:
+                Transferencia(valor).registrar(conta, outra)
+
+    threads = [threading.Thread(target=operar, args=(i,)) for i in range(n_threads)]
+    for t in threads:
+        t.start()
+    barreira.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    tempo = time.perf_counter() - t0
+
+    consistente = (sum(c.saldo.centavos for c in contas) == inicial + sum(movimento)
+                   and all(c.saldo.centavos >= 0 for c in contas))
+    return (ops // n_threads) * n_threads / tempo, consistente
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--ops", type=int, default=1_000_000, help="operações por execução")
+    p.add_argument("--contas", type=int, default=1000, help="quantidade de contas")
+    args = p.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'threads':>7} {'ops/s':>12} {'consistente':>12}")
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        resultados = [(n, *_rodar(n, args.ops, args.contas)) for n in (1, 2, 4, 8, 32)]
+    for n, vazao, consistente in resultados:
+        print(f"{n:>7} {vazao:>12,.0f} {'sim' if consistente else 'NÃO':>12}")
+
+
+if __name__ == "__main__":
+    main()
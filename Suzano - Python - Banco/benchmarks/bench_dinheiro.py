@@ -0,0 +1,72 @@
+"""Benchmark: saldo em float x Decimal x Dinheiro (centavos inteiros).
+
+Repete o caminho quente de depósito e saque (soma, comparações com saldo e
+limite, subtração) ``--n`` vezes com cada representação e mostra a vazão e o
+erro acumulado em relação ao valor exato.
+
+Uso:
+  python benchmarks/bench_dinheiro.py --n 1000000
+"""
+import argparse
+import os
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bank_account import Dinheiro  # noqa: E402
+
+
+def _operar(n, zero, deposito, saque, limite):
+    saldo = zero
+    for _ in range(n):
+        saldo += deposito
+        if saque <= saldo and saque <= limite:
+            saldo -= saque
+    return saldo
+
+
+def _operar_centavos(n, zero, deposito, saque, limite):
+    """Como ``Deposito``/``Saque.registrar``: compara centavos, aloca só o saldo novo."""
+    saldo = zero
+    deposito, saque, limite = deposito.centavos, saque.centavos, limite.centavos
+    for _ in range(n):
+        saldo = Dinheiro(saldo.centavos + deposito)
+        if saque <= saldo.centavos and saque <= limite:
+            saldo = Dinheiro(saldo.centavos - saque)
+    return saldo
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--n", type=int, default=1_000_000, help="pares de depósito e saque")
+    args = p.parse_args()
+
+    # deposita R$ 0,10 e saca R$ 0,07 a cada passo: o exato é R$ 0,03 * n
+    esperado = Decimal(3 * args.n).scaleb(-2)
+    dinheiro = (Dinheiro(0), Dinheiro(10), Dinheiro(7), Dinheiro(50000))
+    casos = (
+        ("float", _operar, (0.0, 0.1, 0.07, 500.0)),
+        ("Decimal", _operar, (Decimal(0), Decimal("0.10"), Decimal("0.07"), Decimal(500))),
+        ("Dinheiro (ops)", _operar, dinheiro),
+        ("Dinheiro (registrar)", _operar_centavos, dinheiro),
+        ("int (centavos)", _operar, (0, 10, 7, 50000)),
+    )
+    print(f"operações: {args.n:,} depósitos + {args.n:,} saques")
+    print(f"{'tipo':20} {'ops/s':>13} {'saldo final':>22} {'erro':>12}")
+    for nome, operar, valores in casos:
+        t0 = time.perf_counter()
+        saldo = operar(args.n, *valores)
+        t = time.perf_counter() - t0
+        if isinstance(saldo, Dinheiro):
+            exato = Decimal(saldo.centavos).scaleb(-2)
+        elif isinstance(saldo, int):
+            exato = Decimal(saldo).scaleb(-2)
+        else:
+            exato = Decimal(saldo)
+        print(f"{nome:20} {2 * args.n / t:>13,.0f} {str(exato)[:22]:>22} {float(abs(exato - esperado)):>12.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark: latência por transação com e sem I/O de console no domínio.
+
+Mede o tempo médio de ``Deposito.registrar`` + ``Saque.registrar`` em quatro
+situações:
+
+- console + log: ``exibir_resultado`` e ``registrar_em_log`` inscritos, com
+  o log em arquivo e no stdout, como o domínio fazia antes por conta própria;
+- só log: apenas ``registrar_em_log`` inscrito (o caso do ``app_web``);
+- sem inscritos: chamadas de biblioteca e servidores;
+- console + log em fila: os mesmos inscritos do primeiro cenário, com o log
+  configurado por ``bank_logging`` (escrita numa thread de fundo).
+
+O stdout vai para um arquivo temporário, como num servidor.
+
+Uso:
+  python benchmarks/bench_eventos.py --n 50000
+"""
+import argparse
+import contextlib
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bank_account import (  # noqa: E402
+    ContaCorrente, Deposito, Dinheiro, PessoaFisica, Saque, eventos, exibir_resultado, registrar_em_log,
+)
+from bank_logging import configurar_logging, encerrar_logging  # noqa: E402
+
+
+def _medir(n):
+    cliente = PessoaFisica("12345678901", "Cliente", datetime(1990, 1, 1), "Endereço de teste")
+    conta = ContaCorrente(1, cliente, limite_saques=10**9)
+    deposito, saque = Dinheiro(1000), Dinheiro(900)
+    t0 = time.perf_counter()
+    for _ in range(n):
+        Deposito(deposito).registrar(conta)
+        Saque(saque).registrar(conta)
+    return (time.perf_counter() - t0) / (2 * n) * 1e6
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--n", type=int, default=50_000, help="pares de depósito e saque")
+    args = p.parse_args()
+
+    cenarios = (
+        ("console + log", (exibir_resultado, registrar_em_log)),
+        ("só log", (registrar_em_log,)),
+        ("sem inscritos", ()),
+    )
+    resultados = []
+    with tempfile.TemporaryDirectory() as tmp, open(os.path.join(tmp, "stdout.txt"), "w") as saida:
+        with contextlib.redirect_stdout(saida):
+            logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s",
+                                handlers=[logging.FileHandler(os.path.join(tmp, "bank.log")),
+                                          logging.StreamHandler(saida)], force=True)
+            for nome, inscritos in cenarios:
+                for callback in inscritos:
+                    eventos.inscrever(callback)
+                resultados.append((nome, _medir(args.n)))
+                for callback in inscritos:
+                    eventos.cancelar(callback)
+            logging.shutdown()
+            logging.getLogger().handlers.clear()
+
+            configurar_logging(os.path.join(tmp, "bank-fila.log"))
+            eventos.inscrever(exibir_resultado)
+            eventos.inscrever(registrar_em_log)
+            resultados.append(("console + log em fila", _medir(args.n)))
+            eventos.cancelar(exibir_resultado)
+            eventos.cancelar(registrar_em_log)
+            encerrar_logging()
+
+    base = resultados[0][1]
+    print(f"transações: {2 * args.n:,}")
+    print(f"{'cenário':22} {'us/transação':>13} {'ganho':>7}")
+    for nome, latencia in resultados:
+        print(f"{nome:22} {latencia:>13.2f} {base / latencia:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
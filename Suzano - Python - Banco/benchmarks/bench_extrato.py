@@ -0,0 +1,66 @@
+"""Benchmark: consulta paginada do extrato contra a renderização completa.
+
+Para cada tamanho em ``--tamanhos`` monta o histórico de uma conta com esse
+número de depósitos e saques (um dia por transação) e mede:
+
+- o extrato inteiro, como ``exibir_extrato`` fazia (todas as linhas);
+- a primeira consulta ``Historico.extrato``, que monta o índice preguiçoso;
+- uma página de ``--limite`` linhas, sem filtros e com período e tipo.
+
+Depois da primeira consulta, uma página custa O(log n + limite) e não deve
+crescer com o histórico.
+
+Uso:
+  python benchmarks/bench_extrato.py --tamanhos 1000 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bank_account import Historico, TipoTransacao  # noqa: E402
+
+
+def _historico(tamanho):
+    historico = Historico()
+    inicio = datetime(2000, 1, 1, 12)
+    for i in range(tamanho):
+        tipo = TipoTransacao.SAQUE if i % 3 == 2 else TipoTransacao.DEPOSITO
+        historico.adicionar(tipo, 100 + i % 1000, inicio + timedelta(hours=i))
+    return historico
+
+
+def _medir(funcao, n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        funcao()
+    return (time.perf_counter() - t0) / n * 1000
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--tamanhos", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                   help="transações no histórico")
+    p.add_argument("--limite", type=int, default=20, help="linhas por página")
+    p.add_argument("--n", type=int, default=200, help="repetições da consulta paginada")
+    args = p.parse_args()
+
+    print(f"{'transações':>11} {'completo ms':>12} {'índice ms':>10} {'página ms':>10} {'filtrada ms':>12}")
+    for tamanho in args.tamanhos:
+        historico = _historico(tamanho)
+        completo = _medir(lambda: [r.descricao() for r in historico], 1)
+        indice = _medir(lambda: historico.extrato(limite=args.limite), 1)
+        pagina = _medir(lambda: [l.descricao() for l in historico.extrato(limite=args.limite,
+                                                                          deslocamento=tamanho // 2).linhas],
+                        args.n)
+        meio = datetime(2000, 1, 1) + timedelta(hours=tamanho // 2)
+        filtrada = _medir(lambda: [l.descricao() for l in historico.extrato(
+            meio - timedelta(days=30), meio, TipoTransacao.SAQUE, limite=args.limite).linhas], args.n)
+        print(f"{tamanho:>11,} {completo:>12.1f} {indice:>10.1f} {pagina:>10.3f} {filtrada:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
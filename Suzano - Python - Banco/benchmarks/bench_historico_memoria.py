@@ -0,0 +1,69 @@
+"""Benchmark: memória do histórico (lista de strings x registros compactos).
+
+Preenche um histórico com ``--n`` transações (10 milhões por padrão) de duas
+formas -- a lista de strings PT-BR formatadas que ``Historico`` guardava e os
+arrays de timestamp/tipo/centavos atuais -- e compara a memória ocupada e o
+tempo para somar os depósitos.
+
+Uso:
+  python benchmarks/bench_historico_memoria.py --n 10000000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bank_account import Historico, TipoTransacao, formatar_data_pt  # noqa: E402
+
+INICIO = datetime(2024, 1, 1, 9, 0)
+PASSO = timedelta(seconds=37)
+
+
+def _transacoes(n):
+    for i in range(n):
+        tipo = TipoTransacao.SAQUE if i % 3 == 0 else TipoTransacao.DEPOSITO
+        yield tipo, 100 + i % 50_000, INICIO + PASSO * i
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--n", type=int, default=10_000_000, help="quantidade de transações")
+    args = p.parse_args()
+
+    t0 = time.perf_counter()
+    linhas = [
+        f"{formatar_data_pt(data)} - {tipo.rotulo}: R$ {centavos / 100:.2f}"
+        for tipo, centavos, data in _transacoes(args.n)
+    ]
+    t_strings = time.perf_counter() - t0
+    mem_strings = sys.getsizeof(linhas) + sum(map(sys.getsizeof, linhas))
+    t0 = time.perf_counter()
+    soma_strings = sum(float(l.rsplit("R$ ", 1)[1]) for l in linhas if " - Depósito: " in l)
+    t_soma_strings = time.perf_counter() - t0
+    del linhas
+
+    t0 = time.perf_counter()
+    historico = Historico()
+    for tipo, centavos, data in _transacoes(args.n):
+        historico.adicionar(tipo, centavos, data)
+    t_compacto = time.perf_counter() - t0
+    mem_compacto = sys.getsizeof(historico) + sum(
+        sys.getsizeof(coluna) for coluna in (historico._timestamps, historico._tipos, historico._centavos))
+    t0 = time.perf_counter()
+    soma_compacto = sum(c for t, c in zip(historico._tipos, historico._centavos) if t == TipoTransacao.DEPOSITO)
+    t_soma_compacto = time.perf_counter() - t0
+    assert round(soma_strings * 100) == soma_compacto
+
+    print(f"transações: {args.n:,}")
+    print(f"{'':18} {'memória (MB)':>13} {'bytes/tx':>9} {'preencher (s)':>14} {'somar depósitos (s)':>20}")
+    for nome, mem, t, t_soma in (("lista de strings", mem_strings, t_strings, t_soma_strings),
+                                 ("registros arrays", mem_compacto, t_compacto, t_soma_compacto)):
+        print(f"{nome:18} {mem / 2**20:>13.1f} {mem / args.n:>9.1f} {t:>14.2f} {t_soma:>20.2f}")
+    print(f"redução de memória: {mem_strings / mem_compacto:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
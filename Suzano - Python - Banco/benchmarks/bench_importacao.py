@@ -0,0 +1,65 @@
+"""Benchmark: tempo de importação dos módulos do banco (``python -X importtime``).
+
+Importa cada módulo ``--n`` vezes em um interpretador novo e mostra a mediana
+do tempo acumulado, e os módulos que mais pesam na importação de
+``bank_account``. O bytecode vai para um diretório temporário (o custo de
+compilar o fonte não entra na medição) e a primeira rodada só aquece o cache.
+
+Uso:
+  python benchmarks/bench_importacao.py --n 20
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MODULOS = ("bank_account", "bank_logging", "ledger", "sqlite_repository")
+
+
+def _importtime(modulo, cache):
+    """Importa ``modulo`` em um processo novo.
+
+    Devolve {módulo: (próprio, acumulado)} em us, só com os módulos carregados
+    por essa importação (o que o ``site`` já carregou fica de fora).
+    """
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=cache)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    saida = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                           cwd=RAIZ, env=env, capture_output=True, text=True, check=True).stderr
+    tempos = {}
+    for linha in saida.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        proprio, acumulado, nome = linha[len("import time:"):].split("|")
+        tempos[nome.strip()] = (int(proprio), int(acumulado))
+        if not nome.startswith("  "):  # fim de uma importação de primeiro nível
+            if nome.strip() == modulo:
+                return tempos
+            tempos = {}
+    raise RuntimeError(f"{modulo} não aparece na saída de -X importtime")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--n", type=int, default=20, help="importações por módulo")
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache:
+        print(f"{'módulo':18} {'ms (mediana)':>13}")
+        for modulo in MODULOS:
+            _importtime(modulo, cache)
+            rodadas = [_importtime(modulo, cache)[modulo][1] for _ in range(args.n)]
+            print(f"{modulo:18} {statistics.median(rodadas) / 1000:>13.2f}")
+
+        for modulo in MODULOS:
+            tempos = _importtime(modulo, cache)
+            print(f"\nmais caros em {modulo} (tempo próprio):")
+            for nome, (proprio, _) in sorted(tempos.items(), key=lambda item: -item[1][0])[:6]:
+                print(f"  {nome:24} {proprio / 1000:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
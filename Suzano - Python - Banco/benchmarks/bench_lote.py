@@ -0,0 +1,61 @@
+"""Benchmark: crédito em massa (laço de realizar_transacao x processar_lote).
+
+Simula uma folha de pagamento com ``--n`` depósitos distribuídos entre
+``--contas`` contas e compara o laço atual (``Cliente.realizar_transacao``
+para cada depósito, com print e log por operação) com ``processar_lote``.
+Os logs vão para um arquivo temporário e o stdout para ``os.devnull``, como
+num servidor.
+
+Uso:
+  python benchmarks/bench_lote.py --n 100000
+"""
+import argparse
+import contextlib
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bank_account import ContaCorrente, Deposito, Dinheiro, PessoaFisica, processar_lote  # noqa: E402
+
+
+def _folha(n, n_contas):
+    cliente = PessoaFisica("12345678901", "Empresa", datetime(1990, 1, 1), "Endereço de teste")
+    contas = [ContaCorrente(numero, cliente) for numero in range(1, n_contas + 1)]
+    return cliente, [(contas[i % n_contas], Deposito(Dinheiro(150_000 + i % 1000))) for i in range(n)]
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--n", type=int, default=100_000, help="quantidade de depósitos")
+    p.add_argument("--contas", type=int, default=1000, help="quantidade de contas")
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s",
+                            handlers=[logging.FileHandler(os.path.join(tmp, "bench.log"))], force=True)
+        with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+            cliente, operacoes = _folha(args.n, args.contas)
+            t0 = time.perf_counter()
+            for conta, deposito in operacoes:
+                cliente.realizar_transacao(conta, deposito)
+            t_laco = time.perf_counter() - t0
+
+            _, operacoes = _folha(args.n, args.contas)
+            t0 = time.perf_counter()
+            processar_lote(operacoes)
+            t_lote = time.perf_counter() - t0
+        logging.shutdown()
+
+    print(f"depósitos: {args.n:,} em {args.contas:,} contas")
+    print(f"laço realizar_transacao: {t_laco:.3f}s ({args.n / t_laco:,.0f} ops/s)")
+    print(f"processar_lote:          {t_lote:.3f}s ({args.n / t_lote:,.0f} ops/s)")
+    print(f"ganho: {t_laco / t_lote:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark: reconstrução dos saldos a partir do ledger (event sourcing).
+
+Grava um ledger com ``--contas`` aberturas de conta seguidas de ``--eventos``
+depósitos e saques em contas sorteadas (no formato do ``LedgerStore``, direto
+no segmento), e reconstrói o estado de todas as contas com
+``ledger.reconstruir_saldos``, que lê o log em streaming e guarda só o estado
+de cada conta. Mostra a vazão e o pico de memória do processo, que depende do
+número de contas e não do número de eventos. Com ``--completo`` também mede
+``LedgerStore.carregar``, que monta clientes, contas e históricos inteiros.
+
+O alvo é 1M de contas e 100M de eventos (cerca de 10 GB de log); a 170 mil
+eventos/s a reconstrução leva uns 10 minutos com uns 180 MB de memória.
+
+Uso:
+  python benchmarks/bench_replay.py --contas 1000000 --eventos 100000000
+"""
+import argparse
+import logging
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ledger import SEGMENT_PREFIX, SEGMENT_SUFFIX, LedgerStore, _codificar, reconstruir_saldos  # noqa: E402
+
+
+def _pico_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _gravar_ledger(diretorio, n_contas, n_eventos):
+    """Escreve o log em blocos, sem guardar os eventos em memória."""
+    rng = random.Random(42)
+    seq = 0
+    with open(os.path.join(diretorio, f"{SEGMENT_PREFIX}{1:012d}{SEGMENT_SUFFIX}"), "wb") as f:
+        bloco = []
+        for numero in range(1, n_contas + 1):
+            seq += 1
+            bloco.append(_codificar({"tipo": "conta_criada", "numero": numero, "cpf": f"{numero:011d}",
+                                     "nome": "Cliente", "data_nascimento": "1990-01-01T00:00:00",
+                                     "endereco": "Endereço de teste", "seq": seq}))
+            if len(bloco) >= 10_000:
+                f.writelines(bloco)
+                bloco.clear()
+        for _ in range(n_eventos):
+            seq += 1
+            tipo = "deposito" if rng.random() < 0.7 else "saque"
+            bloco.append(_codificar({"tipo": tipo, "numero": rng.randint(1, n_contas),
+                                     "centavos": rng.randrange(1, 100_000),
+                                     "data": "2024-01-01T10:00:00", "seq": seq}))
+            if len(bloco) >= 10_000:
+                f.writelines(bloco)
+                bloco.clear()
+        f.writelines(bloco)
+    return seq
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--contas", type=int, default=100_000, help="contas abertas no ledger")
+    p.add_argument("--eventos", type=int, default=10_000_000, help="depósitos e saques após as aberturas")
+    p.add_argument("--completo", action="store_true", help="também mede LedgerStore.carregar")
+    args = p.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        total = _gravar_ledger(tmp, args.contas, args.eventos)
+        tamanho = sum(os.path.getsize(os.path.join(tmp, nome)) for nome in os.listdir(tmp))
+        print(f"ledger: {total:,} eventos, {tamanho / 2**20:,.0f} MB, gravado em {time.perf_counter() - t0:.1f}s")
+
+        base = _pico_mb()
+        t0 = time.perf_counter()
+        estados = reconstruir_saldos(tmp)
+        tempo = time.perf_counter() - t0
+        print(f"reconstruir_saldos: {tempo:.1f}s ({total / tempo:,.0f} eventos/s), "
+              f"{len(estados):,} contas, pico {_pico_mb():,.0f} MB (antes: {base:,.0f} MB)")
+        del estados
+
+        if args.completo:
+            t0 = time.perf_counter()
+            store = LedgerStore(tmp, fsync=False)
+            _, contas = store.carregar()
+            tempo = time.perf_counter() - t0
+            store.fechar()
+            print(f"LedgerStore.carregar: {tempo:.1f}s ({total / tempo:,.0f} eventos/s), "
+                  f"{len(contas):,} contas, pico {_pico_mb():,.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
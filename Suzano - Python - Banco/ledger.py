@@ -0,0 +1,550 @@
+"""
+Append-only ledger store for the bank data.
+
+Every account creation, deposit and withdrawal is appended as one JSON line
+to a log segment and made durable with a batched ``fsync`` (group commit):
+concurrent writers share a single ``fsync`` and each write is acknowledged
+only after it is on disk. On startup the latest snapshot is loaded and the
+log is replayed on top of it. Snapshots are taken when the log grows as big
+as the snapshot itself, which keeps the amortized cost of a write O(1), and
+the segments they cover are deleted.
+
+The events are the source of truth: replay folds them into each account
+(``Conta.registrar_evento``) without re-running business rules, and
+``reconstruir_saldos`` rebuilds every balance by streaming the log over the
+per-account states saved in the snapshot, in memory proportional to the
+number of accounts, not of events.
+
+Layout of the store directory::
+
+    snapshot.pkl                 # two pickles: {"formato", "seq", "eventos", "estados"}
+                                 # then {"clientes": [...], "contas": [...]}
+    ledger-000000000001.log      # "<crc32> <json>" lines, seq > snapshot seq
+    ledger.lock                  # flock held by the process that has the store open
+
+A store directory has a single writer process: ``seq`` numbering and
+segment rotation assume it. ``carregar`` takes an exclusive ``flock`` on
+``ledger.lock`` and fails if another process (or another ``LedgerStore`` in
+this one) holds it. Run the web app with one worker process per directory;
+sessions inside that process share the store (``abrir_ledger``). Where
+``fcntl`` is missing (Windows) the lock is not taken.
+"""
+
+import json
+import logging
+import os
+import pickle
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from bank_account import (
+    ClienteRegistry, Conta, Deposito, Dinheiro, PessoaFisica, ResultadoTransacao, TipoTransacao, Transacao, agora,
+    aplicar_evento, trava_da_conta,
+)
+
+try:  # flock só existe em POSIX
+    import fcntl
+except ImportError:  # pragma: no cover - depende da plataforma
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+LOCK_FILE = "ledger.lock"
+SNAPSHOT_FILE = "snapshot.pkl"
+SEGMENT_PREFIX = "ledger-"
+SEGMENT_SUFFIX = ".log"
+# 2: estados por conta são (saldo, dia_saques, saques_no_dia)
+FORMATO_SNAPSHOT = 2
+
+_JSON = json.JSONDecoder()
+
+TIPOS_EVENTO: Dict[str, TipoTransacao] = {"deposito": TipoTransacao.DEPOSITO, "saque": TipoTransacao.SAQUE}
+
+
+class LedgerStore:
+    """Durable, append-only store for clients, accounts and transactions."""
+
+    def __init__(self, diretorio: Union[str, Path], snapshot_minimo: int = 1000, fsync: bool = True) -> None:
+        """
+        Initialize the store (call ``carregar`` before writing).
+
+        Args:
+            diretorio: Directory holding the snapshot and the log segments
+            snapshot_minimo: Minimum number of logged events before a snapshot
+            fsync: Whether writes are fsynced before being acknowledged
+        """
+        self.diretorio = Path(diretorio)
+        self.snapshot_minimo = snapshot_minimo
+        self.fsync = fsync
+        self.clientes: ClienteRegistry = ClienteRegistry()
+        self.contas: List[Conta] = []
+        self._contas_por_numero: Dict[int, Conta] = {}
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._arquivo = None
+        self._trava_diretorio = None
+        self._seq = 0
+        self._seq_gravado = 0
+        self._seq_sincronizado = 0
+        self._seq_snapshot = 0
+        self._eventos_snapshot = 0
+        self._eventos_log = 0
+
+    # Loading
+
+    def carregar(self) -> Tuple[ClienteRegistry, List[Conta]]:
+        """
+        Load the latest snapshot and replay the log on top of it.
+
+        A torn line at the end of the last segment (a write interrupted by a
+        crash, never acknowledged) is discarded.
+
+        Returns:
+            Tuple[ClienteRegistry, List[Conta]]: The restored clients and accounts
+
+        Raises:
+            RuntimeError: If another process already has the store open
+        """
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self._travar_diretorio()
+        snapshot = self.diretorio / SNAPSHOT_FILE
+        if snapshot.exists():
+            with open(snapshot, "rb") as f:
+                data = pickle.load(f)
+                if "clientes" not in data:  # snapshots antigos são um único pickle
+                    data.update(pickle.load(f))
+            self._restaurar(data["clientes"], data["contas"])
+            self._seq = self._seq_snapshot = data["seq"]
+            self._eventos_snapshot = data.get("eventos", data["seq"])
+
+        segmentos = self._segmentos()
+        for caminho in segmentos:
+            for evento in _ler_segmento(caminho, ultimo=caminho == segmentos[-1]):
+                if evento["seq"] > self._seq_snapshot:
+                    self._aplicar(evento)
+                    self._seq = evento["seq"]
+                    self._eventos_log += 1
+        self._seq_gravado = self._seq_sincronizado = self._seq
+
+        ativo = segmentos[-1] if segmentos else self._caminho_segmento(self._seq + 1)
+        self._arquivo = open(ativo, "ab")
+        logger.info("Ledger carregado: %s contas, seq %s", len(self.contas), self._seq)
+        return self.clientes, self.contas
+
+    def importar(self, clientes: List[PessoaFisica], contas: List[Conta]) -> None:
+        """
+        Seed an empty store with existing data (e.g. the legacy pickle).
+
+        Args:
+            clientes: Clients to import
+            contas: Accounts to import
+        """
+        self._restaurar(clientes, contas)
+        self.snapshot()
+
+    def _restaurar(self, clientes: List[PessoaFisica], contas: List[Conta]) -> None:
+        self.clientes = ClienteRegistry(clientes)
+        self.contas = list(contas)
+        self._contas_por_numero = {conta.numero: conta for conta in self.contas}
+
+    # Writing
+
+    def registrar_conta(self, cliente: PessoaFisica, conta: Conta) -> None:
+        """
+        Durably record a new account (and its client, if new).
+
+        Args:
+            cliente: The account holder
+            conta: The account already added to ``cliente``
+
+        Raises:
+            ValueError: If another client with the same CPF is already
+                registered (e.g. created by a concurrent session); nothing
+                is recorded
+        """
+        with self._lock:
+            registrado = self.clientes.buscar_por_cpf(cliente.cpf)
+            if registrado is not None and registrado is not cliente:
+                raise ValueError(f"CPF já cadastrado: {cliente.cpf}")
+            seq = self._anexar({
+                "tipo": "conta_criada",
+                "numero": conta.numero,
+                "cpf": cliente.cpf,
+                "nome": cliente.nome,
+                "data_nascimento": cliente.data_nascimento.isoformat(),
+                "endereco": cliente.endereco,
+            })
+            if cliente.cpf not in self.clientes:
+                self.clientes.adicionar(cliente)
+            if conta.numero not in self._contas_por_numero:
+                self.contas.append(conta)
+                self._contas_por_numero[conta.numero] = conta
+        self._confirmar(seq)
+
+    def realizar_transacao(self, conta: Conta, transacao: Transacao) -> ResultadoTransacao:
+        """
+        Apply a transaction to ``conta`` and durably record it.
+
+        Applying and appending to the log happen under the store lock, so a
+        snapshot taken by another writer sees either neither or both: it
+        never holds a transaction that is then replayed from the log again,
+        nor one that never reached the log. If the append fails (ENOSPC,
+        EIO) the transaction is undone in memory before the error is raised.
+
+        Args:
+            conta: The account to operate on
+            transacao: A Deposito or Saque
+
+        Returns:
+            ResultadoTransacao: The outcome; only successful transactions are
+            recorded, and they are acknowledged once on disk
+
+        Raises:
+            OSError: If the event could not be written; ``conta`` is unchanged
+        """
+        with self._lock:
+            with trava_da_conta(conta):
+                tamanho = len(conta.historico)
+                conta.snapshot()  # ponto de retorno se a gravação falhar
+            resultado = transacao.registrar(conta)
+            if not resultado:
+                return resultado
+            try:
+                seq = self._anexar(_evento_transacao(conta, transacao))
+            except BaseException:
+                with trava_da_conta(conta):
+                    conta.desfazer(tamanho)
+                raise
+        self._confirmar(seq)
+        return resultado
+
+    def registrar_transacao(self, conta: Conta, transacao: Transacao) -> None:
+        """
+        Durably record a transaction already applied to ``conta``.
+
+        Only for stores with a single writer: a snapshot taken by another
+        thread between the apply and this call would also hold the
+        transaction and replay it twice. Use ``realizar_transacao`` otherwise.
+
+        Args:
+            conta: The account the transaction was applied to
+            transacao: A successful Deposito or Saque
+        """
+        with self._lock:
+            seq = self._anexar(_evento_transacao(conta, transacao))
+        self._confirmar(seq)
+
+    def _anexar(self, evento: dict) -> int:
+        """
+        Append ``evento`` to the active segment (caller holds ``_lock``).
+
+        A failed write is cut back off the segment, so a torn line never
+        ends up in the middle of the log (replay stops at the first one).
+        """
+        seq = self._seq + 1
+        evento["seq"] = seq
+        posicao = self._arquivo.tell()
+        try:
+            self._arquivo.write(_codificar(evento))
+            self._arquivo.flush()
+        except BaseException:
+            self._descartar_desde(posicao)
+            raise
+        self._seq = self._seq_gravado = seq
+        self._eventos_log += 1
+        return seq
+
+    def _descartar_desde(self, posicao: int) -> None:
+        """Reopen the active segment cut at ``posicao``, dropping buffered bytes."""
+        caminho = self._arquivo.name
+        try:
+            self._arquivo.close()  # o buffer que não foi gravado se perde aqui
+        except OSError:
+            pass
+        try:
+            with open(caminho, "r+b") as f:
+                f.truncate(posicao)
+        except OSError:
+            logger.exception("Não foi possível cortar a escrita incompleta em %s", caminho)
+        self._arquivo = open(caminho, "ab")
+
+    def _confirmar(self, seq: int) -> None:
+        """Wait until ``seq`` is durable and take a snapshot when the log is due one."""
+        self._sincronizar(seq)
+        if self._eventos_log >= max(self.snapshot_minimo, self._eventos_snapshot):
+            self.snapshot()
+
+    def _sincronizar(self, seq: int) -> None:
+        """Group commit: one fsync acknowledges every write flushed before it."""
+        if not self.fsync:
+            return
+        with self._sync_lock:
+            if self._seq_sincronizado >= seq:
+                return
+            alvo = self._seq_gravado
+            os.fsync(self._arquivo.fileno())
+            self._seq_sincronizado = alvo
+
+    def snapshot(self) -> None:
+        """
+        Write a compacted snapshot of the current state and drop old segments.
+
+        The snapshot is written to a temporary file, fsynced and atomically
+        renamed, so a crash at any point leaves either the old or the new
+        snapshot in place; replay skips events the snapshot already covers.
+        """
+        with self._sync_lock, self._lock:
+            self.diretorio.mkdir(parents=True, exist_ok=True)
+            eventos = self._eventos_snapshot + self._eventos_log
+            # o cabeçalho basta para reconstruir_saldos, que não lê o resto
+            cabecalho = {
+                "formato": FORMATO_SNAPSHOT,
+                "seq": self._seq,
+                "eventos": eventos,
+                "estados": {c.numero: (c.saldo.centavos, c.dia_saques, c.saques_no_dia) for c in self.contas},
+            }
+            dados = {"clientes": list(self.clientes), "contas": self.contas}
+            destino = self.diretorio / SNAPSHOT_FILE
+            temporario = destino.with_suffix(".tmp")
+            with open(temporario, "wb") as f:
+                pickle.dump(cabecalho, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(dados, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporario, destino)
+            _fsync_diretorio(self.diretorio)
+
+            antigos = self._segmentos()
+            if self._arquivo is not None:
+                self._arquivo.close()
+            ativo = self._caminho_segmento(self._seq + 1)
+            self._arquivo = open(ativo, "ab")
+            for caminho in antigos:
+                # sem eventos desde a última rotação o segmento ativo é o mesmo
+                if caminho != ativo:
+                    caminho.unlink()
+            self._seq_snapshot = self._seq_sincronizado = self._seq
+            self._eventos_snapshot = eventos
+            self._eventos_log = 0
+        logger.info("Snapshot do ledger gravado (seq %s)", self._seq)
+
+    def fechar(self) -> None:
+        """Flush, fsync and close the active segment, and release the directory."""
+        with self._lock:
+            if self._arquivo is not None:
+                self._arquivo.flush()
+                if self.fsync:
+                    os.fsync(self._arquivo.fileno())
+                self._arquivo.close()
+                self._arquivo = None
+            if self._trava_diretorio is not None:
+                self._trava_diretorio.close()  # fechar libera o flock
+                self._trava_diretorio = None
+
+    def _travar_diretorio(self) -> None:
+        """Take the single-writer lock of the directory (see the module docstring)."""
+        if fcntl is None or self._trava_diretorio is not None:
+            return
+        trava = open(self.diretorio / LOCK_FILE, "a+b")
+        try:
+            fcntl.flock(trava.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError as e:
+            trava.close()
+            raise RuntimeError(
+                f"O ledger em {self.diretorio} já está aberto por outro processo; "
+                "use um único processo escritor por diretório"
+            ) from e
+        self._trava_diretorio = trava
+
+    # Replay
+
+    def _aplicar(self, evento: dict) -> None:
+        tipo = evento["tipo"]
+        if tipo == "conta_criada":
+            if evento["numero"] in self._contas_por_numero:
+                return
+            cliente = self.clientes.buscar_por_cpf(evento["cpf"])
+            if cliente is None:
+                cliente = PessoaFisica(
+                    evento["cpf"], evento["nome"],
+                    datetime.fromisoformat(evento["data_nascimento"]), evento["endereco"],
+                )
+                self.clientes.adicionar(cliente)
+            # A conta já vai no cliente quando o snapshot foi tirado entre
+            # ``adicionar_conta`` e ``registrar_conta``: não a cria de novo
+            conta = next((c for c in cliente.contas if c.numero == evento["numero"]), None)
+            if conta is None:
+                conta = Conta.nova_conta(cliente, evento["numero"])
+                cliente.adicionar_conta(conta)
+            self.contas.append(conta)
+            self._contas_por_numero[conta.numero] = conta
+            return
+        conta = self._contas_por_numero[evento["numero"]]
+        conta.registrar_evento(TIPOS_EVENTO[tipo], _centavos(evento), datetime.fromisoformat(evento["data"]))
+
+    def _segmentos(self) -> List[Path]:
+        return _listar_segmentos(self.diretorio)
+
+    def _caminho_segmento(self, primeiro_seq: int) -> Path:
+        return self.diretorio / f"{SEGMENT_PREFIX}{primeiro_seq:012d}{SEGMENT_SUFFIX}"
+
+
+def _evento_transacao(conta: Conta, transacao: Transacao) -> dict:
+    return {
+        "tipo": "deposito" if isinstance(transacao, Deposito) else "saque",
+        "numero": conta.numero,
+        "centavos": transacao.valor.centavos,
+        "data": (transacao.data or agora()).isoformat(),
+    }
+
+
+def reconstruir_saldos(diretorio: Union[str, Path]) -> Dict[int, Tuple[int, int, int]]:
+    """
+    Rebuild the state of every account from a store, without loading it.
+
+    Starts from the per-account states in the snapshot header (the clients,
+    accounts and histories after it are never read) and folds the log
+    segments into them line by line. Memory is O(accounts) however many
+    events the log holds. Read-only: a torn final line is skipped, not cut.
+
+    Args:
+        diretorio: Directory of the store
+
+    Returns:
+        Dict[int, Tuple[int, int, int]]: ``aplicar_evento`` state (balance in cents, day of
+        the withdrawal count, withdrawals that day) by account number
+
+    Raises:
+        ValueError: If a segment other than the last is corrupt
+    """
+    diretorio = Path(diretorio)
+    estados: Dict[int, Tuple[int, int, int]] = {}
+    seq_snapshot = 0
+    snapshot = diretorio / SNAPSHOT_FILE
+    if snapshot.exists():
+        with open(snapshot, "rb") as f:
+            cabecalho = pickle.load(f)
+            if cabecalho.get("formato") == FORMATO_SNAPSHOT:
+                estados = dict(cabecalho["estados"])
+            else:  # snapshots antigos: o estado sai das próprias contas
+                contas = cabecalho["contas"] if "contas" in cabecalho else pickle.load(f)["contas"]
+                estados = {c.numero: (c.saldo.centavos, c.dia_saques, c.saques_no_dia) for c in contas}
+        seq_snapshot = cabecalho["seq"]
+
+    segmentos = _listar_segmentos(diretorio)
+    for caminho in segmentos:
+        for evento in _ler_segmento(caminho, ultimo=caminho == segmentos[-1], truncar=False):
+            if evento["seq"] <= seq_snapshot:
+                continue
+            numero = evento["numero"]
+            if evento["tipo"] == "conta_criada":
+                estados[numero] = (0, 0, 0)
+            else:
+                dia = datetime.fromisoformat(evento["data"]).toordinal()
+                estados[numero] = aplicar_evento(estados[numero], TIPOS_EVENTO[evento["tipo"]], _centavos(evento), dia)
+    return estados
+
+
+def _centavos(evento: dict) -> int:
+    # logs antigos guardam "valor" em reais (float)
+    return evento["centavos"] if "centavos" in evento else Dinheiro.de_reais(evento["valor"]).centavos
+
+
+def _listar_segmentos(diretorio: Path) -> List[Path]:
+    return sorted(diretorio.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"))
+
+
+def _ler_segmento(caminho: Path, ultimo: bool, truncar: bool = True) -> Iterator[dict]:
+    """
+    Yield the valid events of a segment, stopping at the first bad line.
+
+    Only the last segment may end in a bad line (a write torn by a crash,
+    never acknowledged); it is cut off the file when ``truncar`` is set.
+    """
+    valido = 0
+    with open(caminho, "rb") as f:
+        for linha in f:
+            evento = _decodificar(linha)
+            if evento is None:
+                break
+            valido += len(linha)
+            yield evento
+    if valido < caminho.stat().st_size:
+        if not ultimo:
+            raise ValueError(f"Segmento do ledger corrompido: {caminho}")
+        if truncar:
+            logger.warning("Descartando final incompleto do ledger em %s", caminho)
+            with open(caminho, "r+b") as f:
+                f.truncate(valido)
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def _codificar(evento: dict) -> bytes:
+    """Encode an event as a ``<crc32> <json>`` line."""
+    payload = json.dumps(evento, ensure_ascii=False, separators=(",", ":"))
+    return f"{zlib.crc32(payload.encode('utf-8')):08x} {payload}\n".encode("utf-8")
+
+
+def _decodificar(linha: bytes) -> Optional[dict]:
+    """Parse a ``<crc32> <json>`` line, or return None if torn or corrupt."""
+    if not linha.endswith(b"\n"):
+        return None
+    crc, _, payload = linha[:-1].partition(b" ")
+    try:
+        if int(crc, 16) != zlib.crc32(payload):
+            return None
+        # o decodificador direto evita a detecção de encoding de json.loads(bytes)
+        return _JSON.decode(payload.decode("utf-8"))
+    except ValueError:
+        return None
+
+
+def _fsync_diretorio(diretorio: Path) -> None:
+    """Persist a rename in ``diretorio`` (no-op where directories can't be opened)."""
+    try:
+        fd = os.open(diretorio, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+_stores: Dict[Path, LedgerStore] = {}
+_stores_lock = threading.Lock()
+
+
+def abrir_ledger(diretorio: Union[str, Path], legado: Optional[Union[str, Path]] = None) -> LedgerStore:
+    """
+    Open (once per process) and load the store in ``diretorio``.
+
+    Every caller in the process shares the same store and in-memory state,
+    so concurrent sessions never write to the log through different handles.
+
+    Args:
+        diretorio: Directory of the store
+        legado: Optional legacy ``bank_data.pkl`` imported into an empty store
+
+    Returns:
+        LedgerStore: The loaded store
+    """
+    chave = Path(diretorio).resolve()
+    with _stores_lock:
+        store = _stores.get(chave)
+        if store is None:
+            store = LedgerStore(chave)
+            novo = not (chave / SNAPSHOT_FILE).exists() and not any(chave.glob(f"{SEGMENT_PREFIX}*"))
+            store.carregar()
+            if novo and legado and Path(legado).exists():
+                with open(legado, "rb") as f:
+                    data = pickle.load(f)
+                store.importar(list(data["clientes"]), data["contas"])
+            _stores[chave] = store
+        return store
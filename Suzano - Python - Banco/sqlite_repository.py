@@ -0,0 +1,438 @@
+"""
+SQLite repository for the bank data.
+
+Maps clients (``usuarios``), accounts (``contas``) and their transactions
+(``transacoes``) onto ``fesisbank_users.db``. Every query goes through an
+index -- CPF and login (the UNIQUE constraints), agency + account number, the
+account holder's login and account + transaction id -- so balance and
+statement queries touch only the rows they return, however big the database
+grows.
+
+The connection runs in WAL mode, so readers never block the writer, and all
+SQL is kept in fixed, parameterized module constants: sqlite3 prepares each
+statement once and reuses it from the connection's statement cache.
+
+This is a library layer: neither the CLI nor the web app uses it (the web
+app persists through ``ledger``). It is meant for tools and integrations
+that work with ``fesisbank_users.db`` directly.
+"""
+
+import logging
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Type, Union
+
+from bank_account import (
+    CENTAVOS_MAXIMO, CodigoOperacao, Conta, ContaCorrente, Deposito, Dinheiro, PessoaFisica, ResultadoTransacao,
+    Saque, Transacao, agora, eventos, formatar_transacao, trava_da_conta, verificar_saque,
+)
+
+logger = logging.getLogger(__name__)
+
+DB_FILE = "fesisbank_users.db"
+
+TIPOS: Dict[str, Type[Transacao]] = {"deposito": Deposito, "saque": Saque}
+
+# ``usuarios`` and ``contas`` match the tables already in fesisbank_users.db;
+# cpf and login are indexed by their UNIQUE constraints.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS usuarios (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT NOT NULL,
+    nascimento TEXT,
+    cpf TEXT UNIQUE,
+    endereco TEXT,
+    telefone TEXT,
+    login TEXT UNIQUE NOT NULL,
+    senha TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS contas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    agencia TEXT NOT NULL,
+    numero_conta INTEGER NOT NULL,
+    usuario_login TEXT NOT NULL,
+    FOREIGN KEY(usuario_login) REFERENCES usuarios(login)
+);
+CREATE TABLE IF NOT EXISTS transacoes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    conta_id INTEGER NOT NULL,
+    tipo TEXT NOT NULL CHECK (tipo IN ('deposito', 'saque')),
+    valor_centavos INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    FOREIGN KEY(conta_id) REFERENCES contas(id)
+);
+"""
+
+# Columns added to ``contas`` by this repository (name, definition); money is
+# stored as integer cents.
+COLUNAS_CONTAS = (
+    ("saldo_centavos", "INTEGER NOT NULL DEFAULT 0"),
+    ("limite_centavos", "INTEGER NOT NULL DEFAULT 50000"),
+    ("limite_saques", "INTEGER NOT NULL DEFAULT 3"),
+    ("dia_saques", "INTEGER NOT NULL DEFAULT 0"),
+    ("saques_no_dia", "INTEGER NOT NULL DEFAULT 0"),
+)
+
+INDICES = """
+CREATE UNIQUE INDEX IF NOT EXISTS idx_contas_agencia_numero ON contas(agencia, numero_conta);
+CREATE INDEX IF NOT EXISTS idx_contas_usuario ON contas(usuario_login);
+CREATE INDEX IF NOT EXISTS idx_transacoes_conta ON transacoes(conta_id, id);
+"""
+
+SQL_INSERIR_USUARIO = (
+    "INSERT INTO usuarios (nome, nascimento, cpf, endereco, login, senha) VALUES (?, ?, ?, ?, ?, ?)"
+)
+SQL_USUARIO_POR_CPF = "SELECT nome, nascimento, cpf, endereco, login FROM usuarios WHERE cpf = ?"
+SQL_USUARIO_POR_LOGIN = "SELECT nome, nascimento, cpf, endereco, login FROM usuarios WHERE login = ?"
+SQL_INSERIR_CONTA = (
+    "INSERT INTO contas (agencia, numero_conta, usuario_login, saldo_centavos, limite_centavos, limite_saques) "
+    "SELECT ?, ?, login, ?, ?, ? FROM usuarios WHERE cpf = ?"
+)
+SQL_CONTAS_DO_USUARIO = (
+    "SELECT id, agencia, numero_conta, saldo_centavos, limite_centavos, limite_saques, dia_saques, saques_no_dia "
+    "FROM contas WHERE usuario_login = ? ORDER BY numero_conta"
+)
+SQL_LOGIN_DA_CONTA = "SELECT usuario_login FROM contas WHERE agencia = ? AND numero_conta = ?"
+SQL_SALDO = "SELECT saldo_centavos FROM contas WHERE agencia = ? AND numero_conta = ?"
+# saques_no_dia conta os saques de dia_saques e recomeça no primeiro saque de um dia
+# posterior; um saque com data anterior conta no dia atual (ver aplicar_evento).
+# As regras do saque (verificar_saque) são conferidas na própria linha, e não
+# numa cópia da conta que pode estar desatualizada: se falharem, nada muda.
+SQL_ATUALIZAR_SALDO = (
+    "UPDATE contas SET saldo_centavos = saldo_centavos + :delta, "
+    "saques_no_dia = CASE WHEN NOT :saque THEN saques_no_dia WHEN dia_saques >= :dia THEN saques_no_dia + 1 ELSE 1 END, "
+    "dia_saques = CASE WHEN :saque AND :dia > dia_saques THEN :dia ELSE dia_saques END "
+    "WHERE agencia = :agencia AND numero_conta = :numero AND (NOT :saque OR ("
+    ":valor <= saldo_centavos AND :valor <= limite_centavos "
+    "AND (:dia > dia_saques OR saques_no_dia < limite_saques)))"
+)
+SQL_ESTADO_CONTA = (
+    "SELECT id, saldo_centavos, dia_saques, saques_no_dia, limite_centavos, limite_saques "
+    "FROM contas WHERE agencia = ? AND numero_conta = ?"
+)
+SQL_INSERIR_TRANSACAO = "INSERT INTO transacoes (conta_id, tipo, valor_centavos, data) VALUES (?, ?, ?, ?)"
+SQL_EXTRATO = (
+    "SELECT t.id, t.tipo, t.valor_centavos, t.data FROM transacoes t "
+    "WHERE t.conta_id = (SELECT id FROM contas WHERE agencia = ? AND numero_conta = ?) AND t.id < ? "
+    "ORDER BY t.id DESC LIMIT ?"
+)
+SQL_HISTORICO = "SELECT id, tipo, valor_centavos, data FROM transacoes WHERE conta_id = ? ORDER BY id"
+
+
+class Lancamento(NamedTuple):
+    """One row of an account statement."""
+
+    id: int
+    tipo: str
+    valor: Dinheiro
+    data: datetime
+
+    @property
+    def descricao(self) -> str:
+        """The statement line, formatted like the in-memory history."""
+        return formatar_transacao(TIPOS[self.tipo].TIPO, self.valor.centavos, self.data)
+
+
+class SQLiteRepository:
+    """Repository of clients, accounts and transactions backed by SQLite."""
+
+    def __init__(self, caminho: Union[str, Path] = DB_FILE, fsync: bool = True) -> None:
+        """
+        Open the database, enable WAL and create or migrate the schema.
+
+        Args:
+            caminho: Path of the SQLite database file
+            fsync: Whether every commit is fsynced (``synchronous=FULL``);
+                otherwise a crash may lose the last commits, but never
+                corrupts the database
+        """
+        self.caminho = Path(caminho)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.caminho), check_same_thread=False, cached_statements=128)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute(f"PRAGMA synchronous = {'FULL' if fsync else 'NORMAL'}")
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._migrar()
+
+    def _migrar(self) -> None:
+        with self._lock:
+            self._conn.executescript(SCHEMA)
+            existentes = {linha[1] for linha in self._conn.execute("PRAGMA table_info(contas)")}
+            for nome, definicao in COLUNAS_CONTAS:
+                if nome not in existentes:
+                    self._conn.execute(f"ALTER TABLE contas ADD COLUMN {nome} {definicao}")
+                    logger.info("Coluna contas.%s adicionada ao banco %s", nome, self.caminho)
+            self._conn.executescript(INDICES)
+
+    def fechar(self) -> None:
+        """Close the connection (the WAL is checkpointed by SQLite)."""
+        with self._lock:
+            self._conn.close()
+
+    # Writing
+
+    def registrar_cliente(self, cliente: PessoaFisica, login: Optional[str] = None, senha: str = "") -> None:
+        """
+        Insert a client into ``usuarios``.
+
+        Args:
+            cliente: The client to insert
+            login: Login of the user (defaults to the CPF)
+            senha: Password of the user (the bank has no passwords yet)
+
+        Raises:
+            ValueError: If the CPF or login is already registered
+        """
+        with self._lock, self._conn:
+            self._inserir_cliente(cliente, login, senha)
+
+    def _inserir_cliente(self, cliente: PessoaFisica, login: Optional[str] = None, senha: str = "") -> None:
+        """Insert into ``usuarios`` inside the caller's transaction."""
+        nascimento = cliente.data_nascimento.date().isoformat() if cliente.data_nascimento else None
+        try:
+            self._conn.execute(SQL_INSERIR_USUARIO, (
+                cliente.nome, nascimento, cliente.cpf, cliente.endereco, login or cliente.cpf, senha,
+            ))
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"CPF ou login já cadastrado: {cliente.cpf}") from e
+
+    def registrar_conta(self, cliente: PessoaFisica, conta: Conta) -> None:
+        """
+        Insert a new account (and its client, if new).
+
+        Both inserts run in one transaction: if the account can't be
+        inserted, no client is left behind without it.
+
+        Args:
+            cliente: The account holder
+            conta: The account to insert
+
+        Raises:
+            ValueError: If the agency already has an account with that number
+        """
+        with self._lock, self._conn:
+            if self._conn.execute(SQL_USUARIO_POR_CPF, (cliente.cpf,)).fetchone() is None:
+                self._inserir_cliente(cliente)
+            try:
+                self._conn.execute(SQL_INSERIR_CONTA, (
+                    conta.agencia, conta.numero, conta.saldo.centavos, conta.limite.centavos,
+                    conta.limite_saques, cliente.cpf,
+                ))
+            except sqlite3.IntegrityError as e:
+                raise ValueError(f"Conta já cadastrada: {conta.agencia}/{conta.numero}") from e
+
+    def realizar_transacao(self, conta: Conta, transacao: Transacao) -> ResultadoTransacao:
+        """
+        Validate a transaction against the stored account and apply it.
+
+        The withdrawal rules are checked by the UPDATE on the stored row, so
+        two sessions holding copies of the same account can't together
+        overdraw it or exceed its daily limit. ``conta`` is refreshed with the
+        stored balance and daily withdrawal count either way, and gets the
+        transaction in its history on success. The result is published on
+        ``eventos`` like ``Transacao.registrar``.
+
+        Args:
+            conta: A copy of the account (e.g. from ``buscar_conta``)
+            transacao: A Deposito or Saque
+
+        Returns:
+            ResultadoTransacao: The outcome, truthy if the transaction succeeded
+
+        Raises:
+            ValueError: If the account is not in the database
+        """
+        saque = isinstance(transacao, Saque)
+        centavos = transacao.valor.centavos
+        momento = agora()
+        data = transacao.data or momento
+        if not 0 < centavos <= CENTAVOS_MAXIMO:
+            codigo = CodigoOperacao.VALOR_INVALIDO
+        elif saque and data > momento:
+            codigo = CodigoOperacao.DATA_FUTURA
+        else:
+            with trava_da_conta(conta), self._lock, self._conn:
+                codigo = self._atualizar(conta, saque, centavos, data)
+                if codigo is CodigoOperacao.OK:
+                    transacao.data = data
+                    conta.historico.adicionar(transacao.TIPO, centavos, data)
+                    conta.snapshot()
+        resultado = ResultadoTransacao(codigo, transacao, conta)
+        if eventos._inscritos:
+            eventos.publicar(resultado)
+        return resultado
+
+    def registrar_transacao(self, conta: Conta, transacao: Transacao) -> None:
+        """
+        Record a transaction already applied to ``conta``.
+
+        The stored balance is updated by the transaction's amount, not
+        overwritten with ``conta.saldo``, so sessions holding different
+        copies of the same account don't lose each other's updates; ``conta``
+        is then refreshed with the stored balance and daily withdrawal count.
+        A withdrawal the stored account no longer allows (another copy spent
+        the balance or the daily limit first) is not recorded.
+
+        Args:
+            conta: The account the transaction was applied to
+            transacao: A successful Deposito or Saque
+
+        Raises:
+            ValueError: If the account is not in the database, or the stored
+                account refuses the withdrawal
+        """
+        saque = isinstance(transacao, Saque)
+        centavos = transacao.valor.centavos
+        with self._lock, self._conn:
+            codigo = self._atualizar(conta, saque, centavos, transacao.data or agora())
+        if codigo is not CodigoOperacao.OK:
+            raise ValueError(f"Saque recusado na conta {conta.agencia}/{conta.numero}: {codigo.mensagem}")
+
+    def _atualizar(self, conta: Conta, saque: bool, centavos: int, data: datetime) -> CodigoOperacao:
+        """Apply the guarded UPDATE and log the transaction (caller holds the lock and transaction)."""
+        dia = data.toordinal()
+        cursor = self._conn.execute(SQL_ATUALIZAR_SALDO, {
+            "delta": -centavos if saque else centavos, "saque": saque, "valor": centavos, "dia": dia,
+            "agencia": conta.agencia, "numero": conta.numero,
+        })
+        linha = self._conn.execute(SQL_ESTADO_CONTA, (conta.agencia, conta.numero)).fetchone()
+        if linha is None:
+            raise ValueError(f"Conta não cadastrada: {conta.agencia}/{conta.numero}")
+        conta_id, saldo, conta.dia_saques, conta.saques_no_dia, limite, limite_saques = linha
+        conta.saldo = Dinheiro(saldo)
+        if cursor.rowcount == 0:
+            restantes = limite_saques - conta.saques_no_dia if dia <= conta.dia_saques else limite_saques
+            return verificar_saque(centavos, saldo, limite, restantes)
+        conta.snapshot()  # o estado gravado é a referência daqui em diante
+        self._conn.execute(SQL_INSERIR_TRANSACAO, (
+            conta_id, "saque" if saque else "deposito", centavos, data.isoformat(),
+        ))
+        return CodigoOperacao.OK
+
+    # Reading
+
+    def buscar_cliente_por_cpf(self, cpf: str, historico: bool = False) -> Optional[PessoaFisica]:
+        """
+        Load a client and their accounts by CPF.
+
+        Args:
+            cpf: The client's CPF (digits only)
+            historico: Whether to load each account's full history too
+
+        Returns:
+            Optional[PessoaFisica]: The client or None if not found
+        """
+        with self._lock:
+            linha = self._conn.execute(SQL_USUARIO_POR_CPF, (cpf,)).fetchone()
+            return self._cliente(linha, historico) if linha else None
+
+    def buscar_cliente_por_login(self, login: str, historico: bool = False) -> Optional[PessoaFisica]:
+        """
+        Load a client and their accounts by login.
+
+        Args:
+            login: The user's login
+            historico: Whether to load each account's full history too
+
+        Returns:
+            Optional[PessoaFisica]: The client or None if not found
+        """
+        with self._lock:
+            linha = self._conn.execute(SQL_USUARIO_POR_LOGIN, (login,)).fetchone()
+            return self._cliente(linha, historico) if linha else None
+
+    def buscar_conta(self, numero: int, agencia: str = "0001", historico: bool = False) -> Optional[Conta]:
+        """
+        Load an account, with its holder, by agency and number.
+
+        Args:
+            numero: Account number
+            agencia: Agency of the account
+            historico: Whether to load the account's full history too
+
+        Returns:
+            Optional[Conta]: The account or None if not found
+        """
+        with self._lock:
+            linha = self._conn.execute(SQL_LOGIN_DA_CONTA, (agencia, numero)).fetchone()
+            cliente = self.buscar_cliente_por_login(linha[0], historico) if linha else None
+        if cliente is None:
+            return None
+        return next(c for c in cliente.contas if c.agencia == agencia and c.numero == numero)
+
+    def saldo(self, numero: int, agencia: str = "0001") -> Optional[Dinheiro]:
+        """
+        Current balance of an account, read through the (agencia, numero_conta) index.
+
+        Args:
+            numero: Account number
+            agencia: Agency of the account
+
+        Returns:
+            Optional[Dinheiro]: The balance or None if the account doesn't exist
+        """
+        with self._lock:
+            linha = self._conn.execute(SQL_SALDO, (agencia, numero)).fetchone()
+        return Dinheiro(linha[0]) if linha else None
+
+    def extrato(self, numero: int, agencia: str = "0001", limite: int = 50,
+                antes_de: Optional[int] = None) -> List[Lancamento]:
+        """
+        One page of an account statement, oldest first.
+
+        Returns the last ``limite`` transactions with id lower than
+        ``antes_de``; pass the id of the first row of a page to get the
+        previous one. The query walks the (conta_id, id) index backwards, so
+        a page costs the same however long the history is.
+
+        Args:
+            numero: Account number
+            agencia: Agency of the account
+            limite: Maximum number of transactions in the page
+            antes_de: Only return transactions older than this id
+
+        Returns:
+            List[Lancamento]: The page, in chronological order
+        """
+        with self._lock:
+            linhas = self._conn.execute(SQL_EXTRATO, (
+                agencia, numero, sys.maxsize if antes_de is None else antes_de, limite,
+            )).fetchall()
+        return [_lancamento(linha) for linha in reversed(linhas)]
+
+    def _cliente(self, linha: tuple, historico: bool) -> PessoaFisica:
+        nome, nascimento, cpf, endereco, login = linha
+        cliente = PessoaFisica(cpf, nome, _data_nascimento(nascimento), endereco)
+        for linha_conta in self._conn.execute(SQL_CONTAS_DO_USUARIO, (login,)).fetchall():
+            conta_id, agencia, numero, saldo, limite, limite_saques, dia_saques, saques_no_dia = linha_conta
+            conta = ContaCorrente(numero, cliente, Dinheiro(limite), limite_saques)
+            conta.agencia = agencia
+            conta.saldo = Dinheiro(saldo)
+            conta.dia_saques, conta.saques_no_dia = dia_saques, saques_no_dia
+            if historico:
+                for _, tipo, centavos, data in self._conn.execute(SQL_HISTORICO, (conta_id,)):
+                    conta.historico.adicionar(TIPOS[tipo].TIPO, centavos, datetime.fromisoformat(data))
+            conta.snapshot()
+            cliente.adicionar_conta(conta)
+        return cliente
+
+
+def _lancamento(linha: tuple) -> Lancamento:
+    id_, tipo, centavos, data = linha
+    return Lancamento(id_, tipo, Dinheiro(centavos), datetime.fromisoformat(data))
+
+
+def _data_nascimento(valor: Optional[str]) -> Optional[datetime]:
+    """Parse a stored birth date (ISO or dd/mm/aaaa); None if missing or invalid."""
+    if not valor:
+        return None
+    for formato in ("%Y-%m-%d", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(valor, formato)
+        except ValueError:
+            continue
+    logger.warning("Data de nascimento inválida no banco: %r", valor)
+    return None
@@ -0,0 +1,61 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from account_numbers import AlocadorNumeros  # noqa: E402
+
+# Cada processo cria contas com o próprio alocador, como um worker do Streamlit
+WORKER = """
+import json, sys
+sys.path.insert(0, {root!r})
+from account_numbers import AlocadorNumeros
+alocador = AlocadorNumeros({caminho!r}, bloco={bloco}, minimo=10)
+print(json.dumps([alocador.proximo() for _ in range({n})]))
+"""
+
+
+def test_blocks_are_reserved_once_per_bloco(tmp_path):
+    alocador = AlocadorNumeros(tmp_path / "seq.db", bloco=5, minimo=3)
+    assert [alocador.proximo() for _ in range(7)] == [4, 5, 6, 7, 8, 9, 10]
+    outro = AlocadorNumeros(tmp_path / "seq.db", bloco=5, minimo=3)
+    assert outro.proximo() == 14  # o bloco 9-13 já pertence ao primeiro alocador
+    with pytest.raises(ValueError):
+        AlocadorNumeros(tmp_path / "seq.db", bloco=0)
+
+
+def test_threads_and_instances_never_share_a_number(tmp_path):
+    alocadores = [AlocadorNumeros(tmp_path / "seq.db", bloco=3) for _ in range(2)]
+    numeros = []
+    barreira = threading.Barrier(8)
+
+    def alocar(alocador):
+        barreira.wait()
+        numeros.extend(alocador.proximo() for _ in range(200))
+
+    threads = [threading.Thread(target=alocar, args=(alocadores[i % 2],)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(numeros) == len(set(numeros)) == 1600
+
+
+def test_concurrent_processes_get_distinct_numbers(tmp_path):
+    caminho = str(tmp_path / "seq.db")
+    script = WORKER.format(root=ROOT, caminho=caminho, bloco=7, n=300)
+    processos = [subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE, text=True)
+                 for _ in range(6)]
+    numeros = []
+    for processo in processos:
+        saida, _ = processo.communicate(timeout=120)
+        assert processo.returncode == 0
+        numeros.extend(json.loads(saida))
+    assert len(numeros) == len(set(numeros)) == 1800
+    assert min(numeros) == 11
@@ -0,0 +1,440 @@
+import os
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+
+# Adiciona o diretório do projeto ao sys.path para importação durante os testes.
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+import bank_account as bank  # noqa: E402
+
+
+def _cliente(cpf="12345678901", nome="Maria Silva"):
+    return bank.PessoaFisica(cpf, nome, datetime(1990, 1, 1), "Rua A, 10 - Centro - SP/SP")
+
+
+def test_registry_lookup_by_cpf():
+    registry = bank.ClienteRegistry()
+    maria = _cliente()
+    registry.adicionar(maria)
+    assert registry.buscar_por_cpf("12345678901") is maria
+    assert registry.buscar_por_cpf("00000000000") is None
+    assert "12345678901" in registry
+    assert len(registry) == 1 and list(registry) == [maria]
+
+
+def test_registry_rejects_duplicate_cpf():
+    registry = bank.ClienteRegistry([_cliente()])
+    with pytest.raises(ValueError):
+        registry.adicionar(_cliente(nome="Outra Pessoa"))
+    assert len(registry) == 1
+
+
+def test_registry_name_prefix_index():
+    maria, mario, ana = _cliente("1", "Maria Silva"), _cliente("2", "mário Souza"), _cliente("3", "Ana")
+    registry = bank.ClienteRegistry([maria, mario, ana])
+    assert registry.buscar_por_prefixo_nome("MAR") == [maria, mario]
+    assert registry.buscar_por_prefixo_nome("mari") == [maria, mario]
+    assert registry.buscar_por_prefixo_nome("Mário") == [mario]
+    assert registry.buscar_por_prefixo_nome("Maria S") == [maria]
+    assert registry.buscar_por_prefixo_nome("z") == []
+    assert registry.buscar_por_prefixo_nome("") == [maria, mario, ana]
+
+
+def test_buscar_cliente_por_cpf_uses_module_registry(monkeypatch):
+    registry = bank.ClienteRegistry([_cliente()])
+    monkeypatch.setattr(bank, "clientes", registry)
+    assert bank.buscar_cliente_por_cpf("12345678901").nome == "Maria Silva"
+
+
+def test_historico_stores_compact_records():
+    conta = bank.Conta.nova_conta(_cliente(), 1)
+    assert bank.Deposito(100.0, datetime(2024, 1, 1, 10, 0)).registrar(conta)
+    assert bank.Saque(30.5, datetime(2024, 1, 2, 9, 30)).registrar(conta)
+
+    registros = list(conta.historico)
+    assert len(conta.historico) == 2
+    assert [r.tipo for r in registros] == [bank.TipoTransacao.DEPOSITO, bank.TipoTransacao.SAQUE]
+    assert [r.centavos for r in registros] == [10000, 3050]
+    assert registros[1].data == datetime(2024, 1, 2, 9, 30)
+    assert conta.historico[-1] == registros[1]
+    assert conta.historico.transacoes == [
+        "Segunda-feira, 01/01/2024 10:00 - Depósito: R$ 100.00",
+        "Terça-feira, 02/01/2024 09:30 - Saque: R$ 30.50",
+    ]
+
+
+def test_historico_pickles_and_reads_legacy_pickles():
+    import pickle
+
+    conta = bank.Conta.nova_conta(_cliente(), 1)
+    bank.Deposito(12.34, datetime(2024, 3, 5, 8, 15)).registrar(conta)
+    copia = pickle.loads(pickle.dumps(conta.historico))
+    assert list(copia) == list(conta.historico)
+
+    # pickles gravados antes dos registros compactos guardam as strings
+    legado = bank.Historico.__new__(bank.Historico)
+    legado.__setstate__({"transacoes": conta.historico.transacoes})
+    assert list(legado) == list(conta.historico)
+
+
+def test_historico_rejects_overflow_without_misaligning_columns():
+    historico = bank.Historico()
+    historico.adicionar(bank.TipoTransacao.DEPOSITO, 1000, datetime(2024, 1, 1, 10))
+    with pytest.raises(OverflowError):
+        historico.adicionar(bank.TipoTransacao.DEPOSITO, 2 ** 63, datetime(2024, 1, 2, 10))
+    assert len(historico._timestamps) == len(historico._tipos) == len(historico._centavos) == 1
+    historico.adicionar(bank.TipoTransacao.SAQUE, 300, datetime(2024, 1, 3, 10))
+    assert [(r.tipo, r.centavos) for r in historico] == [
+        (bank.TipoTransacao.DEPOSITO, 1000), (bank.TipoTransacao.SAQUE, 300)]
+    assert historico.agregados == bank.Agregados.recalcular(historico)
+
+    timestamps = array("q", [bank.para_timestamp(datetime(2024, 1, 4, 10))] * 2)
+    with pytest.raises(OverflowError):
+        historico.estender(timestamps, array("b", [bank.TipoTransacao.DEPOSITO] * 2), [500, 2 ** 63])
+    assert len(historico._timestamps) == len(historico._tipos) == len(historico._centavos) == 2
+    assert historico.agregados == bank.Agregados.recalcular(historico)
+
+
+def _historico_de_teste(dias=100):
+    # Um depósito de 10 e um saque de 3 por dia, a partir de 01/01/2024
+    historico = bank.Historico()
+    for dia in range(dias):
+        data = datetime(2024, 1, 1, 10) + timedelta(days=dia)
+        historico.adicionar(bank.TipoTransacao.DEPOSITO, 1000, data)
+        historico.adicionar(bank.TipoTransacao.SAQUE, 300, data + timedelta(hours=1))
+    return historico
+
+
+def test_extrato_pages_filters_and_running_balance():
+    historico = _historico_de_teste()
+
+    pagina = historico.extrato(limite=3)
+    assert pagina.total == 200 and pagina.anterior == 197
+    assert [linha.indice for linha in pagina.linhas] == [197, 198, 199]
+    assert [linha.saldo.centavos for linha in pagina.linhas] == [69300, 70300, 70000]
+    assert pagina.linhas[-1].descricao().endswith("Saque: R$ 3.00 | Saldo: R$ 700.00")
+    assert historico.extrato(limite=3, deslocamento=3).linhas == historico.extrato(limite=3, antes_de=197).linhas
+
+    # Saques entre 05/01 (inclusive) e 10/01 (exclusive), do mais recente para trás
+    filtros = dict(inicio=datetime(2024, 1, 5), fim=datetime(2024, 1, 10), tipo=bank.TipoTransacao.SAQUE)
+    assert historico.contar(**filtros) == 5
+    pagina = historico.extrato(limite=2, **filtros)
+    assert [linha.registro.data.day for linha in pagina.linhas] == [8, 9]
+    assert [linha.saldo.centavos for linha in pagina.linhas] == [5600, 6300]
+    pagina = historico.extrato(limite=2, antes_de=pagina.anterior, **filtros)
+    pagina = historico.extrato(limite=2, antes_de=pagina.anterior, **filtros)
+    assert [linha.registro.data.day for linha in pagina.linhas] == [5] and pagina.anterior is None
+    assert historico.extrato(limite=2, deslocamento=10, **filtros).linhas == []
+    with pytest.raises(ValueError):
+        historico.extrato(limite=-1)
+
+
+def test_extrato_index_follows_appends_pickles_and_clock_skew():
+    import pickle
+
+    historico = _historico_de_teste(dias=2)
+    assert historico.contar() == 4
+    historico.adicionar(bank.TipoTransacao.DEPOSITO, 500, datetime(2024, 2, 1))
+    assert historico.extrato(limite=1).linhas[0].saldo.centavos == 1900
+    assert pickle.loads(pickle.dumps(historico)).extrato(tipo=bank.TipoTransacao.DEPOSITO).total == 3
+
+    # Relógio voltou: sem ordem não há bisect, mas o filtro continua correto
+    historico.adicionar(bank.TipoTransacao.SAQUE, 100, datetime(2024, 1, 1, 12))
+    pagina = historico.extrato(inicio=datetime(2024, 1, 1), fim=datetime(2024, 1, 2))
+    assert [linha.indice for linha in pagina.linhas] == [0, 1, 5]
+    assert [linha.saldo.centavos for linha in pagina.linhas] == [1000, 700, 1800]
+
+
+def test_extrato_index_lock_is_per_history():
+    import pickle
+    import threading
+
+    ocupado, livre = _historico_de_teste(dias=2), _historico_de_teste(dias=2)
+    copia = pickle.loads(pickle.dumps(livre))
+    contagens = []
+    with ocupado._trava_indice:  # índice de outra conta sendo montado
+        consulta = threading.Thread(target=lambda: contagens.extend(h.contar() for h in (livre, copia)))
+        consulta.start()
+        consulta.join(timeout=5)
+    assert contagens == [4, 4]
+    assert ocupado.contar() == 4
+
+
+def _conferir_agregados(historico):
+    """Recalcula os totais varrendo o histórico bruto e compara com os agregados mantidos."""
+    esperados = {}
+    for registro in historico:
+        for periodo in ("total", registro.data.date(), (registro.data.year, registro.data.month)):
+            contadores = esperados.setdefault(periodo, [0, 0, 0, 0])
+            contadores[2 * registro.tipo] += 1
+            contadores[2 * registro.tipo + 1] += registro.centavos
+    agregados = historico.agregados
+    for periodo, (depositos, depositado, saques, sacado) in esperados.items():
+        if periodo == "total":
+            obtido = agregados.total()
+        elif isinstance(periodo, tuple):
+            obtido = agregados.do_mes(*periodo)
+        else:
+            obtido = agregados.do_dia(periodo)
+        assert obtido == (depositos, bank.Dinheiro(depositado), saques, bank.Dinheiro(sacado)), periodo
+    assert agregados == bank.Agregados.recalcular(historico)
+
+
+def test_agregados_are_kept_per_day_month_and_kind():
+    import pickle
+
+    historico = _historico_de_teste(dias=45)  # 01/01 a 14/02/2024
+    _conferir_agregados(historico)
+    agregados = historico.agregados
+    assert agregados.do_mes(2024, 1) == (31, bank.Dinheiro(31000), 31, bank.Dinheiro(9300))
+    assert agregados.do_dia(datetime(2024, 2, 14, 23, 59)).transacoes == 2
+    assert agregados.do_dia(datetime(2024, 2, 15)).transacoes == 0
+    assert agregados.total().ticket_medio == bank.Dinheiro(650)
+
+    # Lote com datas explícitas em dias diferentes e lote num só momento
+    conta = bank.Conta.nova_conta(_cliente(), 1)
+    bank.processar_lote([(conta, bank.Deposito("10.00", datetime(2024, 3, d))) for d in (1, 1, 31)])
+    bank.processar_lote([(conta, bank.Saque("1.00")), (conta, bank.Deposito("2.50"))])
+    _conferir_agregados(conta.historico)
+    assert conta.historico.agregados.do_mes(2024, 3).total_depositado == bank.Dinheiro(3000)
+
+    copia = pickle.loads(pickle.dumps(conta.historico))
+    assert copia.agregados == conta.historico.agregados
+    # pickles sem agregados (três colunas) recalculam ao carregar
+    legado = bank.Historico.__new__(bank.Historico)
+    legado.__setstate__(conta.historico.__getstate__()[:3])
+    _conferir_agregados(legado)
+    assert legado.agregados == conta.historico.agregados
+
+
+def test_dinheiro_is_exact():
+    assert bank.Dinheiro.de_reais(0.1).centavos == 10
+    assert bank.Dinheiro.de_reais("1,005").centavos == 101
+    assert bank.Dinheiro.de_reais(7) == bank.Dinheiro(700)
+    soma = bank.Dinheiro(0)
+    dez_centavos = bank.Dinheiro.de_reais(0.1)
+    for _ in range(1000):
+        soma += dez_centavos
+    assert soma == bank.Dinheiro.de_reais(100)
+    assert f"{bank.Dinheiro(123456):,.2f}" == "1,234.56"
+    assert str(-bank.Dinheiro(5)) == "-0.05"
+    with pytest.raises(TypeError):
+        bank.Dinheiro(1) + 0.5
+    for invalido in ("abc", float("nan"), "inf"):
+        with pytest.raises(ValueError):
+            bank.Dinheiro.de_reais(invalido)
+
+
+def test_amounts_beyond_int64_cents_are_invalid(monkeypatch, capsys):
+    maximo = bank.CENTAVOS_MAXIMO
+    assert bank.Dinheiro.de_reais(maximo // 100).centavos == maximo // 100 * 100
+    for fora in ("100000000000000000", 10 ** 17, 1e17, "-1e17"):
+        with pytest.raises(ValueError):
+            bank.Dinheiro.de_reais(fora)
+
+    # Dinheiro montado direto escapa de de_reais: a validação da transação recusa
+    conta = bank.Conta.nova_conta(_cliente(), 1)
+    resultado = bank.Deposito(bank.Dinheiro(maximo + 1)).registrar(conta)
+    assert resultado.codigo is bank.CodigoOperacao.VALOR_INVALIDO
+    assert bank.Saque(bank.Dinheiro(maximo + 1)).registrar(conta).codigo is bank.CodigoOperacao.VALOR_INVALIDO
+    assert bank.processar_lote([(conta, bank.Deposito(bank.Dinheiro(maximo + 1)))]) == [
+        bank.CodigoOperacao.VALOR_INVALIDO]
+    assert len(conta.historico) == 0 and conta.saldo == bank.Dinheiro(0)
+
+    # o menu avisa em vez de quebrar
+    monkeypatch.setattr("builtins.input", lambda _: "100000000000000000")
+    bank.processar_deposito(conta, conta.cliente)
+    assert "Valor inválido" in capsys.readouterr().out
+    assert len(conta.historico) == 0
+
+
+def test_saque_checks_use_exact_amounts():
+    conta = bank.Conta.nova_conta(_cliente(), 1)
+    assert bank.Deposito("0.30").registrar(conta)
+    assert bank.Saque(0.1).registrar(conta)
+    assert bank.Saque(0.2).registrar(conta)  # com float sobraria 0.30 - 0.1 < 0.2
+    assert conta.saldo == bank.Dinheiro(0)
+    assert not bank.Saque(0.01).registrar(conta)
+    assert not bank.Saque("500.01").registrar(conta)
+
+
+def test_processar_lote_matches_one_by_one(capsys):
+    cliente = _cliente()
+    a, b = bank.Conta.nova_conta(cliente, 1), bank.Conta.nova_conta(cliente, 2)
+    operacoes = [
+        (a, bank.Deposito("100.00")),
+        (b, bank.Saque("1.00")),
+        (a, bank.Saque("600.00")),
+        (a, bank.Saque("40.00")),
+        (b, bank.Deposito("0")),
+        (a, bank.Saque("100.00")),
+        (a, bank.Saque("10.00")),
+        (a, bank.Saque("10.00")),
+        (a, bank.Saque("10.00")),
+    ]
+    codigos = bank.processar_lote(operacoes)
+    assert codigos == [
+        bank.CodigoOperacao.OK,
+        bank.CodigoOperacao.SALDO_INSUFICIENTE,
+        bank.CodigoOperacao.SALDO_INSUFICIENTE,
+        bank.CodigoOperacao.OK,
+        bank.CodigoOperacao.VALOR_INVALIDO,
+        bank.CodigoOperacao.SALDO_INSUFICIENTE,
+        bank.CodigoOperacao.OK,
+        bank.CodigoOperacao.OK,
+        bank.CodigoOperacao.LIMITE_SAQUES,
+    ]
+    assert capsys.readouterr().out == ""
+
+    # o mesmo lote, uma operação por vez, chega ao mesmo estado
+    c, d = bank.Conta.nova_conta(cliente, 3), bank.Conta.nova_conta(cliente, 4)
+    contas = {a: c, b: d}
+    resultados = [bool(t.__class__(t.valor, t.data).registrar(contas[conta])) for conta, t in operacoes]
+    assert resultados == [codigo is bank.CodigoOperacao.OK for codigo in codigos]
+    for lote, individual in contas.items():
+        assert (lote.saldo, lote.limite_saques) == (individual.saldo, individual.limite_saques)
+        assert list(lote.historico) == list(individual.historico)
+        assert lote.historico.agregados == individual.historico.agregados
+        _conferir_agregados(lote.historico)
+
+
+def test_unregistered_transaction_is_described_without_a_date():
+    assert str(bank.Deposito(1.0)) == "Depósito: R$ 1.00"
+    assert bank.Saque(2.5).descricao() == "Saque: R$ 2.50"
+    registrado = bank.Deposito(1.0, data=datetime(2024, 1, 1, 10, 0))
+    assert str(registrado) == "Segunda-feira, 01/01/2024 10:00 - Depósito: R$ 1.00"
+
+
+def test_processar_lote_rejects_transfers():
+    conta = bank.Conta.nova_conta(_cliente(), 1)
+    with pytest.raises(TypeError):
+        bank.processar_lote([(conta, bank.Transferencia("1.00"))])
+
+
+def test_registrar_returns_result_and_publishes_events(capsys):
+    conta = bank.Conta.nova_conta(_cliente(), 1)
+    recebidos = []
+    bank.eventos.inscrever(recebidos.append)
+    try:
+        deposito = bank.Deposito("50.00")
+        resultado = deposito.registrar(conta)
+        assert resultado and resultado.codigo is bank.CodigoOperacao.OK
+        assert resultado.transacao is deposito and resultado.conta is conta
+        assert resultado.mensagem == "Depósito realizado com sucesso!"
+        falha = bank.Saque("80.00").registrar(conta)
+        assert not falha and falha.codigo is bank.CodigoOperacao.SALDO_INSUFICIENTE
+        assert recebidos == [resultado, falha]
+    finally:
+        bank.eventos.cancelar(recebidos.append)
+    # sem inscritos o domínio não escreve nada no console
+    assert capsys.readouterr().out == ""
+
+    bank.exibir_resultado(falha)
+    assert capsys.readouterr().out == "\n Operação falhou! Saldo insuficiente. \n"
+
+
+def test_conta_state_is_a_fold_of_its_history():
+    conta = bank.ContaCorrente(1, _cliente(), limite_saques=10**9)
+    for i in range(bank.SNAPSHOT_A_CADA + 300):
+        assert bank.Deposito(bank.Dinheiro(200 + i)).registrar(conta)
+        if i % 3 == 0:
+            assert bank.Saque(bank.Dinheiro(150)).registrar(conta)
+    bank.processar_lote([(conta, bank.Deposito("1.00")) for _ in range(50)])
+    assert conta.reconstruir() == (conta.saldo, conta.dia_saques, conta.saques_no_dia)
+    # snapshots periódicos limitam o que reconstruir precisa reaplicar
+    assert len(conta.historico) - conta._snapshot[0] < bank.SNAPSHOT_A_CADA
+
+    estado = (0, 0, 0)
+    for tipo, centavos, timestamp in conta.historico.eventos():
+        estado = bank.aplicar_evento(estado, tipo, centavos, bank.dia_do_timestamp(timestamp))
+    saldo, dia, saques = estado
+    assert (bank.Dinheiro(saldo), dia, saques) == conta.reconstruir()
+
+    conta.saldo = bank.Dinheiro(0)  # um estado que diverge do histórico é detectado
+    assert conta.reconstruir()[0] != conta.saldo
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    """Relógio controlado pelo teste: ``relogio[0]`` é o instante atual."""
+    momento = [datetime(2024, 5, 1, 22, 0)]
+    monkeypatch.setattr(bank, "relogio", bank.Relogio(agora=lambda: momento[0]))
+    return momento
+
+
+def test_daily_withdrawal_limit_resets_on_first_touch_after_midnight(relogio):
+    conta = bank.Conta.nova_conta(_cliente(), 1)
+    assert bank.Deposito("100.00").registrar(conta)
+    for _ in range(3):
+        assert bank.Saque("1.00").registrar(conta)
+    assert bank.Saque("1.00").registrar(conta).codigo is bank.CodigoOperacao.LIMITE_SAQUES
+    assert conta.saques_restantes() == 0
+
+    relogio[0] = datetime(2024, 5, 2, 0, 1)
+    assert conta.saques_restantes() == 3  # nada foi zerado; o dia é outro
+    assert bank.Saque("1.00").registrar(conta)
+    assert (conta.dia_saques, conta.saques_no_dia) == (relogio[0].toordinal(), 1)
+    codigos = bank.processar_lote([(conta, bank.Saque("1.00")) for _ in range(3)])
+    assert codigos[-1] is bank.CodigoOperacao.LIMITE_SAQUES
+    # um saque com data de outro dia conta no dia dele
+    relogio[0] = datetime(2024, 5, 3, 10)
+    assert bank.Saque("1.00", datetime(2024, 5, 3, 9)).registrar(conta)
+    assert conta.reconstruir() == (conta.saldo, conta.dia_saques, conta.saques_no_dia)
+    assert conta.saldo == bank.Dinheiro(100_00 - 7_00)
+
+
+def test_back_dated_withdrawal_does_not_reset_the_daily_limit(relogio):
+    conta = bank.Conta.nova_conta(_cliente(), 1)
+    assert bank.Deposito("100.00").registrar(conta)
+    for _ in range(3):
+        assert bank.Saque("1.00").registrar(conta)
+    ontem = datetime(2024, 4, 30, 12)
+    # com data anterior o saque conta no dia atual, que já está esgotado
+    assert bank.Saque("1.00", ontem).registrar(conta).codigo is bank.CodigoOperacao.LIMITE_SAQUES
+    assert bank.processar_lote([(conta, bank.Saque("1.00", ontem))]) == [bank.CodigoOperacao.LIMITE_SAQUES]
+    assert (conta.dia_saques, conta.saques_no_dia) == (relogio[0].toordinal(), 3)
+
+    # eventos fora de ordem (um replay, p. ex.) também não voltam o dia
+    estado = (10_00, 0, 0)
+    for dia in (5, 5, 4, 5):
+        estado = bank.aplicar_evento(estado, bank.TipoTransacao.SAQUE, 1_00, dia)
+    assert estado == (6_00, 5, 4)
+
+    outra = bank.Conta.nova_conta(_cliente(), 2)
+    outra.registrar_evento(bank.TipoTransacao.DEPOSITO, 10_00, relogio[0])
+    outra.registrar_evento(bank.TipoTransacao.SAQUE, 1_00, relogio[0])
+    outra.registrar_evento(bank.TipoTransacao.SAQUE, 1_00, ontem)
+    assert (outra.dia_saques, outra.saques_no_dia) == (relogio[0].toordinal(), 2)
+    assert outra.saques_restantes() == 1
+    assert outra.reconstruir() == (outra.saldo, outra.dia_saques, outra.saques_no_dia)
+
+
+def test_future_dated_withdrawal_is_refused(relogio):
+    conta = bank.Conta.nova_conta(_cliente(), 1)
+    assert bank.Deposito("100.00").registrar(conta)
+    for _ in range(3):
+        assert bank.Saque("1.00").registrar(conta)
+    amanha = relogio[0] + timedelta(days=1)
+    # levaria o dia dos saques para amanhã e liberaria o limite de hoje
+    assert bank.Saque("1.00", amanha).registrar(conta).codigo is bank.CodigoOperacao.DATA_FUTURA
+    assert bank.processar_lote([(conta, bank.Saque("1.00", amanha))]) == [bank.CodigoOperacao.DATA_FUTURA]
+    assert bank.Saque("1.00").registrar(conta).codigo is bank.CodigoOperacao.LIMITE_SAQUES
+    assert (conta.dia_saques, conta.saques_no_dia) == (relogio[0].toordinal(), 3)
+    assert conta.saldo == bank.Dinheiro(97_00)
+
+    relogio[0] = amanha
+    assert bank.Saque("1.00", amanha).registrar(conta)
+
+
+def test_relogio_uses_the_configured_timezone(monkeypatch):
+    fuso = timezone(timedelta(hours=-3))
+    monkeypatch.setattr(bank, "relogio", bank.relogio)
+    assert bank.configurar_relogio(fuso) is bank.relogio
+    esperado = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=3)
+    assert abs(bank.agora() - esperado) < timedelta(minutes=1)
+    assert bank.agora().tzinfo is None
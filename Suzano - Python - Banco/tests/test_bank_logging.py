@@ -0,0 +1,79 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+import bank_logging  # noqa: E402
+
+
+@pytest.fixture
+def log(tmp_path):
+    yield tmp_path / "bank.log"
+    bank_logging.encerrar_logging()
+
+
+def test_records_are_written_by_the_listener_as_json(log):
+    listener = bank_logging.configurar_logging(str(log), formato="json", console=False)
+    assert bank_logging.configurar_logging() is listener  # idempotente
+    logging.info("Depósito na conta %s: R$ %s", 7, "10.00")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.exception("Falhou")
+    bank_logging.encerrar_logging()  # esvazia a fila
+
+    linhas = [json.loads(l) for l in log.read_text(encoding="utf-8").splitlines()]
+    assert linhas[0]["message"] == "Depósito na conta 7: R$ 10.00"
+    assert linhas[0]["level"] == "INFO"
+    assert linhas[1]["level"] == "ERROR" and linhas[1]["message"] == "Falhou"
+    assert "ValueError: boom" in linhas[1]["exc"]
+    assert "exc" not in linhas[0]
+    assert listener._thread is None
+
+
+@pytest.mark.parametrize("formato", ["json", "texto"])
+def test_exc_info_survives_the_queue(log, formato):
+    bank_logging.configurar_logging(str(log), formato=formato, console=False)
+    try:
+        {}["conta"]
+    except KeyError:
+        logging.error("Saque %s falhou", 3, exc_info=True)
+    bank_logging.encerrar_logging()
+
+    conteudo = log.read_text(encoding="utf-8")
+    if formato == "json":
+        registro = json.loads(conteudo)
+        assert registro["message"] == "Saque 3 falhou"
+        assert registro["exc"].startswith("Traceback") and "KeyError: 'conta'" in registro["exc"]
+    else:
+        assert "Saque 3 falhou\nTraceback" in conteudo
+        assert conteudo.count("KeyError: 'conta'") == 1
+
+
+def test_log_file_is_rotated_by_size(log):
+    bank_logging.configurar_logging(str(log), max_bytes=2000, backups=2, console=False)
+    for i in range(200):
+        logging.info("linha de log número %d", i)
+    bank_logging.encerrar_logging()
+    assert sorted(p.name for p in log.parent.iterdir()) == ["bank.log", "bank.log.1", "bank.log.2"]
+    assert all(p.stat().st_size <= 2000 for p in log.parent.iterdir())
+
+
+def test_invalid_format_is_rejected(log):
+    with pytest.raises(ValueError):
+        bank_logging.configurar_logging(str(log), formato="xml")
+
+
+def test_import_has_no_logging_side_effects(tmp_path):
+    script = (
+        f"import sys, logging; sys.path.insert(0, {ROOT!r}); import bank_account; "
+        "assert not logging.getLogger().handlers, logging.getLogger().handlers"
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=tmp_path, check=True)
+    assert not (tmp_path / "bank.log").exists()
@@ -0,0 +1,120 @@
+import contextlib
+import io
+import logging
+import os
+import random
+import sys
+import threading
+from datetime import datetime
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+import bank_account as bank  # noqa: E402
+
+
+@pytest.fixture
+def silencioso():
+    """Descarta prints e logs e força trocas de thread frequentes."""
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+        sys.setswitchinterval(intervalo)
+
+
+def _contas(n, saldo="100.00"):
+    cliente = bank.PessoaFisica("12345678901", "Maria Silva", datetime(1990, 1, 1), "Rua A, 10 - Centro - SP/SP")
+    contas = [bank.ContaCorrente(numero, cliente, limite_saques=10**9) for numero in range(1, n + 1)]
+    for conta in contas:
+        assert bank.Deposito(saldo).registrar(conta)
+    return contas
+
+
+def test_concurrent_withdrawals_never_overdraw(silencioso):
+    conta, = _contas(1, saldo="100.00")
+    sucessos = []
+    barreira = threading.Barrier(32)
+
+    def sacar():
+        barreira.wait()
+        sucessos.append(sum(bool(bank.Saque("1.00").registrar(conta)) for _ in range(10)))
+
+    threads = [threading.Thread(target=sacar) for _ in range(32)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(sucessos) == 100
+    assert conta.saldo == bank.Dinheiro(0)
+    assert len(conta.historico) == 101
+
+
+def test_mixed_operations_keep_balances_consistent(silencioso):
+    contas = _contas(16)
+    inicial = sum(c.saldo.centavos for c in contas)
+    movimento = [0] * 32
+    barreira = threading.Barrier(32)
+
+    def operar(indice):
+        rng = random.Random(indice)
+        barreira.wait()
+        for _ in range(1500):
+            op = rng.random()
+            conta = rng.choice(contas)
+            valor = bank.Dinheiro(rng.randrange(1, 5000))
+            if op < 0.4:
+                assert bank.Deposito(valor).registrar(conta)
+                movimento[indice] += valor.centavos
+            elif op < 0.7:
+                if bank.Saque(valor).registrar(conta):
+                    movimento[indice] -= valor.centavos
+            else:
+                bank.Transferencia(valor).registrar(conta, rng.choice(contas))
+
+    threads = [threading.Thread(target=operar, args=(i,)) for i in range(32)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sum(c.saldo.centavos for c in contas) == inicial + sum(movimento)
+    for conta in contas:
+        assert conta.saldo.centavos >= 0
+        # o histórico de cada conta reconstrói exatamente o saldo
+        sinal = {bank.TipoTransacao.DEPOSITO: 1, bank.TipoTransacao.SAQUE: -1}
+        assert sum(sinal[r.tipo] * r.centavos for r in conta.historico) == conta.saldo.centavos
+
+
+def test_opposite_transfers_do_not_deadlock(silencioso):
+    a, b = _contas(2, saldo="1000.00")
+
+    def ida_e_volta(origem, destino):
+        for _ in range(2000):
+            bank.Transferencia("0.01").registrar(origem, destino)
+
+    threads = [threading.Thread(target=ida_e_volta, args=par) for par in ((a, b), (b, a)) * 4]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=60)
+        assert not t.is_alive()
+    assert a.saldo + b.saldo == bank.Dinheiro(200000)
+
+
+def test_transfer_is_all_or_nothing(silencioso):
+    a, b = _contas(2, saldo="10.00")
+    transferencia = bank.Transferencia("20.00")
+    assert not transferencia.registrar(a, b)
+    assert (a.saldo, b.saldo) == (bank.Dinheiro(1000), bank.Dinheiro(1000))
+    assert not bank.Transferencia("1.00").registrar(a, a)
+    transferencia = bank.Transferencia("2.50")
+    assert transferencia.registrar(a, b)
+    assert (a.saldo, b.saldo) == (bank.Dinheiro(750), bank.Dinheiro(1250))
+    assert transferencia.saque.data == transferencia.deposito.data
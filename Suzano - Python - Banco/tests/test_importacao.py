@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Mediana medida com benchmarks/bench_importacao.py: ~7 ms (17 ms quando o
+# módulo ainda importava ``logging``). A folga cobre máquinas de CI lentas.
+ORCAMENTO_IMPORT_MS = 20
+
+
+def _python(args, cwd, cache):
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=str(cache))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return subprocess.run([sys.executable, *args], cwd=cwd, env=env, capture_output=True, text=True, check=True)
+
+
+def _tempo_import_ms(modulo, cache):
+    saida = _python(["-X", "importtime", "-c", f"import sys; sys.path.insert(0, {ROOT!r}); import {modulo}"],
+                    ROOT, cache).stderr
+    for linha in saida.splitlines():
+        _, acumulado, nome = linha.split("|")
+        if nome.strip() == modulo and not nome.startswith("  "):
+            return int(acumulado) / 1000
+    raise AssertionError(saida)
+
+
+def test_import_has_no_io_or_logging(tmp_path):
+    trabalho = tmp_path / "cwd"
+    trabalho.mkdir()
+    script = (
+        f"import sys; sys.path.insert(0, {ROOT!r}); import bank_account; "
+        "assert 'logging' not in sys.modules, 'logging importado na carga do módulo'; "
+        "from datetime import datetime; "
+        "cliente = bank_account.PessoaFisica('12345678901', 'Maria Silva', datetime(1990, 1, 1), 'Rua A, 10'); "
+        "conta = bank_account.ContaCorrente.nova_conta(cliente, 1); "
+        "assert bank_account.Deposito('10.00').registrar(conta); "
+        "assert 'logging' in sys.modules and not sys.modules['logging'].getLogger().handlers"
+    )
+    _python(["-c", script], trabalho, tmp_path / "pyc")
+    assert os.listdir(trabalho) == []
+
+
+def test_import_time_budget(tmp_path):
+    _tempo_import_ms("bank_account", tmp_path)  # grava o bytecode
+    melhor = min(_tempo_import_ms("bank_account", tmp_path) for _ in range(5))
+    assert melhor < ORCAMENTO_IMPORT_MS, f"import bank_account levou {melhor:.1f} ms"
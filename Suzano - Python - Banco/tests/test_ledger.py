@@ -0,0 +1,274 @@
+import errno
+import os
+import pickle
+import signal
+import subprocess
+import sys
+import textwrap
+import threading
+from datetime import datetime
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+import bank_account as bank  # noqa: E402
+from ledger import LedgerStore, reconstruir_saldos  # noqa: E402
+
+
+def _nova_conta(store, cpf="12345678901", numero=1):
+    cliente = store.clientes.buscar_por_cpf(cpf) or bank.PessoaFisica(
+        cpf, "Maria Silva", datetime(1990, 1, 1), "Rua A, 10 - Centro - SP/SP")
+    conta = bank.Conta.nova_conta(cliente, numero)
+    cliente.adicionar_conta(conta)
+    store.registrar_conta(cliente, conta)
+    return conta
+
+
+def _operar(store, conta, transacao):
+    assert store.realizar_transacao(conta, transacao)
+
+
+def test_replay_restores_state(tmp_path):
+    store = LedgerStore(tmp_path)
+    store.carregar()
+    conta = _nova_conta(store)
+    _operar(store, conta, bank.Deposito(100.0))
+    _operar(store, conta, bank.Saque(30.0))
+    _nova_conta(store, numero=2)
+    store.fechar()
+
+    clientes, contas = LedgerStore(tmp_path).carregar()
+    assert len(clientes) == 1
+    assert [c.numero for c in contas] == [1, 2]
+    restaurada = contas[0]
+    assert restaurada.saldo == bank.Dinheiro(7000)
+    assert restaurada.saques_restantes() == 2
+    assert restaurada.historico.transacoes == conta.historico.transacoes
+    assert restaurada.historico.agregados == bank.Agregados.recalcular(conta.historico)
+    assert len(clientes.buscar_por_cpf("12345678901").contas) == 2
+
+
+def test_snapshot_compacts_log(tmp_path):
+    store = LedgerStore(tmp_path, snapshot_minimo=5)
+    store.carregar()
+    conta = _nova_conta(store)
+    for _ in range(12):
+        _operar(store, conta, bank.Deposito(1.0))
+    store.fechar()
+
+    assert (tmp_path / "snapshot.pkl").exists()
+    segmentos = sorted(tmp_path.glob("ledger-*.log"))
+    assert len(segmentos) == 1
+    assert len(segmentos[0].read_bytes().splitlines()) < 5
+
+    _, contas = LedgerStore(tmp_path).carregar()
+    assert contas[0].saldo == bank.Dinheiro(1200)
+    assert len(contas[0].historico.transacoes) == 12
+
+
+def test_torn_tail_is_discarded(tmp_path):
+    store = LedgerStore(tmp_path)
+    store.carregar()
+    conta = _nova_conta(store)
+    _operar(store, conta, bank.Deposito(50.0))
+    store.fechar()
+    segmento = next(tmp_path.glob("ledger-*.log"))
+    with open(segmento, "ab") as f:
+        f.write(b'1234abcd {"tipo":"deposito","num')  # escrita interrompida
+
+    store = LedgerStore(tmp_path)
+    _, contas = store.carregar()
+    assert contas[0].saldo == bank.Dinheiro(5000)
+    _operar(store, contas[0], bank.Deposito(5.0))
+    store.fechar()
+    _, contas = LedgerStore(tmp_path).carregar()
+    assert contas[0].saldo == bank.Dinheiro(5500)
+
+
+def test_concurrent_snapshot_does_not_replay_a_transaction_twice(tmp_path):
+    store = LedgerStore(tmp_path)
+    store.carregar()
+    conta = _nova_conta(store)
+    concorrentes = []
+
+    def snapshot_no_meio(resultado):
+        # outro escritor tira o snapshot entre aplicar a transação e gravá-la
+        t = threading.Thread(target=store.snapshot)
+        t.start()
+        t.join(0.2)
+        concorrentes.append(t)
+
+    bank.eventos.inscrever(snapshot_no_meio)
+    try:
+        assert store.realizar_transacao(conta, bank.Deposito(10.0))
+    finally:
+        bank.eventos.cancelar(snapshot_no_meio)
+    for t in concorrentes:
+        t.join()
+    store.fechar()
+
+    _, contas = LedgerStore(tmp_path).carregar()
+    assert contas[0].saldo == bank.Dinheiro(1000)
+    assert len(contas[0].historico.transacoes) == 1
+
+
+class _DiscoCheio:
+    """Arquivo que grava metade da linha e falha com ENOSPC."""
+
+    def __init__(self, arquivo):
+        self._arquivo = arquivo
+
+    def __getattr__(self, nome):
+        return getattr(self._arquivo, nome)
+
+    def write(self, dados):
+        self._arquivo.write(dados[:len(dados) // 2])
+        self._arquivo.flush()
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+
+def test_failed_append_rolls_the_transaction_back(tmp_path):
+    store = LedgerStore(tmp_path)
+    store.carregar()
+    conta = _nova_conta(store)
+    _operar(store, conta, bank.Deposito(50.0))
+    store._arquivo = _DiscoCheio(store._arquivo)
+    with pytest.raises(OSError):
+        store.realizar_transacao(conta, bank.Saque(20.0))
+    assert conta.saldo == bank.Dinheiro(5000)
+    assert (conta.dia_saques, conta.saques_no_dia) == (0, 0)
+    assert len(conta.historico) == 1
+    assert conta.historico.agregados == bank.Agregados.recalcular(conta.historico)
+    assert conta.historico.contar() == 1
+
+    # a linha cortada não fica no meio do log
+    _operar(store, conta, bank.Saque(20.0))
+    store.fechar()
+    _, contas = LedgerStore(tmp_path).carregar()
+    assert contas[0].saldo == bank.Dinheiro(3000)
+    assert list(contas[0].historico) == list(conta.historico)
+
+
+def test_second_client_with_the_same_cpf_is_refused(tmp_path):
+    store = LedgerStore(tmp_path)
+    store.carregar()
+    _nova_conta(store)
+    # outra sessão montou o próprio cliente com o mesmo CPF antes do primeiro registro
+    outro = bank.PessoaFisica("12345678901", "Maria Silva", datetime(1990, 1, 1), "Rua A, 10 - Centro - SP/SP")
+    conta = bank.Conta.nova_conta(outro, 2)
+    outro.adicionar_conta(conta)
+    with pytest.raises(ValueError):
+        store.registrar_conta(outro, conta)
+    store.fechar()
+    _, contas = LedgerStore(tmp_path).carregar()
+    assert [c.numero for c in contas] == [1]
+
+
+def test_replay_does_not_duplicate_an_account_already_in_the_snapshot(tmp_path):
+    store = LedgerStore(tmp_path)
+    store.carregar()
+    cliente = bank.PessoaFisica("12345678901", "Maria Silva", datetime(1990, 1, 1), "Rua A, 10 - Centro - SP/SP")
+    store.clientes.adicionar(cliente)
+    conta = bank.Conta.nova_conta(cliente, 1)
+    cliente.adicionar_conta(conta)
+    store.snapshot()  # já vê a conta no cliente, antes do registro no log
+    store.registrar_conta(cliente, conta)
+    store.fechar()
+
+    clientes, contas = LedgerStore(tmp_path).carregar()
+    assert [c.numero for c in contas] == [1]
+    assert len(clientes.buscar_por_cpf("12345678901").contas) == 1
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="flock é POSIX")
+def test_a_second_writer_is_refused(tmp_path):
+    store = LedgerStore(tmp_path)
+    store.carregar()
+    script = f"import sys; sys.path.insert(0, {ROOT!r}); from ledger import LedgerStore; " \
+             f"LedgerStore({str(tmp_path)!r}).carregar()"
+    outro = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+    assert outro.returncode != 0 and "RuntimeError" in outro.stderr
+    with pytest.raises(RuntimeError):
+        LedgerStore(tmp_path).carregar()
+    store.fechar()
+    LedgerStore(tmp_path).carregar()  # liberado ao fechar
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="requer SIGKILL")
+def test_kill_9_keeps_every_acknowledged_write(tmp_path):
+    script = textwrap.dedent(f"""
+        import sys
+        from datetime import datetime
+        sys.path.insert(0, {ROOT!r})
+        import bank_account as bank
+        from ledger import LedgerStore
+
+        store = LedgerStore({str(tmp_path)!r}, snapshot_minimo=50)
+        store.carregar()
+        cliente = bank.PessoaFisica("12345678901", "Maria", datetime(1990, 1, 1), "Rua A, 10 - Centro")
+        conta = bank.Conta.nova_conta(cliente, 1)
+        cliente.adicionar_conta(conta)
+        store.registrar_conta(cliente, conta)
+        while True:
+            store.realizar_transacao(conta, bank.Deposito(1.0))
+            sys.stderr.write("ack\\n")
+            sys.stderr.flush()
+    """)
+    proc = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, cwd=tmp_path)
+    acks = 0
+    while acks < 200:
+        assert proc.stderr.readline() == b"ack\n"
+        acks += 1
+    proc.send_signal(signal.SIGKILL)
+    proc.wait()
+    acks += proc.stderr.read().count(b"ack\n")
+
+    _, contas = LedgerStore(tmp_path).carregar()
+    # tudo que foi confirmado está no disco; no máximo a escrita em curso a mais
+    assert acks * 100 <= contas[0].saldo.centavos <= (acks + 1) * 100
+
+
+def test_reconstruir_saldos_streams_snapshot_and_log(tmp_path):
+    store = LedgerStore(tmp_path, snapshot_minimo=5)
+    store.carregar()
+    a, b = _nova_conta(store), _nova_conta(store, numero=2)
+    for i in range(9):
+        _operar(store, a, bank.Deposito(10.0 + i))
+    _operar(store, a, bank.Saque(25.0))
+    _operar(store, b, bank.Deposito(3.0))
+    store.fechar()
+    assert (tmp_path / "snapshot.pkl").exists()
+    segmento = max(tmp_path.glob("ledger-*.log"))
+    with open(segmento, "ab") as f:
+        f.write(b'1234abcd {"tipo":"saque","num')  # escrita interrompida
+    tamanho = segmento.stat().st_size
+
+    estados = reconstruir_saldos(tmp_path)
+    assert segmento.stat().st_size == tamanho  # só leitura
+    _, contas = LedgerStore(tmp_path).carregar()
+    assert estados == {c.numero: (c.saldo.centavos, c.dia_saques, c.saques_no_dia) for c in contas}
+    assert estados[1] == (12600 - 2500, contas[0].dia_saques, 1)
+    for conta in contas:
+        assert conta.reconstruir() == (conta.saldo, conta.dia_saques, conta.saques_no_dia)
+
+
+def test_snapshots_in_the_old_single_pickle_format_still_load(tmp_path):
+    cliente = bank.PessoaFisica("12345678901", "Maria Silva", datetime(1990, 1, 1), "Rua A, 10 - Centro - SP/SP")
+    conta = bank.Conta.nova_conta(cliente, 1)
+    cliente.adicionar_conta(conta)
+    assert bank.Deposito("42.00").registrar(conta)
+    assert bank.Saque("2.00", datetime(2024, 5, 1, 9)).registrar(conta)
+    # uma conta como era gravada antes da janela diária: limite_saques com os saques restantes
+    del conta.dia_saques, conta.saques_no_dia, conta._snapshot
+    conta.limite_saques = 2
+    with open(tmp_path / "snapshot.pkl", "wb") as f:
+        pickle.dump({"seq": 2, "clientes": [cliente], "contas": [conta]}, f)
+
+    dia = datetime(2024, 5, 1).toordinal()
+    assert reconstruir_saldos(tmp_path) == {1: (4000, dia, 1)}
+    _, contas = LedgerStore(tmp_path).carregar()
+    assert contas[0].saldo == bank.Dinheiro(4000)
+    assert (contas[0].limite_saques, contas[0].dia_saques, contas[0].saques_no_dia) == (3, dia, 1)
@@ -0,0 +1,178 @@
+import os
+import shutil
+import sqlite3
+import sys
+from datetime import datetime
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+import bank_account as bank  # noqa: E402
+import sqlite_repository as repo_mod  # noqa: E402
+from sqlite_repository import SQLiteRepository  # noqa: E402
+
+
+def _nova_conta(repo, cpf="12345678901", numero=1):
+    cliente = bank.PessoaFisica(cpf, "Maria Silva", datetime(1990, 1, 1), "Rua A, 10 - Centro - SP/SP")
+    conta = bank.Conta.nova_conta(cliente, numero)
+    cliente.adicionar_conta(conta)
+    repo.registrar_conta(cliente, conta)
+    return conta
+
+
+def _operar(repo, conta, transacao):
+    assert transacao.registrar(conta)
+    repo.registrar_transacao(conta, transacao)
+
+
+def test_back_dated_withdrawal_keeps_the_current_day(tmp_path):
+    repo = SQLiteRepository(tmp_path / "banco.db")
+    conta = _nova_conta(repo)
+    _operar(repo, conta, bank.Deposito(100.0))
+    hoje, ontem = datetime(2024, 5, 2, 10), datetime(2024, 5, 1, 10)
+    _operar(repo, conta, bank.Saque(1.0, hoje))
+    _operar(repo, conta, bank.Saque(1.0, ontem))
+    assert (conta.dia_saques, conta.saques_no_dia) == (hoje.toordinal(), 2)
+    repo.fechar()
+
+
+def test_round_trip(tmp_path):
+    repo = SQLiteRepository(tmp_path / "banco.db")
+    conta = _nova_conta(repo)
+    _operar(repo, conta, bank.Deposito(100.0))
+    _operar(repo, conta, bank.Saque(30.0))
+    repo.fechar()
+
+    repo = SQLiteRepository(tmp_path / "banco.db")
+    cliente = repo.buscar_cliente_por_cpf("12345678901", historico=True)
+    assert cliente.nome == "Maria Silva"
+    assert cliente.data_nascimento == datetime(1990, 1, 1)
+    restaurada = cliente.contas[0]
+    assert restaurada.saldo == bank.Dinheiro(7000)
+    assert restaurada.saques_restantes() == 2
+    assert restaurada.historico.transacoes == conta.historico.transacoes
+    assert restaurada.historico.agregados == bank.Agregados.recalcular(conta.historico)
+    assert repo.saldo(1) == bank.Dinheiro(7000)
+    assert repo.buscar_conta(1).cliente.cpf == "12345678901"
+    assert repo.buscar_conta(2) is None
+    assert repo.buscar_cliente_por_cpf("00000000000") is None
+
+
+def test_stale_copies_do_not_lose_updates(tmp_path):
+    repo = SQLiteRepository(tmp_path / "banco.db")
+    _nova_conta(repo)
+    a, b = repo.buscar_conta(1), repo.buscar_conta(1)
+    _operar(repo, a, bank.Deposito(10.0))
+    _operar(repo, b, bank.Deposito(5.0))
+    assert b.saldo == bank.Dinheiro(1500)
+    assert repo.saldo(1) == bank.Dinheiro(1500)
+
+
+def test_stale_copies_cannot_overdraw(tmp_path):
+    repo = SQLiteRepository(tmp_path / "banco.db")
+    _operar(repo, _nova_conta(repo), bank.Deposito(10.0))
+    a, b = repo.buscar_conta(1), repo.buscar_conta(1)
+    assert repo.realizar_transacao(a, bank.Saque(10.0))
+    resultado = repo.realizar_transacao(b, bank.Saque(10.0))
+    assert resultado.codigo is bank.CodigoOperacao.SALDO_INSUFICIENTE
+    assert b.saldo == bank.Dinheiro(0) and len(b.historico) == 0
+    assert repo.saldo(1) == bank.Dinheiro(0)
+
+    # registrar_transacao: as duas cópias aplicam o saque em memória, o banco recusa o segundo
+    _operar(repo, a, bank.Deposito(5.0))
+    c, d = repo.buscar_conta(1), repo.buscar_conta(1)
+    _operar(repo, c, bank.Saque(5.0))
+    assert bank.Saque(5.0).registrar(d)
+    with pytest.raises(ValueError):
+        repo.registrar_transacao(d, bank.Saque(5.0))
+    assert repo.saldo(1) == bank.Dinheiro(0)
+    assert [float(l.valor) for l in repo.extrato(1)] == [10.0, 10.0, 5.0, 5.0]
+
+
+def test_stale_copies_cannot_exceed_the_daily_limit(tmp_path):
+    repo = SQLiteRepository(tmp_path / "banco.db")
+    _operar(repo, _nova_conta(repo), bank.Deposito(100.0))
+    copias = [repo.buscar_conta(1) for _ in range(4)]
+    for copia in copias[:3]:
+        assert repo.realizar_transacao(copia, bank.Saque(1.0))
+    # a última cópia ainda vê o limite inteiro, mas o banco já tem 3 saques hoje
+    assert copias[3].saques_restantes() == 3
+    assert repo.realizar_transacao(copias[3], bank.Saque(1.0)).codigo is bank.CodigoOperacao.LIMITE_SAQUES
+    assert copias[3].saques_restantes() == 0
+    assert repo.saldo(1) == bank.Dinheiro(9700)
+
+
+def test_duplicates_are_rejected(tmp_path):
+    repo = SQLiteRepository(tmp_path / "banco.db")
+    conta = _nova_conta(repo)
+    with pytest.raises(ValueError):
+        repo.registrar_cliente(conta.cliente)
+    with pytest.raises(ValueError):
+        repo.registrar_conta(conta.cliente, conta)
+    with pytest.raises(ValueError):
+        repo.registrar_transacao(bank.Conta.nova_conta(conta.cliente, 99), bank.Deposito(1.0))
+
+
+def test_failed_account_insert_leaves_no_orphan_client(tmp_path):
+    repo = SQLiteRepository(tmp_path / "banco.db")
+    _nova_conta(repo)
+    outro = bank.PessoaFisica("98765432100", "João Souza", datetime(1985, 5, 5), "Rua B, 20 - Centro - SP/SP")
+    with pytest.raises(ValueError):
+        repo.registrar_conta(outro, bank.Conta.nova_conta(outro, 1))  # número já usado na agência
+    assert repo.buscar_cliente_por_cpf("98765432100") is None
+
+
+def test_extrato_pages_backwards(tmp_path):
+    repo = SQLiteRepository(tmp_path / "banco.db")
+    conta = _nova_conta(repo)
+    for valor in range(1, 8):
+        _operar(repo, conta, bank.Deposito(float(valor)))
+
+    pagina = repo.extrato(1, limite=3)
+    assert [float(l.valor) for l in pagina] == [5.0, 6.0, 7.0]
+    anterior = repo.extrato(1, limite=3, antes_de=pagina[0].id)
+    assert [float(l.valor) for l in anterior] == [2.0, 3.0, 4.0]
+    assert [float(l.valor) for l in repo.extrato(1, limite=3, antes_de=anterior[0].id)] == [1.0]
+    assert pagina[-1].descricao == conta.historico.transacoes[-1]
+
+
+def test_opens_existing_database(tmp_path):
+    caminho = tmp_path / "fesisbank_users.db"
+    shutil.copy(os.path.join(ROOT, repo_mod.DB_FILE), caminho)
+
+    repo = SQLiteRepository(caminho)
+    assert repo._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    cliente = repo.buscar_cliente_por_login("123")
+    assert cliente.nome == "fe"
+    assert [c.numero for c in cliente.contas] == [2]
+    assert repo.saldo(2) == bank.Dinheiro(0)
+    repo.fechar()
+    # migrar de novo é idempotente
+    SQLiteRepository(caminho).fechar()
+
+
+@pytest.mark.parametrize("sql, parametros", [
+    (repo_mod.SQL_USUARIO_POR_CPF, ("1",)),
+    (repo_mod.SQL_USUARIO_POR_LOGIN, ("f",)),
+    (repo_mod.SQL_CONTAS_DO_USUARIO, ("f",)),
+    (repo_mod.SQL_SALDO, ("0001", 1)),
+    (repo_mod.SQL_ATUALIZAR_SALDO, {"delta": 100, "saque": False, "valor": 100, "dia": 1, "agencia": "0001", "numero": 1}),
+    (repo_mod.SQL_EXTRATO, ("0001", 1, 10, 50)),
+    (repo_mod.SQL_HISTORICO, (1,)),
+])
+def test_queries_use_indexes(tmp_path, sql, parametros):
+    repo = SQLiteRepository(tmp_path / "banco.db")
+    plano = [linha[3] for linha in repo._conn.execute("EXPLAIN QUERY PLAN " + sql, parametros)]
+    assert plano
+    for passo in plano:
+        assert not passo.startswith("SCAN"), plano
+
+
+def test_fresh_database_matches_legacy_schema(tmp_path):
+    SQLiteRepository(tmp_path / "banco.db").fechar()
+    conn = sqlite3.connect(str(tmp_path / "banco.db"))
+    colunas = [linha[1] for linha in conn.execute("PRAGMA table_info(contas)")]
+    assert colunas == ["id", "agencia", "numero_conta", "usuario_login", "saldo_centavos", "limite_centavos",
+                       "limite_saques", "dia_saques", "saques_no_dia"]
@@ -3,6 +3,7 @@
 Este módulo fornece funções para:
 - limpar um número de cartão
 - verificar o dígito verificador pelo algoritmo de Luhn
+- verificar grandes lotes de números de uma vez (``luhn_check_batch``, requer NumPy)
 - identificar a bandeira (Visa, MasterCard, American Express, Discover, etc.)
 
 Saída: para cada número informado, mostra a bandeira detectada e se o
@@ -12,25 +13,65 @@ Uso:
   python identificador_bandeira_cartao.py 4111111111111111 378282246310005
 
 Se executado sem argumentos, entra em modo interativo (prompt).
+
+Arquivos grandes (um número por linha) podem ser processados em streaming,
+com memória constante, gerando CSV ou JSONL:
+  python identificador_bandeira_cartao.py --input cartoes.txt --output saida.csv
+  cat cartoes.txt | python identificador_bandeira_cartao.py --input - --format jsonl
+  python identificador_bandeira_cartao.py --input cartoes.txt --output saida.csv --workers 4
 """
 from __future__ import annotations
 
 import argparse
+import csv
+import json
+import mmap
+import os
 import re
-from typing import Optional, Tuple
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
+from itertools import islice
+from typing import IO, Container, Deque, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+try:  # NumPy é opcional: só é necessário para a validação em lote.
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+
+# Tabela para ``str.translate`` que apaga todo caractere ASCII que não é dígito.
+_ASCII_NON_DIGITS = {c: None for c in range(128) if not chr(c).isdigit()}
+_NON_DIGIT_RE = re.compile(r"\D")
 
 
 def _clean(number: str) -> str:
-    """Remove tudo que não for dígito."""
-    return re.sub(r"\D", "", number or "")
+    """Remove tudo que não for dígito.
+
+    Números já limpos são devolvidos sem cópia; texto ASCII usa
+    ``str.translate`` e só entradas com outros caracteres Unicode caem na
+    expressão regular.
+    """
+    if not number:
+        return ""
+    if number.isdecimal():
+        return number
+    if number.isascii():
+        return number.translate(_ASCII_NON_DIGITS)
+    return _NON_DIGIT_RE.sub("", number)
 
 
-def luhn_check(number: str) -> bool:
+def luhn_check(number: str, *, cleaned: bool = False) -> bool:
     """Retorna True se o número passar no algoritmo de Luhn.
 
-    O número deve ser apenas dígitos.
+    Espaços, hífens e outros separadores são ignorados. Use ``cleaned=True``
+    quando ``number`` já tiver passado por ``_clean`` para não limpar de novo.
     """
-    n = _clean(number)
+    n = number if cleaned else _clean(number)
     if not n:
         return False
     total = 0
@@ -45,78 +86,729 @@ def luhn_check(number: str) -> bool:
     return total % 10 == 0
 
 
-def detect_brand(number: str) -> Optional[str]:
-    """Detecta a bandeira a partir do número limpo (apenas dígitos).
+# Tabela do dígito dobrado no Luhn: d -> 2d (ou 2d - 9 quando passa de 9).
+_LUHN_DOBRO = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
 
-    Retorna o nome da bandeira ou None se não for possível identificar.
+
+def luhn_check_batch(numbers: Iterable, *, cleaned: bool = False) -> "np.ndarray":
+    """Versão vetorizada de ``luhn_check`` para muitos números de uma vez.
+
+    Aceita uma lista (ou array NumPy) de números, com ou sem espaços e
+    hífens, e retorna um array booleano na mesma ordem. As respostas são
+    idênticas às de ``luhn_check`` aplicada a cada item.
+
+    Os números já limpos são agrupados por comprimento; cada grupo vira uma
+    matriz ``uint8`` de dígitos e os dígitos dobrados são resolvidos por uma
+    tabela de consulta, sem laço Python por dígito. Itens com caracteres não
+    numéricos (raros) passam por ``_clean`` antes de entrar no lote; com
+    ``cleaned=True`` (itens já limpos) eles não são limpos de novo.
     """
-    n = _clean(number)
-    ln = len(n)
-    if not n:
-        return None
+    if np is None:
+        raise ImportError("luhn_check_batch requer NumPy (pip install numpy)")
 
-    # Visa
-    if n.startswith("4") and ln in (13, 16, 19):
-        return "Visa"
+    if isinstance(numbers, np.ndarray) and numbers.dtype.kind in "SU":
+        arr = numbers.reshape(-1)
+    else:
+        items = numbers.tolist() if isinstance(numbers, np.ndarray) else numbers
+        if not isinstance(items, (list, tuple)):
+            items = list(items)
+        # Inteiros viram texto; None vira b"None", sem dígitos, como no escalar.
+        try:
+            arr = np.array(items, dtype="S")
+        except UnicodeEncodeError:
+            arr = np.array(items, dtype=str)
+    if arr.dtype.kind == "U":
+        try:
+            arr = arr.astype("S")
+        except UnicodeEncodeError:
+            # Itens fora do ASCII (raros) seguem pelo caminho escalar.
+            items = arr.tolist()
+            ascii_rows = np.array([x.isascii() for x in items], dtype=bool)
+            result = np.array([x.isascii() or luhn_check(x) for x in items], dtype=bool)
+            result[ascii_rows] = luhn_check_batch(arr[ascii_rows])
+            return result
+
+    size, width = arr.shape[0], arr.itemsize
+    result = np.zeros(size, dtype=bool)
+    if size == 0 or width == 0:
+        return result
+
+    digits = arr.view(np.uint8).reshape(size, width) - np.uint8(ord("0"))
+    is_digit = digits <= 9
+    lengths = np.char.str_len(arr)
+    # Um item está limpo quando seus dígitos ocupam exatamente o início da linha
+    # (o resto é o preenchimento com zeros do dtype "S"): o primeiro não dígito
+    # fica logo após o texto, ou a linha inteira é de dígitos.
+    first = is_digit.argmin(axis=1)
+    clean = (first == lengths) | (is_digit[:, 0] & (first == 0))
+    if not clean.all():
+        dirty = np.flatnonzero(~clean)
+        items = [x.decode("ascii") for x in arr[dirty].tolist()]
+        if cleaned:
+            # Só sobra o que _clean não remove (ex.: dígitos não ASCII).
+            result[dirty] = [luhn_check(x, cleaned=True) for x in items]
+        else:
+            result[dirty] = luhn_check_batch([_clean(x) for x in items], cleaned=True)
+        lengths = np.where(clean, lengths, 0)
+
+    table = np.array(_LUHN_DOBRO, dtype=np.uint8)
+    for length in np.flatnonzero(np.bincount(lengths)).tolist():
+        if length == 0:
+            continue
+        rows = np.flatnonzero(lengths == length)
+        if rows.size == size:
+            block = digits[:, :length].copy()
+        else:
+            block = digits[rows, :length]
+        # Posições dobradas: a 2ª, 4ª, ... contando da direita.
+        doubled = slice(length - 2, None, -2) if length > 1 else slice(0, 0)
+        block[:, doubled] = table[block[:, doubled]]
+        acc = np.uint16 if 9 * length < 2 ** 16 else np.int64
+        result[rows] = block.sum(axis=1, dtype=acc) % 10 == 0
+    return result
+
+
+# Largura máxima, em dígitos, de um BIN: intervalos e números são comparados
+# pelos 8 primeiros dígitos (na BinTable, completando com 0 no início e 9 no fim).
+_BIN_WIDTH = 8
+
+
+def _range_prefixes(start: str, end: str) -> List[str]:
+    """Decompõe o intervalo de BINs [start, end] no menor conjunto de prefixos.
+
+    ``start`` e ``end`` devem ter o mesmo número de dígitos (até 8). Ex.: 2221-2720
+    vira 2221..2229, 223..229, 23..26, 270, 271 e 2720.
+    """
+    if len(start) != len(end) or len(start) > _BIN_WIDTH or not (start + end).isdigit():
+        raise ValueError(f"intervalo de BIN inválido: {start}-{end}")
+    width, lo, hi = len(start), int(start), int(end)
+    if lo > hi:
+        raise ValueError(f"intervalo de BIN inválido: {start}-{end}")
+    prefixes = []
+    while lo <= hi:
+        k = 0  # quantidade de dígitos finais livres
+        while k < width and lo % 10 ** (k + 1) == 0 and lo + 10 ** (k + 1) - 1 <= hi:
+            k += 1
+        prefixes.append(str(lo).zfill(width)[: width - k])
+        lo += 10 ** k
+    return prefixes
+
+
+class BinIndex:
+    """Índice de BINs em trie de dígitos para identificar bandeiras.
+
+    Cada intervalo registrado é decomposto em prefixos e gravado nos nós da
+    trie. A consulta percorre apenas os dígitos do próprio número, então o
+    custo é O(tamanho do prefixo) independente de quantos intervalos existam.
+
+    Entre as regras que casam com o número (prefixo e comprimento), vence a de
+    menor ``priority``; em empate, vence o prefixo mais longo.
+    """
+
+    def __init__(self) -> None:
+        # Nó: (filhos por dígito, regras ordenadas por prioridade).
+        self._root: Tuple[dict, list] = ({}, [])
+        self._depth = 0
+
+    def add_range(
+        self,
+        start: str,
+        end: str,
+        brand: str,
+        lengths: Optional[Container[int]] = None,
+        priority: int = 0,
+    ) -> None:
+        """Registra o intervalo [start, end] de prefixos para ``brand``.
+
+        ``lengths`` limita os comprimentos de número aceitos (None = qualquer).
+        """
+        rule = (priority, lengths, brand)
+        for prefix in _range_prefixes(start, end):
+            node = self._root
+            for ch in prefix:
+                node = node[0].setdefault(ch, ({}, []))
+            node[1].append(rule)
+            node[1].sort(key=lambda r: r[0])
+            self._depth = max(self._depth, len(prefix))
+
+    def lookup(self, number: str) -> Optional[str]:
+        """Retorna a bandeira para um número já limpo, ou None."""
+        ln = len(number)
+        best = None
+        node = self._root
+        i = 0
+        while True:
+            for priority, lengths, brand in node[1]:
+                if lengths is None or ln in lengths:
+                    if best is None or priority <= best[0]:
+                        best = (priority, brand)
+                    break
+            if i >= ln or i >= self._depth:
+                break
+            node = node[0].get(number[i])
+            if node is None:
+                break
+            i += 1
+        return best[1] if best else None
 
+
+# Regras de bandeira: (início, fim, comprimentos aceitos, bandeira).
+# A posição na tabela define a precedência (primeiras vencem).
+_BRAND_RULES = (
+    # Elo - usa muitos BINs; aqui verificamos alguns prefixos comuns. Vem antes
+    # da Visa para que BINs Elo iniciados em 4 não sejam lidos como Visa.
+    *((p, p, None, "Elo") for p in (
+        "4011", "4312", "4389", "4514", "4576", "5067", "506699", "5090",
+        "6277", "6362", "6363", "5041",
+    )),
+    # Visa
+    ("4", "4", frozenset((13, 16, 19)), "Visa"),
     # MasterCard (51-55) e (2221-2720)
-    if ln == 16:
+    ("51", "55", frozenset((16,)), "MasterCard"),
+    ("2221", "2720", frozenset((16,)), "MasterCard"),
+    # American Express
+    ("34", "34", frozenset((15,)), "American Express"),
+    ("37", "37", frozenset((15,)), "American Express"),
+    # Discover (6011, 622126-622925, 644-649, 65)
+    ("6011", "6011", frozenset((16, 19)), "Discover"),
+    ("65", "65", frozenset((16, 19)), "Discover"),
+    ("644", "649", frozenset((16, 19)), "Discover"),
+    ("622126", "622925", frozenset((16, 19)), "Discover"),
+    # JCB (3528-3589)
+    ("3528", "3589", range(16, 20), "JCB"),
+    # Diners Club (300-305, 36)
+    ("36", "36", frozenset((14,)), "Diners Club"),
+    ("300", "305", frozenset((14,)), "Diners Club"),
+    # Hipercard (prefixos variados; heurística simples)
+    ("38", "38", range(13, sys.maxsize), "Hipercard"),
+    ("60", "60", range(13, sys.maxsize), "Hipercard"),
+)
+
+
+def _build_brand_index() -> BinIndex:
+    index = BinIndex()
+    for priority, (start, end, lengths, brand) in enumerate(_BRAND_RULES):
+        index.add_range(start, end, brand, lengths, priority)
+    return index
+
+
+_DEFAULT_BRAND_INDEX = _BRAND_INDEX = _build_brand_index()
+
+
+class BinRule(NamedTuple):
+    """Linha de uma tabela de BINs (ver ``read_bin_rules``)."""
+
+    start: str
+    end: str
+    brand: str
+    lengths: Optional[FrozenSet[int]] = None
+    priority: int = 0
+
+
+_ANY_LENGTH = 0xFFFFFFFF
+_CACHE_MAGIC = b"BINTAB02"
+# magic, tamanho e mtime da origem, tamanho total do cache e as contagens
+_CACHE_HEADER = struct.Struct("<8sQQQIIII")
+_CACHE_SUFFIX = ".bincache"
+
+
+class BinTable:
+    """Tabela de BINs imutável, compilada em segmentos ordenados.
+
+    Os intervalos são fatiados em segmentos disjuntos; cada segmento guarda
+    as regras que o cobrem já ordenadas por precedência (menor ``priority``
+    e, em empate, o intervalo mais estreito). A consulta é um ``bisect`` nos
+    inícios dos segmentos, O(log n), seguido das poucas regras do segmento.
+
+    Todos os dados ficam em arrays de inteiros de 32 bits, o que permite
+    gravá-los num cache binário e reabri-los via ``mmap`` sem recompilar.
+    """
+
+    __slots__ = ("_starts", "_offsets", "_members", "_masks", "_rule_brands", "_brands", "_buffer")
+
+    def __init__(self, starts, offsets, members, masks, rule_brands, brands, buffer=None) -> None:
+        self._starts = starts
+        self._offsets = offsets
+        self._members = members
+        self._masks = masks
+        self._rule_brands = rule_brands
+        self._brands = tuple(brands)
+        self._buffer = buffer  # mantém o mmap do cache aberto
+
+    def __len__(self) -> int:
+        return len(self._masks)
+
+    @classmethod
+    def from_rules(cls, rules: Iterable[BinRule]) -> "BinTable":
+        """Compila as regras numa tabela de segmentos."""
+        brands: List[str] = []
+        brand_ids: dict = {}
+        masks = array("I")
+        rule_brands = array("I")
+        order = []
+        opens: dict = {}
+        closes: dict = {}
+        limit = 10 ** _BIN_WIDTH
+        for i, rule in enumerate(rules):
+            lo, hi = _bin_bounds(rule.start, rule.end)
+            if rule.brand not in brand_ids:
+                brand_ids[rule.brand] = len(brands)
+                brands.append(rule.brand)
+            masks.append(_lengths_mask(rule.lengths))
+            rule_brands.append(brand_ids[rule.brand])
+            order.append((rule.priority, hi - lo, i))
+            opens.setdefault(lo, []).append(i)
+            if hi + 1 < limit:
+                closes.setdefault(hi + 1, []).append(i)
+
+        starts, offsets, members = array("I"), array("I"), array("I")
+        active: set = set()
+        previous = None
+        for point in sorted({0, *opens, *closes}):
+            active.difference_update(closes.get(point, ()))
+            active.update(opens.get(point, ()))
+            current = sorted(active, key=order.__getitem__)
+            if current == previous:
+                continue  # mesmo conjunto de regras: estende o segmento anterior
+            starts.append(point)
+            offsets.append(len(members))
+            members.extend(current)
+            previous = current
+        offsets.append(len(members))
+        return cls(starts, offsets, members, masks, rule_brands, brands)
+
+    def lookup(self, number: str) -> Optional[str]:
+        """Retorna a bandeira para um número já limpo, ou None."""
+        ln = len(number)
+        key = int(number[:_BIN_WIDTH].ljust(_BIN_WIDTH, "0"))
+        i = bisect_right(self._starts, key) - 1
+        bit = 1 << ln if ln < 32 else 0
+        masks, members = self._masks, self._members
+        for j in range(self._offsets[i], self._offsets[i + 1]):
+            rule = members[j]
+            if masks[rule] & bit or masks[rule] == _ANY_LENGTH:
+                return self._brands[self._rule_brands[rule]]
+        return None
+
+    def save(self, path: str, source_stat: Optional[os.stat_result] = None) -> None:
+        """Grava a tabela compilada em ``path`` (escrita atômica)."""
+        brands = json.dumps(self._brands, ensure_ascii=False).encode("utf-8")
+        counts = (len(self._starts), len(self._members), len(self._masks), len(brands))
+        header = _CACHE_HEADER.pack(
+            _CACHE_MAGIC,
+            source_stat.st_size if source_stat else 0,
+            source_stat.st_mtime_ns if source_stat else 0,
+            _cache_size(*counts),
+            *counts,
+        )
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(header)
+            for values in (self._starts, self._offsets, self._members, self._masks, self._rule_brands):
+                f.write(array("I", values).tobytes())
+            f.write(brands)
+        os.replace(tmp, path)
+
+    @classmethod
+    def open_cache(cls, path: str, source_stat: Optional[os.stat_result] = None) -> "BinTable":
+        """Abre um cache gravado por ``save`` via ``mmap``, sem copiar os arrays.
+
+        Levanta ValueError se o cache for inválido ou não corresponder ao
+        arquivo de origem descrito por ``source_stat``.
+        """
+        if sys.byteorder != "little" or array("I").itemsize != 4:
+            raise ValueError("cache binário não suportado nesta plataforma")
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        views: List[memoryview] = []
         try:
-            first2 = int(n[:2])
-            first4 = int(n[:4])
-        except ValueError:
-            first2 = first4 = -1
-        if 51 <= first2 <= 55 or 2221 <= first4 <= 2720:
-            return "MasterCard"
+            magic, size, mtime, total, n_seg, n_members, n_rules, n_brands = _CACHE_HEADER.unpack_from(buffer)
+            if magic != _CACHE_MAGIC:
+                raise ValueError("cache de BINs com formato desconhecido")
+            if source_stat and (size, mtime) != (source_stat.st_size, source_stat.st_mtime_ns):
+                raise ValueError("cache de BINs desatualizado")
+            # Um cache truncado (ou com lixo no fim) não bate com o tamanho gravado
+            if len(buffer) != total or total != _cache_size(n_seg, n_members, n_rules, n_brands):
+                raise ValueError("cache de BINs truncado")
+            views.append(memoryview(buffer))
+            pos = _CACHE_HEADER.size
+            for count in (n_seg, n_seg + 1, n_members, n_rules, n_rules):
+                views.append(views[0][pos:pos + 4 * count].cast("I"))
+                pos += 4 * count
+            brands = json.loads(bytes(views[0][pos:pos + n_brands]).decode("utf-8"))
+        except (struct.error, TypeError, ValueError):
+            # O mmap só fecha depois que nenhuma view aponta para ele
+            for view in reversed(views):
+                view.release()
+            buffer.close()
+            raise ValueError(f"cache de BINs inválido: {path}")
+        return cls(*views[1:], brands, buffer=buffer)
 
-    # American Express
-    if ln == 15 and n.startswith(("34", "37")):
-        return "American Express"
 
-    # Discover (6011, 622126-622925, 644-649, 65)
-    if ln in (16, 19):
-        if n.startswith("6011") or n.startswith("65") or (len(n) >= 3 and 644 <= int(n[:3]) <= 649):
-            return "Discover"
-        if len(n) >= 6 and 622126 <= int(n[:6]) <= 622925:
-            return "Discover"
+def _cache_size(n_seg: int, n_members: int, n_rules: int, n_brands: int) -> int:
+    """Tamanho em bytes de um cache gravado por ``BinTable.save``."""
+    return _CACHE_HEADER.size + 4 * (n_seg + (n_seg + 1) + n_members + 2 * n_rules) + n_brands
 
-    # JCB (3528-3589)
-    if 16 <= ln <= 19 and len(n) >= 4 and 3528 <= int(n[:4]) <= 3589:
-        return "JCB"
 
-    # Diners Club (300-305, 36, 38, 39)
-    if ln == 14 and (n.startswith("36") or (len(n) >= 3 and 300 <= int(n[:3]) <= 305)):
-        return "Diners Club"
+def _bin_bounds(start: str, end: str) -> Tuple[int, int]:
+    """Converte um intervalo de BINs nas chaves de ``_BIN_WIDTH`` dígitos."""
+    start, end = str(start).strip(), str(end).strip()
+    if not (start.isdigit() and end.isdigit()) or max(len(start), len(end)) > _BIN_WIDTH:
+        raise ValueError(f"intervalo de BIN inválido: {start}-{end}")
+    lo = int(start.ljust(_BIN_WIDTH, "0"))
+    hi = int(end.ljust(_BIN_WIDTH, "9"))
+    if lo > hi:
+        raise ValueError(f"intervalo de BIN inválido: {start}-{end}")
+    return lo, hi
 
-    # Elo - usa muitos BINs; aqui verificamos alguns prefixos comuns.
-    elo_prefixes = ("4011", "4312", "4389", "4514", "4576", "5067", "506699", "5090", "6277", "6362", "6363", "5041")
-    if any(n.startswith(p) for p in elo_prefixes):
-        return "Elo"
 
-    # Hipercard (prefixos variados; heurística simples)
-    if ln >= 13 and (n.startswith("38") or n.startswith("60")):
-        return "Hipercard"
+def _lengths_mask(lengths: Optional[Container[int]]) -> int:
+    """Bitmask dos comprimentos aceitos (todos os bits = qualquer comprimento)."""
+    if lengths is None:
+        return _ANY_LENGTH
+    mask = 0
+    for n in lengths:
+        if not 0 < n < 32:
+            raise ValueError(f"comprimento de cartão inválido: {n}")
+        mask |= 1 << n
+    return mask
+
+
+def _parse_lengths(value) -> Optional[FrozenSet[int]]:
+    """Interpreta a coluna ``lengths``: vazio, 16, "16;19", "13-19" ou lista."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, int):
+        return frozenset((value,))
+    if isinstance(value, (list, tuple)):
+        return frozenset(int(v) for v in value)
+    lengths = set()
+    for part in re.split(r"[;|\s]+", str(value).strip()):
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            lengths.update(range(int(lo), int(hi) + 1))
+        elif part:
+            lengths.add(int(part))
+    return frozenset(lengths)
 
-    return None
 
+def read_bin_rules(path: str) -> Iterator[BinRule]:
+    """Lê uma tabela de BINs em CSV ou JSON.
 
-def format_result(number: str) -> Tuple[str, str, bool]:
-    """Retorna (clean_number, brand_or_msg, luhn_ok)."""
+    Colunas/chaves: ``start``, ``end``, ``brand``, ``lengths`` (opcional;
+    ex.: ``16``, ``16;19`` ou ``13-19``) e ``priority`` (opcional, menor vence).
+    O JSON deve ser uma lista de objetos com essas chaves.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".json"):
+            rows = json.load(f)
+        else:
+            rows = csv.DictReader(f)
+        for row in rows:
+            yield BinRule(
+                str(row["start"]).strip(),
+                str(row.get("end") or row["start"]).strip(),
+                str(row["brand"]).strip(),
+                _parse_lengths(row.get("lengths")),
+                int(row.get("priority") or 0),
+            )
+
+
+def load_bin_table(path: str, *, cache: bool = True) -> BinTable:
+    """Carrega e compila uma tabela de BINs (CSV ou JSON).
+
+    Com ``cache=True`` a tabela compilada é gravada ao lado do arquivo
+    (``<path>.bincache``) e reaberta via ``mmap`` nas próximas cargas,
+    enquanto o arquivo de origem não mudar.
+    """
+    cache_path = path + _CACHE_SUFFIX
+    source_stat = os.stat(path)
+    if cache:
+        try:
+            return BinTable.open_cache(cache_path, source_stat)
+        except (OSError, ValueError):
+            pass
+    table = BinTable.from_rules(read_bin_rules(path))
+    if cache:
+        try:
+            table.save(cache_path, source_stat)
+        except OSError:
+            pass  # diretório somente leitura: segue sem cache
+    return table
+
+
+def set_brand_index(index) -> None:
+    """Troca o índice usado por ``detect_brand`` (``BinIndex`` ou ``BinTable``)."""
+    global _BRAND_INDEX
+    _BRAND_INDEX = index
+    _BRAND_CACHE.clear()
+
+
+def use_bin_table(path: Optional[str]) -> None:
+    """Passa a identificar bandeiras pela tabela de BINs em ``path``.
+
+    Com ``path`` vazio, volta às regras embutidas (``_BRAND_RULES``).
+    """
+    set_brand_index(load_bin_table(path) if path else _DEFAULT_BRAND_INDEX)
+
+
+class _BrandCache:
+    """Cache LRU de bandeiras por (BIN, comprimento).
+
+    A chave usa só os 8 primeiros dígitos e o comprimento do número, o que
+    basta para definir a bandeira; o número completo nunca é guardado.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._data: "OrderedDict[Tuple[str, int], Optional[str]]" = OrderedDict()
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+
+    def lookup(self, index, number: str) -> Optional[str]:
+        key = (number[:_BIN_WIDTH], len(number))
+        data = self._data
+        try:
+            brand = data[key]
+        except KeyError:
+            self.misses += 1
+            brand = index.lookup(number)
+            if self.maxsize > 0:
+                data[key] = brand
+                if len(data) > self.maxsize:
+                    data.popitem(last=False)
+                    self.evictions += 1
+            return brand
+        self.hits += 1
+        data.move_to_end(key)
+        return brand
+
+    def resize(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        while len(self._data) > max(maxsize, 0):
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+DEFAULT_BRAND_CACHE_SIZE = 4096
+_BRAND_CACHE = _BrandCache(DEFAULT_BRAND_CACHE_SIZE)
+
+
+def configure_brand_cache(maxsize: int) -> None:
+    """Define quantos pares (BIN, comprimento) o cache de bandeiras guarda.
+
+    ``maxsize=0`` desliga o cache. Entradas excedentes são descartadas na
+    hora (e contadas como despejos).
+    """
+    if maxsize < 0:
+        raise ValueError("o tamanho do cache não pode ser negativo")
+    _BRAND_CACHE.resize(maxsize)
+
+
+def brand_cache_stats() -> dict:
+    """Contadores do cache de bandeiras, para exportar como métricas.
+
+    Retorna ``hits``, ``misses``, ``evictions``, ``size`` e ``maxsize``.
+    """
+    c = _BRAND_CACHE
+    return {"hits": c.hits, "misses": c.misses, "evictions": c.evictions,
+            "size": len(c._data), "maxsize": c.maxsize}
+
+
+def reset_brand_cache_stats() -> None:
+    """Esvazia o cache de bandeiras e zera os contadores."""
+    _BRAND_CACHE.clear()
+    _BRAND_CACHE.hits = _BRAND_CACHE.misses = _BRAND_CACHE.evictions = 0
+
+
+def detect_brand(number: str, *, cleaned: bool = False) -> Optional[str]:
+    """Detecta a bandeira a partir do número limpo (apenas dígitos).
+
+    Retorna o nome da bandeira ou None se não for possível identificar.
+    A consulta usa o índice pré-compilado ``_BRAND_INDEX`` (as regras
+    embutidas ou a tabela carregada por ``use_bin_table``), com um cache LRU
+    por (BIN, comprimento) na frente (ver ``brand_cache_stats``). Use
+    ``cleaned=True`` quando ``number`` já tiver passado por ``_clean``.
+    """
+    n = number if cleaned else _clean(number)
+    if not n:
+        return None
+    return _BRAND_CACHE.lookup(_BRAND_INDEX, n)
+
+
+Result = Tuple[str, str, bool]
+
+# Colunas da saída CSV/JSONL, na ordem de ``format_result``.
+OUTPUT_FIELDS = ("number", "brand", "luhn_ok")
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def format_result(number: str) -> Result:
+    """Retorna (clean_number, brand_or_msg, luhn_ok).
+
+    O número é limpo uma única vez e repassado já limpo às verificações.
+    """
     clean = _clean(number)
-    brand = detect_brand(clean) or "Bandeira não identificada"
-    luhn_ok = luhn_check(clean)
+    brand = detect_brand(clean, cleaned=True) or "Bandeira não identificada"
+    luhn_ok = luhn_check(clean, cleaned=True)
     return clean, brand, luhn_ok
 
 
-def _parse_args() -> argparse.Namespace:
+def read_numbers(stream: IO[str]) -> Iterator[str]:
+    """Lê números de cartão, um por linha, ignorando linhas vazias."""
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def _chunked(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Agrupa ``items`` em listas de até ``size`` elementos."""
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _init_worker(bin_table: Optional[str], brand_cache_size: int) -> None:
+    """Prepara um processo worker com a mesma configuração do processo pai."""
+    configure_brand_cache(brand_cache_size)
+    use_bin_table(bin_table)
+
+
+# A partir deste tamanho o Luhn do lote compensa o custo fixo do NumPy.
+MIN_VECTOR_BATCH = 16
+
+
+def format_results(numbers: List[str]) -> List[Result]:
+    """Aplica ``format_result`` a um lote (caminho usado pelos workers e pelo servidor).
+
+    Cada número é limpo uma vez; com NumPy e lotes de ``MIN_VECTOR_BATCH``
+    ou mais, o Luhn de todos sai de uma chamada a ``luhn_check_batch`` e a
+    bandeira vem de ``detect_brand`` (com o cache por BIN).
+    """
+    if np is None or len(numbers) < MIN_VECTOR_BATCH:
+        return [format_result(s) for s in numbers]
+    cleans = [_clean(s) for s in numbers]
+    brands = [detect_brand(c, cleaned=True) or "Bandeira não identificada" for c in cleans]
+    return list(zip(cleans, brands, luhn_check_batch(cleans, cleaned=True).tolist()))
+
+
+def iter_results(
+    numbers: Iterable[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+    bin_table: Optional[str] = None,
+) -> Iterator[List[Result]]:
+    """Aplica ``format_result`` a ``numbers`` em lotes de ``chunk_size``.
+
+    Só alguns lotes ficam em memória por vez, então o consumo é constante
+    mesmo para arquivos com milhões de linhas.
+
+    Com ``workers > 1`` os lotes são processados em paralelo num
+    ``ProcessPoolExecutor``. A ordem de saída é a mesma da entrada e no máximo
+    ``2 * workers`` lotes ficam pendentes, para que a leitura não se adiante
+    demais em relação aos workers. ``bin_table`` é carregada em cada worker
+    (ver ``use_bin_table``), que também herda o tamanho do cache de
+    bandeiras; no processo atual vale o índice já ativo.
+    """
+    chunks = _chunked(numbers, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield format_results(chunk)
+        return
+
+    max_pending = 2 * workers
+    init_args = (bin_table, _BRAND_CACHE.maxsize)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+        pending: Deque[Future] = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(format_results, chunk))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_results(batches: Iterable[List[Result]], out: IO[str], fmt: str = "csv") -> int:
+    """Grava os lotes em ``out`` como CSV ou JSONL; retorna o total de linhas."""
+    total = 0
+    if fmt == "csv":
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(OUTPUT_FIELDS)
+        for batch in batches:
+            writer.writerows(batch)
+            total += len(batch)
+    elif fmt == "jsonl":
+        for batch in batches:
+            out.writelines(
+                json.dumps(dict(zip(OUTPUT_FIELDS, r)), ensure_ascii=False) + "\n" for r in batch
+            )
+            total += len(batch)
+    else:
+        raise ValueError(f"formato de saída desconhecido: {fmt}")
+    return total
+
+
+@contextmanager
+def _open_stream(path: str, mode: str) -> Iterator[IO[str]]:
+    """Abre ``path`` ou usa stdin/stdout quando ``path`` é "-"."""
+    if path == "-":
+        yield sys.stdin if "r" in mode else sys.stdout
+    else:
+        with open(path, mode, encoding="utf-8", newline="") as f:
+            yield f
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Identificador de bandeira de cartão + verificação Luhn")
-    p.add_argument("numbers", nargs="*", help="Números de cartão a analisar (pode conter espaços ou hífens). Se vazio, entra em modo interativo.")
-    return p.parse_args()
+    p.add_argument("numbers", nargs="*",
+                   help="Números de cartão a analisar (pode conter espaços ou hífens). "
+                        "Se vazio, entra em modo interativo.")
+    p.add_argument("--input", metavar="ARQUIVO",
+                   help="Lê um número por linha do arquivo (ou '-' para stdin) em modo streaming.")
+    p.add_argument("--output", metavar="ARQUIVO",
+                   help="Grava o resultado em CSV/JSONL no arquivo (ou '-' para stdout).")
+    p.add_argument("--format", choices=("csv", "jsonl"), default="csv",
+                   help="Formato da saída em modo streaming (padrão: csv).")
+    p.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                   help="Números processados por lote em modo streaming.")
+    p.add_argument("--workers", type=int, default=1, help="Processos usados em modo streaming (padrão: 1).")
+    p.add_argument("--bin-table", metavar="ARQUIVO", default=os.environ.get("BIN_TABLE"),
+                   help="Tabela de BINs em CSV/JSON (start,end,brand,lengths,priority) usada no lugar "
+                        "das regras embutidas. Padrão: variável BIN_TABLE.")
+    p.add_argument("--brand-cache-size", type=int, default=DEFAULT_BRAND_CACHE_SIZE,
+                   help="Pares (BIN, comprimento) mantidos no cache de bandeiras; 0 desliga.")
+    args = p.parse_args(argv)
+    if args.brand_cache_size < 0:
+        p.error("--brand-cache-size não pode ser negativo")
+    if args.chunk_size < 1:
+        p.error("--chunk-size deve ser maior que zero")
+    if args.workers < 1:
+        p.error("--workers deve ser maior que zero")
+    return args
 
 
-def main():
-    args = _parse_args()
-    if not args.numbers:
+def main(argv: Optional[List[str]] = None):
+    args = _parse_args(argv)
+    configure_brand_cache(args.brand_cache_size)
+    if args.bin_table:
+        use_bin_table(args.bin_table)
+    if args.input or args.output:
+        # Modo streaming: ler -> limpar -> bandeira -> Luhn -> gravar, em lotes.
+        with ExitStack() as stack:
+            if args.input:
+                numbers = read_numbers(stack.enter_context(_open_stream(args.input, "r")))
+            else:
+                numbers = iter(args.numbers)
+            out = stack.enter_context(_open_stream(args.output or "-", "w"))
+            results = iter_results(numbers, args.chunk_size, args.workers, args.bin_table)
+            write_results(results, out, args.format)
+    elif not args.numbers:
         # Modo interativo
         print("--- Identificador de Bandeira de Cartão de Crédito ---")
         print("Pressione Enter em vazio para sair.")
@@ -137,4 +829,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,246 @@
+"""Serviço de validação de cartões sobre asyncio.
+
+Mantém o validador carregado num processo de longa duração e responde por
+TCP ou socket Unix, evitando iniciar um Python a cada chamada em pipelines
+de shell.
+
+Protocolo (texto UTF-8, uma mensagem por linha):
+  -> 4111 1111 1111 1111
+  <- {"number": "4111111111111111", "brand": "Visa", "luhn_ok": true}
+  -> !stats
+  <- {"requests": 1, "batches": 1, "avg_batch": 1.0, "p50_ms": 0.04, "p99_ms": 0.04}
+
+As respostas seguem a ordem dos pedidos de cada conexão, então o cliente
+pode enviar vários pedidos sem esperar as respostas (pipelining). Pedidos
+que chegam juntos, de uma ou várias conexões, são agrupados em micro-lotes
+e validados por ``format_results``, que passa o Luhn do lote inteiro por
+``luhn_check_batch``.
+
+Uso:
+  python servidor_validacao.py --port 8765
+  python servidor_validacao.py --unix /tmp/validador.sock
+  printf '4111111111111111\\n!stats\\n' | nc -q1 127.0.0.1 8765
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Deque, List, Optional, Tuple, Union
+
+import identificador_bandeira_cartao as validador
+
+STATS_COMMAND = "!stats"
+DEFAULT_MAX_BATCH = 512
+DEFAULT_MAX_DELAY = 0.0005  # segundos de espera para completar um micro-lote
+# Bytes de respostas no buffer de escrita a partir dos quais esperamos o cliente ler
+WRITE_HIGH_WATER = 64 * 1024
+
+
+class ValidationServer:
+    """Servidor asyncio que responde pedidos com a semântica de ``format_result``.
+
+    Um único laço de micro-lotes consome a fila de pedidos de todas as
+    conexões: junta o que já chegou (até ``max_batch``), espera no máximo
+    ``max_delay`` segundos por mais pedidos quando o lote está pequeno e
+    valida tudo numa chamada. As latências (da chegada do pedido até o
+    resultado) das últimas ``latency_window`` requisições alimentam os
+    percentis de ``stats``.
+    """
+
+    def __init__(
+        self,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_pending: int = 1024,
+        latency_window: int = 10_000,
+    ) -> None:
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.requests = 0
+        self.batches = 0
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher_task: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None) -> asyncio.AbstractServer:
+        """Começa a aceitar conexões em ``host:port`` ou no socket Unix ``path``."""
+        self._queue = asyncio.Queue()
+        self._batcher_task = asyncio.create_task(self._batcher())
+        if path:
+            self._server = await asyncio.start_unix_server(self._handle, path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    async def close(self) -> None:
+        """Para de aceitar conexões e encerra o laço de micro-lotes."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher_task is not None:
+            self._batcher_task.cancel()
+            try:
+                await self._batcher_task
+            except asyncio.CancelledError:
+                pass
+
+    def submit(self, number: str) -> asyncio.Future:
+        """Enfileira ``number`` e retorna o future com o resultado."""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((number, future, time.perf_counter()))
+        return future
+
+    async def validate(self, number: str) -> validador.Result:
+        """Valida um número passando pelo micro-lote."""
+        return await self.submit(number)
+
+    def stats(self) -> dict:
+        """Pedidos atendidos, lotes, tamanho médio do lote e latências p50/p99."""
+        latencies = sorted(self._latencies)
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "avg_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+            "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        }
+
+    async def _batcher(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            self._drain(batch)
+            if len(batch) < self.max_batch and self.max_delay > 0:
+                await asyncio.sleep(self.max_delay)
+                self._drain(batch)
+            results = validador.format_results([number for number, _, _ in batch])
+            done = time.perf_counter()
+            for (_, future, started), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+                self._latencies.append(done - started)
+            self.requests += len(batch)
+            self.batches += 1
+
+    def _drain(self, batch: List[Tuple[str, asyncio.Future, float]]) -> None:
+        """Move para ``batch`` os pedidos já enfileirados, até ``max_batch``."""
+        queue = self._queue
+        while len(batch) < self.max_batch and not queue.empty():
+            batch.append(queue.get_nowait())
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Fila limitada de respostas pendentes e buffer de escrita limitado (ver
+        # _respond): se o cliente não lê, o respondedor para, a fila enche e
+        # paramos de ler.
+        pending: asyncio.Queue = asyncio.Queue(self.max_pending)
+        responder = asyncio.create_task(self._respond(pending, writer))
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    break  # linha longa demais ou conexão derrubada
+                if not line:
+                    break
+                text = line.decode("utf-8", "replace").strip()
+                if not text:
+                    continue
+                item = STATS_COMMAND if text == STATS_COMMAND else self.submit(text)
+                if not await _enqueue(pending, item, responder):
+                    break  # o cliente caiu: ninguém mais consome as respostas
+        finally:
+            await _enqueue(pending, None, responder)
+            await responder
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _respond(self, pending: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        while True:
+            item: Union[None, str, asyncio.Future] = await pending.get()
+            if item is None:
+                return
+            if item == STATS_COMMAND:
+                payload = self.stats()
+            else:
+                payload = dict(zip(validador.OUTPUT_FIELDS, await item))
+            writer.write(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+            # drain a cada rajada e sempre que o buffer passa do limite: um cliente
+            # que manda pedidos sem ler as respostas nunca deixa a fila vazia
+            if pending.empty() or writer.transport.get_write_buffer_size() > WRITE_HIGH_WATER:
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    writer.transport.abort()  # acorda o leitor, se ainda houver um
+                    return
+
+
+async def _enqueue(pending: asyncio.Queue, item, responder: asyncio.Task) -> bool:
+    """Põe ``item`` na fila de respostas; False se o respondedor já saiu.
+
+    Com a fila cheia, espera por espaço ou pelo fim do respondedor: depois
+    que ele sai, ninguém mais retira itens e um ``put`` esperaria para sempre.
+    """
+    if responder.done():
+        return False
+    if not pending.full():
+        pending.put_nowait(item)
+        return True
+    put = asyncio.ensure_future(pending.put(item))
+    await asyncio.wait((put, responder), return_when=asyncio.FIRST_COMPLETED)
+    if put.done():
+        return True
+    put.cancel()
+    return False
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = round(pct / 100 * (len(sorted_values) - 1))
+    return sorted_values[index]
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Serviço asyncio de validação de cartões (bandeira + Luhn)")
+    p.add_argument("--host", default="127.0.0.1", help="Endereço TCP (padrão: 127.0.0.1).")
+    p.add_argument("--port", type=int, default=8765, help="Porta TCP (padrão: 8765).")
+    p.add_argument("--unix", metavar="CAMINHO", help="Escuta num socket Unix em vez de TCP.")
+    p.add_argument("--bin-table", metavar="ARQUIVO",
+                   help="Tabela de BINs em CSV/JSON (ver identificador_bandeira_cartao).")
+    p.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="Pedidos por micro-lote.")
+    p.add_argument("--max-delay-ms", type=float, default=DEFAULT_MAX_DELAY * 1000,
+                   help="Espera máxima para completar um micro-lote.")
+    return p.parse_args(argv)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = ValidationServer(max_batch=args.max_batch, max_delay=args.max_delay_ms / 1000)
+    await server.start(args.host, args.port, args.unix)
+    print(f"Servidor de validação ouvindo em {args.unix or f'{args.host}:{args.port}'}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        print(json.dumps(server.stats()))
+        await server.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = _parse_args(argv)
+    if args.bin_table:
+        validador.use_bin_table(args.bin_table)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark: ``luhn_check`` (escalar) x ``luhn_check_batch`` (NumPy).
+
+Gera números de cartão sintéticos (``cartoes_sinteticos``), confere que as
+duas versões dão as mesmas respostas e mede o ganho da versão em lote em dois
+cenários: números já num array NumPy ``"S"`` (como vêm de ``np.loadtxt`` ou
+de um arquivo de largura fixa na reconciliação) e números numa lista Python.
+O mínimo de ``--min-speedup`` vale para o array: com a lista, metade do tempo
+do lote é a conversão dos objetos ``str`` para o array, que não é vetorizável,
+e o ganho fica entre 13x e 16x numa VM de uma CPU.
+
+Uso:
+  python benchmarks/bench_luhn_batch.py --n 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "Projeto Validador de Cartao pelo Github Copilot"))
+
+import numpy as np  # noqa: E402
+
+import identificador_bandeira_cartao as mod  # noqa: E402
+from cartoes_sinteticos import gerar_cartoes  # noqa: E402
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--n", type=int, default=1_000_000, help="quantidade de cartões")
+    p.add_argument("--min-speedup", type=float, default=20.0, help="ganho mínimo esperado (array)")
+    args = p.parse_args()
+
+    cartoes = gerar_cartoes(args.n)
+
+    t0 = time.perf_counter()
+    esperado = [mod.luhn_check(c) for c in cartoes]
+    t_escalar = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    obtido = mod.luhn_check_batch(cartoes)
+    t_lista = time.perf_counter() - t0
+    assert obtido.tolist() == esperado, "luhn_check_batch diverge de luhn_check"
+
+    array = np.array(cartoes, dtype="S")
+    t0 = time.perf_counter()
+    obtido = mod.luhn_check_batch(array)
+    t_lote = time.perf_counter() - t0
+    assert obtido.tolist() == esperado, "luhn_check_batch diverge de luhn_check"
+
+    ganho = t_escalar / t_lote
+    print(f"cartões: {args.n}")
+    print(f"luhn_check (escalar):      {t_escalar:.3f}s")
+    print(f"luhn_check_batch (lista):  {t_lista:.3f}s ({t_escalar / t_lista:.1f}x)")
+    print(f"luhn_check_batch (array):  {t_lote:.3f}s")
+    print(f"ganho (array): {ganho:.1f}x (mínimo esperado {args.min_speedup:.0f}x)")
+    if ganho < args.min_speedup:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
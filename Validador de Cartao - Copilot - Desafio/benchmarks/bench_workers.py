@@ -0,0 +1,51 @@
+"""Benchmark: escalabilidade do modo streaming com ``--workers``.
+
+Gera um arquivo sintético de cartões (5 milhões por padrão) e mede o tempo
+do pipeline ``--input``/``--output`` com 1, 2, 4 e 8 processos.
+
+Uso:
+  python benchmarks/bench_workers.py --n 5000000 --workers 1 2 4 8
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "Projeto Validador de Cartao pelo Github Copilot"))
+
+import identificador_bandeira_cartao as mod  # noqa: E402
+from cartoes_sinteticos import gerar_cartoes  # noqa: E402
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--n", type=int, default=5_000_000, help="quantidade de cartões")
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="números de processos a medir")
+    p.add_argument("--chunk-size", type=int, default=mod.DEFAULT_CHUNK_SIZE, help="cartões por lote")
+    args = p.parse_args()
+
+    print(f"núcleos disponíveis: {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as tmp:
+        entrada = os.path.join(tmp, "cartoes.txt")
+        with open(entrada, "w", encoding="utf-8") as f:
+            for cartao in gerar_cartoes(args.n):
+                f.write(cartao + "\n")
+
+        base = None
+        for workers in args.workers:
+            t0 = time.perf_counter()
+            mod.main([
+                "--input", entrada, "--output", os.devnull,
+                "--chunk-size", str(args.chunk_size), "--workers", str(workers),
+            ])
+            tempo = time.perf_counter() - t0
+            base = base or tempo
+            print(f"workers={workers}: {tempo:.2f}s  ({args.n / tempo:,.0f} cartões/s, ganho {base / tempo:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
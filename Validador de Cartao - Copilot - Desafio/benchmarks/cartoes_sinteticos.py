@@ -0,0 +1,58 @@
+"""Gerador determinístico de números de cartão sintéticos.
+
+Usado pelos benchmarks e pela suíte ``tests/test_benchmarks.py``. Percorre
+todas as bandeiras e comprimentos conhecidos pelo validador (mais alguns
+prefixos sem bandeira), alternando dígito Luhn correto e incorreto e, se
+pedido, inserindo espaços e hífens como num número digitado à mão.
+"""
+from __future__ import annotations
+
+import random
+from typing import List, Tuple
+
+# (prefixo, comprimento) para cada bandeira/comprimento aceito.
+PERFIS: Tuple[Tuple[str, int], ...] = (
+    *(("4", n) for n in (13, 16, 19)),                                    # Visa
+    *((p, 16) for p in ("51", "53", "55", "2221", "2500", "2720")),       # MasterCard
+    ("34", 15), ("37", 15),                                               # American Express
+    *((p, n) for p in ("6011", "65", "644", "622126") for n in (16, 19)),  # Discover
+    *(("3528", n) for n in (16, 17, 18, 19)), ("3589", 16),               # JCB
+    ("36", 14), ("300", 14), ("305", 14),                                 # Diners Club
+    ("4011", 16), ("5067", 16), ("506699", 16), ("6362", 16),             # Elo
+    ("38", 13), ("60", 16), ("60", 19),                                   # Hipercard
+    ("0", 16), ("9", 12), ("1", 20),                                      # sem bandeira
+)
+
+
+def digito_luhn(corpo: str) -> int:
+    """Dígito verificador que torna ``corpo + dígito`` válido no Luhn."""
+    total = 0
+    for i, d in enumerate(reversed(corpo)):
+        v = int(d) * (2 if i % 2 == 0 else 1)
+        total += v - 9 if v > 9 else v
+    return (10 - total % 10) % 10
+
+
+def _sujar(numero: str, rng: random.Random) -> str:
+    """Agrupa os dígitos de 4 em 4 com espaços ou hífens."""
+    sep = rng.choice((" ", "-", " - "))
+    return sep.join(numero[i:i + 4] for i in range(0, len(numero), 4))
+
+
+def gerar_cartoes(n: int, seed: int = 42, sujos: float = 0.0) -> List[str]:
+    """Gera ``n`` números cobrindo ``PERFIS`` em rodízio.
+
+    Metade dos números tem dígito Luhn correto. ``sujos`` é a fração de
+    números formatados com separadores. A mesma ``seed`` gera sempre a mesma
+    lista.
+    """
+    rng = random.Random(seed)
+    cartoes = []
+    for i in range(n):
+        prefixo, tamanho = PERFIS[i % len(PERFIS)]
+        livres = tamanho - len(prefixo) - 1
+        corpo = prefixo + (str(rng.randrange(10 ** livres)).zfill(livres) if livres > 0 else "")
+        valido = i % 2 == 0
+        numero = corpo + str((digito_luhn(corpo) + (0 if valido else 1)) % 10)
+        cartoes.append(_sujar(numero, rng) if rng.random() < sujos else numero)
+    return cartoes
@@ -0,0 +1,69 @@
+r"""Benchmarks dos caminhos críticos (pytest-benchmark).
+
+Mede a latência de uma chamada e a vazão em lote de ``_clean``,
+``luhn_check``, ``detect_brand`` e ``format_result`` sobre cartões sintéticos
+determinísticos (todas as bandeiras e comprimentos, Luhn válido e inválido,
+parte com espaços e hífens).
+
+Comparar duas versões na mesma máquina (o CI faz isso a cada push/PR, rodando
+o commit base e o HEAD no mesmo runner, e falha se o tempo mínimo piorar mais
+de 25%):
+  git worktree add /tmp/base main
+  (cd /tmp/base && python -m pytest tests/test_benchmarks.py --benchmark-only \
+      --benchmark-storage=/tmp/benchmarks --benchmark-save=base)
+  python -m pytest tests/test_benchmarks.py --benchmark-only \
+      --benchmark-storage=/tmp/benchmarks --benchmark-compare \
+      --benchmark-compare-fail=min:25%
+
+Tempos medidos em máquinas diferentes não são comparáveis, por isso não há
+linha de base versionada.
+"""
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "Projeto Validador de Cartao pelo Github Copilot"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import identificador_bandeira_cartao as mod  # noqa: E402
+from cartoes_sinteticos import PERFIS, gerar_cartoes  # noqa: E402
+
+BULK_SIZE = 10_000
+CARTOES = gerar_cartoes(BULK_SIZE, seed=2024, sujos=0.2)
+
+FUNCOES = {
+    "_clean": mod._clean,
+    "luhn_check": mod.luhn_check,
+    "detect_brand": mod.detect_brand,
+    "format_result": mod.format_result,
+}
+
+
+def test_gerador_cobre_perfis_e_casos():
+    cartoes = gerar_cartoes(2 * len(PERFIS), sujos=0.5)
+    assert cartoes == gerar_cartoes(2 * len(PERFIS), sujos=0.5)
+    assert any(not c.isdigit() for c in cartoes)
+    limpos = [mod._clean(c) for c in cartoes]
+    assert {len(c) for c in limpos} == {tamanho for _, tamanho in PERFIS}
+    assert {mod.luhn_check(c) for c in limpos} == {True, False}
+    marcas = {mod.detect_brand(c) for c in limpos}
+    assert marcas >= {"Visa", "MasterCard", "American Express", "Discover",
+                      "JCB", "Diners Club", "Elo", "Hipercard", None}
+
+
+@pytest.mark.parametrize("nome", list(FUNCOES))
+def test_latencia_unitaria(benchmark, nome):
+    benchmark.group = "latencia"
+    benchmark(FUNCOES[nome], "4111 1111-1111 1111")
+
+
+@pytest.mark.parametrize("nome", list(FUNCOES))
+def test_vazao_em_lote(benchmark, nome):
+    func = FUNCOES[nome]
+    benchmark.group = "vazao"
+    benchmark.extra_info["cartoes"] = BULK_SIZE
+    benchmark(lambda: [func(c) for c in CARTOES])
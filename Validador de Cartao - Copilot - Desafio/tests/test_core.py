@@ -1,13 +1,15 @@
 import os
 import sys
 
+import pytest
+
 
 # Adiciona o diretório do módulo ao sys.path para importação durante os testes.
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 MODULE_DIR = os.path.join(ROOT, "Projeto Validador de Cartao pelo Github Copilot")
 sys.path.insert(0, MODULE_DIR)
 
-import identificador_bandeira_cartao as mod
+import identificador_bandeira_cartao as mod  # noqa: E402
 
 
 def test_luhn_valid_examples():
@@ -37,3 +39,223 @@ def test_format_result():
     assert clean == "4111111111111111"
     assert brand == "Visa"
     assert ok is True
+
+
+def test_luhn_check_batch_matches_scalar():
+    pytest.importorskip("numpy")
+    numbers = [
+        "4111111111111111", "4111111111111112", "378282246310005",
+        "4111 1111-1111 1111", "", "0", "18", "abc", "١٢", None,
+        "6011111111111117", "79927398713", "5555555555554444",
+    ]
+    expected = [mod.luhn_check(n) for n in numbers]
+    assert mod.luhn_check_batch(numbers).tolist() == expected
+
+
+def test_luhn_check_batch_handles_long_inputs():
+    pytest.importorskip("numpy")
+    # 256+ dígitos estouravam a contagem em uint8 (e o caminho sujo recursava sem fim)
+    numbers = ["0" * 254 + "18", "1" * 300, "4111 1111-1111 1111 " * 20, "9" * 8000 + "0"]
+    expected = [mod.luhn_check(n) for n in numbers]
+    assert expected[0] is True
+    assert mod.luhn_check_batch(numbers).tolist() == expected
+
+
+def test_luhn_check_batch_accepts_arrays_and_ints():
+    np = pytest.importorskip("numpy")
+    result = mod.luhn_check_batch(np.array(["4111111111111111", "4111111111111112"]))
+    assert result.dtype == bool
+    assert result.tolist() == [True, False]
+    assert mod.luhn_check_batch([378282246310005]).tolist() == [True]
+    assert mod.luhn_check_batch([]).tolist() == []
+
+
+def test_format_results_vectorized_matches_format_result(monkeypatch):
+    pytest.importorskip("numpy")
+    numbers = ["4111 1111 1111 1111", "378282246310005", "", "abc", "١٢", "4111²1",
+               "5555-5555-5555-4444", "6011111111111117", "0" * 300 + "18"] * 3
+    assert len(numbers) >= mod.MIN_VECTOR_BATCH
+    chamadas = []
+    original = mod.luhn_check_batch
+    monkeypatch.setattr(mod, "luhn_check_batch", lambda *a, **k: chamadas.append(1) or original(*a, **k))
+    assert mod.format_results(numbers) == [mod.format_result(n) for n in numbers]
+    assert chamadas  # o Luhn do lote passou pelo caminho vetorizado
+
+
+def test_detect_brand_other_rules():
+    assert mod.detect_brand("6011111111111117") == "Discover"
+    assert mod.detect_brand("3530111333300000") == "JCB"
+    assert mod.detect_brand("30569309025904") == "Diners Club"
+    assert mod.detect_brand("6062825624254001") == "Hipercard"
+    # BIN Elo iniciado em 4 não deve ser lido como Visa
+    assert mod.detect_brand("4011780000000000") == "Elo"
+
+
+def test_range_prefixes():
+    assert mod._range_prefixes("2221", "2720") == [
+        "2221", "2222", "2223", "2224", "2225", "2226", "2227", "2228", "2229",
+        "223", "224", "225", "226", "227", "228", "229",
+        "23", "24", "25", "26", "270", "271", "2720",
+    ]
+    assert mod._range_prefixes("000", "999") == [""]
+    with pytest.raises(ValueError):
+        mod._range_prefixes("55", "51")
+
+
+def test_bin_index_priority_and_lengths():
+    index = mod.BinIndex()
+    index.add_range("400000", "499999", "Ampla", lengths={16}, priority=1)
+    index.add_range("401100", "401199", "Estreita", priority=0)
+    index.add_range("401150", "401150", "Baixa", priority=5)
+    assert index.lookup("4011500000000000") == "Estreita"
+    assert index.lookup("4099000000000000") == "Ampla"
+    assert index.lookup("409900000000000") is None
+    assert index.lookup("5") is None
+
+
+def test_iter_results_is_lazy_and_chunked():
+    import itertools
+
+    batches = mod.iter_results(itertools.repeat("4111111111111111"), chunk_size=3)
+    first = next(batches)
+    assert first == [("4111111111111111", "Visa", True)] * 3
+
+
+def test_main_streams_file_to_csv_and_jsonl(tmp_path):
+    import json
+
+    src = tmp_path / "cartoes.txt"
+    src.write_text("4111 1111 1111 1111\n\n378282246310005\n", encoding="utf-8")
+    csv_out = tmp_path / "saida.csv"
+    mod.main(["--input", str(src), "--output", str(csv_out), "--chunk-size", "1"])
+    assert csv_out.read_text(encoding="utf-8").splitlines() == [
+        "number,brand,luhn_ok",
+        "4111111111111111,Visa,True",
+        "378282246310005,American Express,True",
+    ]
+
+    jsonl_out = tmp_path / "saida.jsonl"
+    mod.main(["--input", str(src), "--output", str(jsonl_out), "--format", "jsonl"])
+    rows = [json.loads(line) for line in jsonl_out.read_text(encoding="utf-8").splitlines()]
+    assert rows[1] == {"number": "378282246310005", "brand": "American Express", "luhn_ok": True}
+
+
+def test_iter_results_with_workers_preserves_order():
+    numbers = [str(4111111111111111 + i) for i in range(50)]
+    expected = [mod.format_result(n) for n in numbers]
+    batches = list(mod.iter_results(numbers, chunk_size=7, workers=2))
+    assert [r for batch in batches for r in batch] == expected
+
+
+def test_clean_fast_paths_match_regex():
+    import re
+
+    samples = ["", "4111111111111111", "4111 1111-1111 1111", "abc", " 12\t3\n", "١٢٣ 4", "4111²1"]
+    for s in samples:
+        assert mod._clean(s) == re.sub(r"\D", "", s)
+    assert mod._clean(None) == ""
+
+
+def test_format_result_does_not_use_regex_for_ascii(monkeypatch):
+    def boom(*args, **kwargs):
+        raise AssertionError("regex no caminho rápido")
+
+    monkeypatch.setattr(mod, "_NON_DIGIT_RE", type("SemRegex", (), {"sub": staticmethod(boom)}))
+    assert mod.format_result("4111-1111 1111 1111") == ("4111111111111111", "Visa", True)
+    assert mod.luhn_check("4111111111111111", cleaned=True) is True
+    assert mod.detect_brand("378282246310005", cleaned=True) == "American Express"
+
+
+def _write_bin_csv(path, rows):
+    lines = ["start,end,brand,lengths,priority"] + [",".join(map(str, r)) for r in rows]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_load_bin_table_csv_and_cache(tmp_path):
+    src = tmp_path / "bins.csv"
+    _write_bin_csv(src, [
+        ("4", "4", "Visa", "13;16;19", 10),
+        ("401178", "401179", "Elo", "", 0),
+        ("22210000", "27209999", "MasterCard", "16", 5),
+    ])
+    table = mod.load_bin_table(str(src))
+    assert (tmp_path / "bins.csv.bincache").exists()
+    assert table.lookup("4111111111111111") == "Visa"
+    assert table.lookup("4011780000000000") == "Elo"
+    assert table.lookup("2720990000000000") == "MasterCard"
+    assert table.lookup("272099000000000") is None
+    assert table.lookup("9999999999999999") is None
+
+    cached = mod.load_bin_table(str(src))
+    assert isinstance(cached._starts, memoryview)
+    assert cached.lookup("4011780000000000") == "Elo"
+
+    # origem alterada: o cache é descartado e recompilado
+    _write_bin_csv(src, [("4", "4", "Outra", "", 0)])
+    assert mod.load_bin_table(str(src)).lookup("4011780000000000") == "Outra"
+
+
+def test_truncated_or_corrupt_bin_cache_is_rejected(tmp_path):
+    src = tmp_path / "bins.csv"
+    _write_bin_csv(src, [("4", "4", "Visa", "16", 0), ("51", "55", "MasterCard", "16", 0)])
+    stat = os.stat(src)
+    cache = tmp_path / "bins.csv.bincache"
+    mod.load_bin_table(str(src))
+    conteudo = cache.read_bytes()
+
+    # truncado em múltiplo de 4 e com o JSON das bandeiras inválido
+    for ruim in (conteudo[:-8], conteudo[:-len('"MasterCard"]')] + b"x" * 12 + b"]"):
+        cache.write_bytes(ruim)
+        os.utime(src, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        with pytest.raises(ValueError):
+            mod.BinTable.open_cache(str(cache), stat)
+        assert mod.load_bin_table(str(src)).lookup("5100000000000000") == "MasterCard"
+
+
+def test_load_bin_table_json_and_detect_brand(tmp_path):
+    import json
+
+    src = tmp_path / "bins.json"
+    src.write_text(json.dumps([
+        {"start": "636297", "end": "636297", "brand": "Elo", "lengths": [16]},
+        {"start": "3", "end": "3", "brand": "Três", "lengths": "13-19", "priority": 1},
+    ]), encoding="utf-8")
+    try:
+        mod.use_bin_table(str(src))
+        assert mod.detect_brand("6362 9700 0000 0000") == "Elo"
+        assert mod.detect_brand("378282246310005") == "Três"
+        assert mod.detect_brand("4111111111111111") is None
+    finally:
+        mod.use_bin_table(None)
+    assert mod.detect_brand("4111111111111111") == "Visa"
+
+
+def test_bin_table_rejects_invalid_ranges():
+    with pytest.raises(ValueError):
+        mod.BinTable.from_rules([mod.BinRule("55", "51", "X")])
+    with pytest.raises(ValueError):
+        mod.BinTable.from_rules([mod.BinRule("123456789", "123456789", "X")])
+
+
+def test_brand_cache_counters_and_eviction():
+    try:
+        mod.configure_brand_cache(2)
+        mod.reset_brand_cache_stats()
+        assert mod.detect_brand("4111111111111111") == "Visa"
+        assert mod.detect_brand("4111111199999999") == "Visa"  # mesmo BIN e comprimento
+        assert mod.detect_brand("5555555555554444") == "MasterCard"
+        assert mod.detect_brand("378282246310005") == "American Express"
+        stats = mod.brand_cache_stats()
+        assert stats == {"hits": 1, "misses": 3, "evictions": 1, "size": 2, "maxsize": 2}
+        # as chaves guardam só o BIN e o comprimento, nunca o número completo
+        assert all(len(bin_) <= 8 for bin_, _ in mod._BRAND_CACHE._data)
+
+        mod.configure_brand_cache(0)
+        assert mod.brand_cache_stats()["size"] == 0
+        assert mod.detect_brand("4111111111111111") == "Visa"
+        assert mod.brand_cache_stats()["size"] == 0
+    finally:
+        mod.configure_brand_cache(mod.DEFAULT_BRAND_CACHE_SIZE)
+        mod.reset_brand_cache_stats()
+    with pytest.raises(ValueError):
+        mod.configure_brand_cache(-1)
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "Projeto Validador de Cartao pelo Github Copilot"))
+
+import identificador_bandeira_cartao as mod  # noqa: E402
+import servidor_validacao as srv  # noqa: E402
+
+
+async def _pipelined(reader, writer, lines):
+    writer.write("".join(line + "\n" for line in lines).encode("utf-8"))
+    await writer.drain()
+    return [json.loads(await reader.readline()) for _ in lines]
+
+
+def test_pipelined_requests_keep_order_and_match_format_result():
+    numbers = ["4111 1111 1111 1111", "378282246310005", "0000", "5555-5555-5555-4444"] * 25
+
+    async def scenario():
+        server = srv.ValidationServer(max_delay=0.001)
+        tcp = await server.start("127.0.0.1", 0)
+        port = tcp.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            replies = await _pipelined(reader, writer, numbers + [srv.STATS_COMMAND])
+            writer.close()
+            await writer.wait_closed()
+        finally:
+            await server.close()
+        return replies
+
+    replies = asyncio.run(scenario())
+    expected = [dict(zip(mod.OUTPUT_FIELDS, mod.format_result(n))) for n in numbers]
+    assert replies[:-1] == expected
+    stats = replies[-1]
+    assert stats["requests"] == len(numbers)
+    assert stats["batches"] < len(numbers)  # pedidos pipelined viram micro-lotes
+    assert 0 <= stats["p50_ms"] <= stats["p99_ms"]
+
+
+def test_concurrent_clients_share_batches():
+    async def scenario():
+        server = srv.ValidationServer(max_delay=0.002)
+        await server.start("127.0.0.1", 0)
+        try:
+            results = await asyncio.gather(*(server.validate(str(4111111111111111 + i)) for i in range(200)))
+        finally:
+            await server.close()
+        return server, results
+
+    server, results = asyncio.run(scenario())
+    assert results == [mod.format_result(str(4111111111111111 + i)) for i in range(200)]
+    assert server.stats()["requests"] == 200
+    assert server.batches < 200
+
+
+class _ClienteDesconectado:
+    """Writer de um cliente que caiu: toda escrita é descartada e ``drain`` falha."""
+
+    def __init__(self):
+        self.transport = self
+        self.abortado = False
+
+    def write(self, data):
+        pass
+
+    async def drain(self):
+        raise ConnectionResetError
+
+    def abort(self):
+        self.abortado = True
+
+    def close(self):
+        pass
+
+    async def wait_closed(self):
+        pass
+
+
+def test_disconnected_client_with_full_pending_queue_does_not_leak():
+    async def scenario():
+        server = srv.ValidationServer(max_delay=0, max_pending=2)
+        await server.start("127.0.0.1", 0)
+        reader, writer = asyncio.StreamReader(), _ClienteDesconectado()
+        handler = asyncio.create_task(server._handle(reader, writer))
+        try:
+            reader.feed_data(b"4111111111111111\n")
+            await asyncio.sleep(0.05)  # a resposta sai e o drain falha
+            # Mais pedidos do que cabem na fila: o leitor não pode ficar preso no put
+            reader.feed_data(b"4111111111111111\n" * 10)
+            reader.feed_eof()
+            done, _ = await asyncio.wait({handler}, timeout=2)
+        finally:
+            while not handler.done():  # um handler preso pode ignorar o primeiro cancel
+                handler.cancel()
+                await asyncio.wait({handler}, timeout=0.1)
+            await server.close()
+        return done, writer
+
+    done, writer = asyncio.run(scenario())
+    assert done and writer.abortado
+
+
+class _ClienteQueNaoLe:
+    """Writer de um cliente que nunca lê: o buffer só cresce e ``drain`` nunca termina."""
+
+    def __init__(self):
+        self.transport = self
+        self.buffer = 0
+
+    def write(self, data):
+        self.buffer += len(data)
+
+    def get_write_buffer_size(self):
+        return self.buffer
+
+    async def drain(self):
+        await asyncio.Event().wait()
+
+
+def test_client_that_never_reads_does_not_grow_the_write_buffer():
+    async def scenario():
+        server = srv.ValidationServer()
+        writer, pending = _ClienteQueNaoLe(), asyncio.Queue()
+        # pedidos pipelined sem parar: a fila de respostas nunca fica vazia
+        for _ in range(5000):
+            pending.put_nowait(srv.STATS_COMMAND)
+        responder = asyncio.create_task(server._respond(pending, writer))
+        await asyncio.sleep(0.1)
+        parado = not responder.done()
+        responder.cancel()
+        return parado, writer.buffer, pending.qsize()
+
+    parado, buffer, restantes = asyncio.run(scenario())
+    assert parado and restantes > 0  # o respondedor espera o cliente ler
+    assert buffer <= srv.WRITE_HIGH_WATER + 1024
+
+
+@pytest.mark.skipif(not hasattr(asyncio, "start_unix_server"), reason="sem sockets Unix")
+def test_unix_socket(tmp_path):
+    path = str(tmp_path / "validador.sock")
+
+    async def scenario():
+        server = srv.ValidationServer()
+        await server.start(path=path)
+        try:
+            reader, writer = await asyncio.open_unix_connection(path)
+            replies = await _pipelined(reader, writer, ["6011111111111117"])
+            writer.close()
+            await writer.wait_closed()
+        finally:
+            await server.close()
+        return replies
+
+    assert asyncio.run(scenario()) == [{"number": "6011111111111117", "brand": "Discover", "luhn_ok": True}]